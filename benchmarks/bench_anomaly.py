@@ -0,0 +1,43 @@
+"""
+Benchmark Isolation Forest scoring throughput against the number of workers.
+
+Usage:
+    python benchmarks/bench_anomaly.py [--rows 4000000] [--workers 1 2 4 8] [--executor process]
+"""
+
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+from parquet.anomaly import DEFAULT_TASK_ROWS, anomaly_scaling_report
+from parquet.synthetic import write_sensor_parquet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=4_000_000)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--task-rows", type=int, default=DEFAULT_TASK_ROWS // 4)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_per_file = args.rows // args.files
+        for i in range(args.files):
+            write_sensor_parquet(Path(tmp) / f"part-{i}.parquet", rows_per_file,
+                                 chunk_rows=args.task_rows, seed=i)
+        report = anomaly_scaling_report(tmp, worker_counts=args.workers, executor=args.executor,
+                                        task_rows=args.task_rows)
+
+    print(f"rows={rows_per_file * args.files} files={args.files} executor={args.executor}")
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>14}{'speedup':>9}{'efficiency':>12}")
+    for row in report:
+        print(f"{row['workers']:>8}{row['seconds']:>10.2f}{row['rows_per_s']:>14,.0f}"
+              f"{row['speedup']:>8.2f}x{row['efficiency']:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Report the memory saved by compacting a loaded sensor frame.
+
+Usage:
+    python benchmarks/bench_compact.py [--rows 5000000] [--ids 200]
+"""
+
+import argparse
+import logging
+import time
+
+from parquet.compact import compact_frame
+from parquet.synthetic import make_sensor_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--ids", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    df = make_sensor_frame(args.rows, n_ids=args.ids)
+    sensors = df.columns.str.startswith("sensor")
+    # Two decimals and float64, as pandas reads data/raw/training_data.csv
+    df.loc[:, sensors] = df.loc[:, sensors].round(2).astype("float64")
+    df = df.astype({"time": "int64", "TO": "int64"})
+
+    start = time.perf_counter()
+    _, report = compact_frame(df)
+    elapsed = time.perf_counter() - start
+
+    print(f"rows={args.rows} ids={args.ids} compacted in {elapsed:.2f} s")
+    print(report.to_string())
+    before, after = report["bytes_before"].sum(), report["bytes_after"].sum()
+    print(f"total {before / 2 ** 20:,.1f} MiB -> {after / 2 ** 20:,.1f} MiB ({before / after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark CSV parsing: declared schema (pyarrow.csv, no inference) vs pd.read_csv.
+
+Usage:
+    python benchmarks/bench_csv_parse.py [--rows 2000000] [--ids 100] [--repeat 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from parquet.config import ConfigParametersCsvSchema
+from parquet.csv_schema import read_csv_typed
+from parquet.load_parquet import table_to_pandas
+from parquet.synthetic import make_sensor_frame
+
+
+def _best_of(repeat, func):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--ids", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "training_data.csv"
+        make_sensor_frame(args.rows, n_ids=args.ids).to_csv(csv_path, index=False)
+        csv_mb = csv_path.stat().st_size / 1e6
+        config = ConfigParametersCsvSchema()
+
+        inferred, df = _best_of(args.repeat, lambda: pd.read_csv(csv_path))
+        inferred_bytes = df.memory_usage(index=False, deep=True).sum()
+        del df
+
+        pool = pa.default_memory_pool()
+        declared, typed = _best_of(args.repeat, lambda: table_to_pandas(read_csv_typed(csv_path, config)))
+        declared_bytes = typed.memory_usage(index=False, deep=True).sum()
+
+    print(f"rows={args.rows} ids={args.ids} csv={csv_mb:.1f} MB")
+    print(f"pd.read_csv:     {inferred:8.3f} s  ({csv_mb / inferred:7.1f} MB/s)  frame {inferred_bytes / 1e6:8.1f} MB")
+    print(f"declared schema: {declared:8.3f} s  ({csv_mb / declared:7.1f} MB/s)  frame {declared_bytes / 1e6:8.1f} MB")
+    print(f"speedup:         {inferred / declared:8.1f}x  memory {declared_bytes / inferred_bytes:6.2f}x")
+    print(f"arrow pool peak: {pool.max_memory() / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark grouped statistics: vectorized engine vs pandas groupby().describe().
+
+Usage:
+    python benchmarks/bench_grouped_stats.py [--rows 1000000] [--ids 100] [--bucket day]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from parquet.grouped_stats import TIME_BUCKETS, compute_grouped_statistics
+from parquet.synthetic import make_sensor_frame
+
+
+def naive_grouped_statistics(df: pd.DataFrame, bucket: str | None) -> pd.DataFrame:
+    """The pandas approach used in the notebooks."""
+    keys = ['TO']
+    if bucket is not None:
+        width = TIME_BUCKETS[bucket]
+        df = df.assign(time_bucket=pd.to_datetime(df['time'] // width * width, unit='s'))
+        keys.append('time_bucket')
+    sensors = [c for c in df.columns if c.startswith('sensor')]
+    return df.groupby(keys)[sensors].describe()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--ids", type=int, default=100)
+    parser.add_argument("--bucket", choices=sorted(TIME_BUCKETS), default=None)
+    args = parser.parse_args()
+
+    df = make_sensor_frame(args.rows, n_ids=args.ids)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    start = time.perf_counter()
+    result = compute_grouped_statistics(table, by=('TO',), bucket=args.bucket)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_grouped_statistics(df, args.bucket)
+    naive = time.perf_counter() - start
+
+    print(f"rows={args.rows} ids={args.ids} bucket={args.bucket} output_rows={result.num_rows}")
+    print(f"vectorized: {vectorized:8.3f} s  ({args.rows / vectorized:,.0f} rows/s)")
+    print(f"pandas:     {naive:8.3f} s  ({args.rows / naive:,.0f} rows/s)")
+    print(f"speedup:    {naive / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark import time of the entry modules, measured with `python -X importtime`.
+
+Each module is imported in a fresh interpreter and the best cumulative time
+of `--repeat` runs is reported, next to the heavy dependencies that are now
+only loaded on first use.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--modules parquet.load_parquet ...]
+"""
+
+import argparse
+import subprocess
+import sys
+
+ENTRY_MODULES = (
+    "parquet.util",
+    "parquet.load_parquet",
+    "parquet.load_csv",
+    "parquet.csv_to_parquet",
+    "parquet.stats_compute",
+    "parquet.load_training_data",
+)
+# Loaded lazily by the package; shown for reference
+HEAVY_MODULES = ("numpy", "pandas", "pyarrow.parquet", "pydantic_settings")
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of `module` in a fresh interpreter, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True, capture_output=True, text=True,
+    )
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if line.startswith("import time:") and line.rsplit("|", 1)[1].strip() == module \
+                and not line.rsplit("|", 1)[1].startswith("  "):
+            return int(line.split("|")[1]) / 1000
+    raise RuntimeError(f"No import time reported for {module}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_MODULES))
+    args = parser.parse_args()
+
+    print(f"{'module':<30}{'import ms':>12}")
+    for module in [*args.modules, *HEAVY_MODULES]:
+        best = min(import_time_ms(module) for _ in range(args.repeat))
+        print(f"{module:<30}{best:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark approximate statistics from a row-group sample against full scans.
+
+Usage:
+    python benchmarks/bench_sampling.py [--rows 10000000] [--row-group-size 100000] [--sample-size 100000]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from parquet.sampling import approximate_statistics
+from parquet.streaming_stats import compute_fused_statistics, summaries_to_frame
+from parquet.synthetic import write_sensor_parquet
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--row-group-size", type=int, default=100_000)
+    parser.add_argument("--sample-size", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "training_data.parquet"
+        write_sensor_parquet(file_path, args.rows, chunk_rows=args.row_group_size)
+        full_s, (summaries, _) = _timed(lambda: compute_fused_statistics(file_path))
+        sample_s, approx = _timed(lambda: approximate_statistics(file_path, sample_size=args.sample_size))
+
+    exact = summaries_to_frame(summaries)
+    print(f"rows={args.rows} row groups of {args.row_group_size} sample={args.sample_size}")
+    print(f"full scan (fused) {full_s:8.3f} s")
+    print(f"sample            {sample_s:8.3f} s  ({full_s / sample_s:.1f}x faster)")
+    covered = {
+        label: ((approx.loc[f"{label}_ci_low"] <= exact.loc[label])
+                & (exact.loc[label] <= approx.loc[f"{label}_ci_high"])).mean()
+        for label in ("mean", "25%", "50%", "75%")
+    }
+    print("exact value inside the interval: " + ", ".join(f"{k} {v:.0%}" for k, v in covered.items()))
+
+
+if __name__ == "__main__":
+    main()
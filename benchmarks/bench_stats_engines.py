@@ -0,0 +1,61 @@
+"""
+Benchmark the statistics engines: pandas (load, null scan, describe), streaming and fused.
+
+Usage:
+    python benchmarks/bench_stats_engines.py [--rows 5000000] [--sensors 3] [--repeat 3]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from parquet.load_parquet import load_parquet_data, validate_parquet_metadata
+from parquet.streaming_stats import compute_fused_statistics, compute_streaming_statistics
+from parquet.synthetic import make_sensor_frame
+
+
+def _best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--sensors", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "training_data.parquet"
+        make_sensor_frame(args.rows, n_sensors=args.sensors).to_parquet(file_path)
+
+        def pandas_engine():
+            df = load_parquet_data(file_path.parent, file_path.name)
+            df.describe().drop(['time', 'TO'], axis=1)
+
+        def streaming_engine():
+            validate_parquet_metadata(file_path)
+            compute_streaming_statistics(file_path)
+
+        timings = {
+            "pandas": _best_of(args.repeat, pandas_engine),
+            "streaming": _best_of(args.repeat, streaming_engine),
+            "fused": _best_of(args.repeat, lambda: compute_fused_statistics(file_path)),
+        }
+
+    print(f"rows={args.rows} sensor columns={3 * args.sensors}")
+    for name, seconds in timings.items():
+        print(f"{name:<10}{seconds:8.3f} s  ({args.rows / seconds:>12,.0f} rows/s)"
+              f"  {timings['pandas'] / seconds:5.1f}x vs pandas")
+
+
+if __name__ == "__main__":
+    main()
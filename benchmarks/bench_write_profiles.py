@@ -0,0 +1,58 @@
+"""
+Benchmark Parquet write profiles: file size, write time and filtered-read time.
+
+Usage:
+    python benchmarks/bench_write_profiles.py [--rows 2000000] [--ids 100] [--repeat 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from parquet.synthetic import make_sensor_frame
+from parquet.write_profiles import WRITE_PROFILES, write_table_with_profile
+
+
+def _best_of(repeat, func):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--ids", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_sensor_frame(args.rows, n_ids=args.ids)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # One id over the middle third of the time range
+    target = int(df['TO'].iloc[args.ids // 2])
+    low, high = df['time'].quantile([1 / 3, 2 / 3]).astype('int64')
+    filters = [('TO', '==', target), ('time', '>=', low), ('time', '<', high)]
+
+    print(f"rows={args.rows} ids={args.ids} filter: TO == {target} and {low} <= time < {high}")
+    print(f"{'profile':<16}{'size MB':>10}{'write s':>10}{'read s':>10}{'rows read':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = {"pandas-default": None, **WRITE_PROFILES}
+        for name, profile in profiles.items():
+            out = Path(tmp) / f"{name}.parquet"
+            if profile is None:
+                write, _ = _best_of(args.repeat, lambda: df.to_parquet(out, engine='pyarrow'))
+            else:
+                write, _ = _best_of(args.repeat, lambda: write_table_with_profile(table, out, profile))
+            read, result = _best_of(args.repeat, lambda: pq.read_table(out, filters=filters))
+            print(f"{name:<16}{out.stat().st_size / 1e6:>10.1f}{write:>10.3f}{read:>10.4f}{result.num_rows:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Anomaly scoring of Parquet datasets with Isolation Forest.
+The model is fitted on a bounded random sample and then applied to the whole
+dataset batch by batch, so memory stays constant however large the data is:
+
+    1) `sample_parquet_rows` draws a uniform sample of at most `sample_size`
+       rows in one streaming pass (each row gets a random key and the rows
+       with the smallest keys are kept).
+    2) `fit_isolation_forest` fits `sklearn.ensemble.IsolationForest` with the
+       parameters of `CONFIG_ISOLATION_FOREST` on that sample.
+    3) `score_parquet_dataset` splits the files into tasks of consecutive row
+       groups and scores them on a process (or thread) pool. Every task
+       streams its record batches through the model and writes one output
+       file with the id columns, `anomaly_score` and `is_anomaly`, so the
+       output is a dataset whose rows line up with the input.
+    4) `anomaly_scaling_report` scores the same data with increasing worker
+       counts and reports rows/s and the speedup over one worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from parquet.streaming_stats import ID_COLUMNS, numeric_columns
+from parquet.util import lazy_import, list_data_files, process_pool, setup_logger, span
+
+np = lazy_import("numpy")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+# Rows the model is fitted on; each tree draws `max_samples` (256 by default) of them
+DEFAULT_SAMPLE_SIZE = 100_000
+DEFAULT_BATCH_SIZE = 65_536
+# Rows of consecutive row groups scored by one task
+DEFAULT_TASK_ROWS = 1_000_000
+SCORE_COLUMN = "anomaly_score"
+FLAG_COLUMN = "is_anomaly"
+
+# Model and columns of a process-pool worker, set once per process by `_init_worker`
+_WORKER = {}
+
+
+def _batch_matrix(batch, columns, file_path) -> np.ndarray:
+    """Feature matrix of a record batch as float32 (the dtype the trees split on)."""
+    matrix = np.column_stack([batch.column(c).to_numpy(zero_copy_only=False) for c in columns])
+    matrix = matrix.astype(np.float32, copy=False)
+    if np.isnan(matrix).any():
+        raise ValueError(f"The file {file_path} contains null values in the scored columns.")
+    return matrix
+
+
+def sample_parquet_rows(files, columns: list[str], sample_size: int = DEFAULT_SAMPLE_SIZE,
+                        batch_size: int = DEFAULT_BATCH_SIZE, seed: int | None = 0) -> np.ndarray:
+    """
+    Uniform random sample of at most `sample_size` rows of `columns` over all
+    `files`, read in one pass with at most `sample_size + batch_size` rows in memory.
+
+    Returns:
+        np.ndarray: float32 array of shape ``(n, len(columns))``.
+    """
+    rng = np.random.default_rng(seed)
+    sample = np.empty((0, len(columns)), dtype=np.float32)
+    keys = np.empty(0)
+    for file_path in files:
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=batch_size, columns=columns):
+            sample = np.concatenate([sample, _batch_matrix(batch, columns, file_path)])
+            keys = np.concatenate([keys, rng.random(batch.num_rows)])
+            if len(keys) > sample_size:
+                keep = np.argpartition(keys, sample_size)[:sample_size]
+                sample, keys = sample[keep], keys[keep]
+    return sample
+
+
+def fit_isolation_forest(files, columns: list[str] | None = None, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                         seed: int | None = 0, model_params: dict | None = None):
+    """
+    Fit an Isolation Forest on a bounded sample of a Parquet dataset.
+
+    Args:
+        files (Iterable[Path | str]): Parquet files of the dataset.
+        columns (list[str] | None): Feature columns. Defaults to the numeric
+            columns of the first file except `time` and `TO`.
+        sample_size (int): Maximum number of rows fitted on.
+        seed (int | None): Seed of the sample and of the model.
+        model_params (dict | None): `IsolationForest` parameters. Defaults to
+            `CONFIG_ISOLATION_FOREST.to_model_dict()`.
+
+    Returns:
+        tuple[IsolationForest, list[str]]: The fitted model and its feature columns.
+    """
+    from sklearn.ensemble import IsolationForest
+
+    files = list(files)
+    if columns is None:
+        columns = numeric_columns(pq.read_schema(files[0]))
+    if model_params is None:
+        from parquet.config import get_config
+
+        model_params = get_config().CONFIG_ISOLATION_FOREST.to_model_dict()
+
+    with span("anomaly.sample", files=len(files)) as sample_span:
+        sample = sample_parquet_rows(files, columns, sample_size, seed=seed)
+        sample_span.set(rows=len(sample))
+    if len(sample) == 0:
+        raise ValueError("The dataset contains no rows to fit the model on.")
+    with span("anomaly.fit", rows=len(sample)):
+        model = IsolationForest(random_state=seed, **model_params).fit(sample)
+    LOGGER.info(f"Fitted IsolationForest on {len(sample)} sampled rows x {len(columns)} columns")
+    return model, columns
+
+
+def _plan_tasks(files, task_rows: int) -> list[tuple[Path, list[int]]]:
+    """Split every file into runs of consecutive row groups of about `task_rows` rows."""
+    tasks = []
+    for file_path in files:
+        metadata = pq.read_metadata(file_path)
+        group, group_rows = [], 0
+        for rg in range(metadata.num_row_groups):
+            group.append(rg)
+            group_rows += metadata.row_group(rg).num_rows
+            if group_rows >= task_rows:
+                tasks.append((Path(file_path), group))
+                group, group_rows = [], 0
+        if group:
+            tasks.append((Path(file_path), group))
+    return tasks
+
+
+def _init_worker(model, columns) -> None:
+    _WORKER["model"] = model
+    _WORKER["columns"] = columns
+
+
+def _score_task(file_path, row_groups, output_path, batch_size, model=None, columns=None) -> dict:
+    """
+    Score some row groups of one file into `output_path` (runs in a worker).
+    Process workers take `model` and `columns` from `_WORKER`; thread workers
+    get them as arguments, so concurrent calls in one process do not mix.
+    """
+    start = time.perf_counter()
+    if model is None:
+        model, columns = _WORKER["model"], _WORKER["columns"]
+    parquet_file = pq.ParquetFile(file_path)
+    id_columns = [c for c in ID_COLUMNS if c in parquet_file.schema_arrow.names and c not in columns]
+    n_rows = 0
+    writer = None
+    try:
+        for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=row_groups,
+                                               columns=[*id_columns, *columns]):
+            # score_samples is the negated anomaly score of the original paper
+            normality = model.score_samples(_batch_matrix(batch, columns, file_path))
+            scores = pa.record_batch(
+                [batch.column(c) for c in id_columns]
+                + [pa.array(-normality), pa.array(normality < model.offset_)],
+                names=[*id_columns, SCORE_COLUMN, FLAG_COLUMN],
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, scores.schema)
+            writer.write_batch(scores)
+            n_rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return {"file": str(file_path), "worker": os.getpid(), "rows": n_rows,
+            "seconds": time.perf_counter() - start}
+
+
+def score_parquet_dataset(files, output_dir, model, columns: list[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                          max_workers: int | None = None, executor: str = "process",
+                          task_rows: int = DEFAULT_TASK_ROWS) -> dict:
+    """
+    Score every row of a Parquet dataset with a fitted model.
+
+    Output files are named ``part-<task>-<file stem>.parquet``, in input
+    order, and hold the `time`/`TO` columns of the input, `anomaly_score`
+    (higher is more anomalous, in ``(0, 1]``) and `is_anomaly` (the model's
+    prediction for its `contamination`). Parts left from an earlier run in
+    `output_dir` are removed first.
+
+    Args:
+        files (Iterable[Path | str]): Parquet files to score.
+        output_dir (Path | str): Folder of the score dataset.
+        model: A fitted `IsolationForest`.
+        columns (list[str]): Feature columns the model was fitted on.
+        batch_size (int): Rows scored at a time by each worker.
+        max_workers (int | None): Pool size. Defaults to the CPU count.
+        executor (str): ``"process"`` or ``"thread"`` pool.
+        task_rows (int): Approximate rows per task (whole row groups).
+
+    Returns:
+        dict: `rows`, `seconds`, `rows_per_s`, `tasks` and `workers`.
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unknown executor {executor!r}, expected 'process' or 'thread'.")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale in output_dir.glob("part-*.parquet"):
+        stale.unlink()
+
+    start = time.perf_counter()
+    tasks = _plan_tasks(files, task_rows)
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+    if executor == "process":
+        pool = process_pool(max_workers=max_workers, initializer=_init_worker, initargs=(model, columns))
+        task = _score_task
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parquet-score")
+        task = partial(_score_task, model=model, columns=columns)
+    with pool, span("anomaly.score", tasks=len(tasks), workers=max_workers) as score_span:
+        futures = [
+            pool.submit(task, file_path, row_groups,
+                        output_dir / f"part-{i:05d}-{file_path.stem}.parquet", batch_size)
+            for i, (file_path, row_groups) in enumerate(tasks)
+        ]
+        results = [future.result() for future in futures]
+        n_rows = sum(r["rows"] for r in results)
+        score_span.set(rows=n_rows)
+
+    seconds = max(time.perf_counter() - start, 1e-9)
+    LOGGER.info(f"Scored {n_rows} rows in {len(tasks)} tasks with {max_workers} {executor} workers "
+                f"({n_rows / seconds:,.0f} rows/s)")
+    return {"rows": n_rows, "seconds": seconds, "rows_per_s": n_rows / seconds,
+            "tasks": len(tasks), "workers": max_workers, "executor": executor}
+
+
+def anomaly_pipeline(input_path, output_dir, columns: list[str] | None = None,
+                     sample_size: int = DEFAULT_SAMPLE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_workers: int | None = None, executor: str = "process", seed: int | None = 0) -> dict:
+    """
+    Fit on a sample of `input_path` (file, directory or glob) and score all
+    of it into `output_dir`. Returns the report of `score_parquet_dataset`
+    with the feature columns added.
+    """
+    files = list_data_files(input_path)
+    model, columns = fit_isolation_forest(files, columns, sample_size=sample_size, seed=seed)
+    report = score_parquet_dataset(files, output_dir, model, columns, batch_size=batch_size,
+                                   max_workers=max_workers, executor=executor)
+    return {**report, "columns": columns}
+
+
+def anomaly_scaling_report(input_path, worker_counts=(1, 2, 4, 8), columns: list[str] | None = None,
+                           sample_size: int = DEFAULT_SAMPLE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                           executor: str = "process", task_rows: int = DEFAULT_TASK_ROWS) -> list[dict]:
+    """
+    Score `input_path` once per worker count with the same fitted model.
+
+    Returns:
+        list[dict]: Per worker count `workers`, `seconds`, `rows_per_s`,
+        `speedup` over the first count and `efficiency` (speedup per worker).
+    """
+    files = list_data_files(input_path)
+    model, columns = fit_isolation_forest(files, columns, sample_size=sample_size)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            report = score_parquet_dataset(files, tmp, model, columns, batch_size=batch_size,
+                                           max_workers=workers, executor=executor, task_rows=task_rows)
+            rows.append({"workers": report["workers"], "seconds": report["seconds"],
+                         "rows_per_s": report["rows_per_s"]})
+    for row in rows:
+        row["speedup"] = row["rows_per_s"] / rows[0]["rows_per_s"]
+        row["efficiency"] = row["speedup"] * rows[0]["workers"] / row["workers"]
+    return rows
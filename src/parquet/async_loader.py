@@ -0,0 +1,127 @@
+"""
+Concurrent loading of many Parquet files with asyncio.
+Jobs that read dozens of small daily files spend most of their time waiting
+on I/O and footer parsing. This module runs `load_parquet_table` (checks,
+validation and decoding) for many files at once on a thread pool, where
+pyarrow releases the GIL, with a bound on the number of files in flight.
+
+    1) `load_parquet_many_async` returns one concatenated table.
+    2) `iter_parquet_many_async` yields each file's table as it is ready.
+    3) `load_parquet_many` is a blocking wrapper for synchronous callers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from parquet.load_parquet import load_parquet_table
+from parquet.util import lazy_import, list_data_files, setup_logger
+
+pa = lazy_import("pyarrow")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def _resolve_files(files) -> list[Path]:
+    """A directory or glob expands to its Parquet files; a list is taken as given."""
+    if isinstance(files, (str, Path)):
+        return list_data_files(files)
+    return [Path(f) for f in files]
+
+
+async def iter_parquet_many_async(
+        files,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+        validation: str = "data",
+        memory_map: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = False,
+        executor: ThreadPoolExecutor | None = None,
+        ):
+    """
+    Load many Parquet files concurrently and yield `(path, table)` pairs.
+
+    Every file goes through `load_parquet_table`, so the usual checks and
+    validation apply per file and the first failure is raised to the caller
+    (pending loads are cancelled).
+
+    Args:
+        files (Iterable[Path | str] | Path | str): Files, or a directory/glob
+            expanded with `list_data_files`.
+        columns, filters, validation, memory_map: As in `load_parquet_table`.
+        max_concurrency (int): Maximum number of files opened at the same time.
+        ordered (bool): Yield in input order instead of completion order.
+        executor (ThreadPoolExecutor | None): Pool running the loads. Defaults
+            to a pool of `max_concurrency` threads owned by this call.
+
+    Yields:
+        tuple[Path, pa.Table]: Each file and its table.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive integer.")
+    files = _resolve_files(files)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="parquet-load")
+
+    async def load(file_path: Path):
+        async with semaphore:
+            load_file = partial(load_parquet_table, file_path.parent, file_path.name, columns=columns,
+                                filters=filters, validation=validation, memory_map=memory_map)
+            return file_path, await loop.run_in_executor(executor, load_file)
+
+    tasks = [asyncio.ensure_future(load(f)) for f in files]
+    try:
+        for next_result in (tasks if ordered else asyncio.as_completed(tasks)):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+async def load_parquet_many_async(
+        files,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+        validation: str = "data",
+        memory_map: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        executor: ThreadPoolExecutor | None = None,
+        ) -> pa.Table:
+    """
+    Load many Parquet files concurrently into one table, in input order.
+
+    Takes the same arguments as `iter_parquet_many_async`. Schemas are
+    unified across files (e.g. a column missing from one file is null there).
+
+    Returns:
+        pa.Table: The concatenated tables of all files.
+    """
+    tables = [
+        table async for _, table in iter_parquet_many_async(
+            files, columns=columns, filters=filters, validation=validation, memory_map=memory_map,
+            max_concurrency=max_concurrency, ordered=True, executor=executor,
+        )
+    ]
+    if not tables:
+        raise ValueError("No Parquet files to load.")
+    table = pa.concat_tables(tables, promote_options="default")
+    LOGGER.info(f"Loaded {len(tables)} files concurrently with shape {table.shape}")
+    return table
+
+
+def load_parquet_many(files, **kwargs) -> pa.Table:
+    """Blocking wrapper of `load_parquet_many_async` for code without an event loop."""
+    return asyncio.run(load_parquet_many_async(files, **kwargs))
@@ -0,0 +1,232 @@
+"""
+Benchmark suite and regression tracker.
+This module times the main entry points of the package on synthetic data
+(see `parquet.synthetic`) and stores the results as JSON, one file per run:
+
+    1) `run` generates a CSV and a Parquet file of `--rows` rows and times
+       each case in its own subprocess, so the recorded peak RSS belongs to
+       that case alone. It records wall time (best of `--repeat`), rows/s,
+       MB/s of input read and peak RSS.
+    2) `compare` reads two result files and flags every case whose wall time
+       or peak RSS grew by more than `--threshold`; it exits with status 1
+       when there is a regression, so it can gate CI.
+
+Usage:
+    python -m parquet.benchmark run --rows 1000000 [--output results.json]
+    python -m parquet.benchmark compare base.json head.json [--threshold 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from parquet.synthetic import write_sensor_csv, write_sensor_parquet
+from parquet.util import lazy_import, peak_rss_bytes
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+
+CSV_FILE = "training_data.csv"
+PARQUET_FILE = "training_data.parquet"
+DEFAULT_THRESHOLD = 0.10
+
+
+def _csv_to_parquet(workdir: Path, streaming: bool = False):
+    from parquet.csv_to_parquet import csv_to_parquet
+
+    csv_to_parquet(workdir / CSV_FILE, workdir / "converted.parquet", streaming=streaming)
+
+
+def _load_csv_data(workdir: Path):
+    from parquet.load_csv import load_csv_data
+
+    load_csv_data(workdir, CSV_FILE)
+
+
+def _load_parquet_data(workdir: Path):
+    from parquet.load_parquet import load_parquet_data
+
+    load_parquet_data(workdir, PARQUET_FILE)
+
+
+def _stats_pipeline(workdir: Path, engine: str = "pandas"):
+    from parquet.stats_compute import stats_pipeline
+
+    stats_pipeline(workdir, workdir, engine=engine)
+
+
+# Case name -> (function, keyword arguments, input file whose size gives MB/s)
+CASES = {
+    "csv_to_parquet": (_csv_to_parquet, {}, CSV_FILE),
+    "csv_to_parquet_streaming": (_csv_to_parquet, {"streaming": True}, CSV_FILE),
+    "load_csv_data": (_load_csv_data, {}, CSV_FILE),
+    "load_parquet_data": (_load_parquet_data, {}, PARQUET_FILE),
+    "stats_pipeline_pandas": (_stats_pipeline, {"engine": "pandas"}, PARQUET_FILE),
+    "stats_pipeline_fused": (_stats_pipeline, {"engine": "fused"}, PARQUET_FILE),
+}
+
+
+def _run_case_in_process(name: str, workdir: Path, repeat: int) -> dict:
+    """Time one case in the current process (the subprocess side of `run_case`)."""
+    logging.disable(logging.CRITICAL)
+    func, kwargs, _ = CASES[name]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(workdir, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return {"wall_s": best, "peak_rss_bytes": peak_rss_bytes()}
+
+
+def run_case(name: str, workdir: Path, rows: int, repeat: int = 3) -> dict:
+    """
+    Run one case in a fresh interpreter and derive its throughput.
+
+    Returns:
+        dict: `wall_s`, `rows_per_s`, `mb_per_s` and `peak_rss_mb` of the case.
+    """
+    command = [sys.executable, "-m", "parquet.benchmark", "_case", name, str(workdir), "--repeat", str(repeat)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    measured = json.loads(output.strip().splitlines()[-1])
+    input_bytes = (workdir / CASES[name][2]).stat().st_size
+    wall = max(measured["wall_s"], 1e-9)
+    return {
+        "wall_s": wall,
+        "rows_per_s": rows / wall,
+        "mb_per_s": input_bytes / wall / 1e6,
+        "peak_rss_mb": measured["peak_rss_bytes"] / 1e6,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(rows: int, cases=None, repeat: int = 3, workdir=None) -> dict:
+    """
+    Generate the input files and run the selected cases.
+
+    Args:
+        rows (int): Rows of synthetic data (1e5 to 1e9; eager loaders need the
+            data to fit in memory).
+        cases (Iterable[str] | None): Case names (default: all of `CASES`).
+        repeat (int): Timed repetitions per case; the best is kept.
+        workdir (Path | str | None): Folder for the generated files (default:
+            a temporary folder removed afterwards).
+
+    Returns:
+        dict: `meta` (commit, versions, rows, input sizes) and `results` per case.
+    """
+    cases = list(cases or CASES)
+    unknown = sorted(set(cases) - set(CASES))
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases {unknown}, expected some of {sorted(CASES)}.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(workdir) if workdir is not None else Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        write_sensor_csv(workdir / CSV_FILE, rows)
+        write_sensor_parquet(workdir / PARQUET_FILE, rows)
+        results = {}
+        for name in cases:
+            results[name] = run_case(name, workdir, rows, repeat)
+            print(f"{name:<28}{results[name]['wall_s']:9.3f} s {results[name]['rows_per_s']:>14,.0f} rows/s "
+                  f"{results[name]['mb_per_s']:9.1f} MB/s {results[name]['peak_rss_mb']:9.1f} MB RSS")
+        meta = {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "rows": rows,
+            "repeat": repeat,
+            "csv_bytes": (workdir / CSV_FILE).stat().st_size,
+            "parquet_bytes": (workdir / PARQUET_FILE).stat().st_size,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "machine": platform.machine(),
+        }
+    return {"meta": meta, "results": results}
+
+
+def compare_results(base: dict, head: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Relative change of wall time and peak RSS per case present in both runs.
+
+    Returns:
+        list[dict]: One row per case with `wall_change`, `rss_change` and
+        `regression` (True when either grew by more than `threshold`).
+    """
+    rows = []
+    for name in base["results"].keys() & head["results"].keys():
+        old, new = base["results"][name], head["results"][name]
+        wall_change = new["wall_s"] / old["wall_s"] - 1
+        rss_change = new["peak_rss_mb"] / old["peak_rss_mb"] - 1
+        rows.append({
+            "case": name, "base_wall_s": old["wall_s"], "head_wall_s": new["wall_s"],
+            "wall_change": wall_change, "rss_change": rss_change,
+            "regression": wall_change > threshold or rss_change > threshold,
+        })
+    return sorted(rows, key=lambda row: row["case"])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m parquet.benchmark", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and save the results as JSON")
+    run.add_argument("--rows", type=int, default=1_000_000)
+    run.add_argument("--cases", nargs="+", choices=sorted(CASES), default=None)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--workdir", default=None, help="keep the generated data here")
+    run.add_argument("--output", default=None, help="result file (default: benchmark-<commit>-<rows>.json)")
+
+    compare = commands.add_parser("compare", help="flag regressions between two result files")
+    compare.add_argument("base")
+    compare.add_argument("head")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    case = commands.add_parser("_case")  # internal: one case in a fresh process
+    case.add_argument("name", choices=sorted(CASES))
+    case.add_argument("workdir", type=Path)
+    case.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args(argv)
+    if args.command == "_case":
+        print(json.dumps(_run_case_in_process(args.name, args.workdir, args.repeat)))
+        return 0
+
+    if args.command == "run":
+        suite = run_suite(args.rows, args.cases, args.repeat, args.workdir)
+        output = args.output or f"benchmark-{suite['meta']['commit'] or 'local'}-{args.rows}.json"
+        with open(output, "w", encoding="utf-8") as fp:
+            json.dump(suite, fp, indent=1)
+        print(f"Results saved to {output}")
+        return 0
+
+    with open(args.base, "r", encoding="utf-8") as fp:
+        base = json.load(fp)
+    with open(args.head, "r", encoding="utf-8") as fp:
+        head = json.load(fp)
+    rows = compare_results(base, head, args.threshold)
+    print(f"{'case':<28}{'base s':>10}{'head s':>10}{'time':>9}{'rss':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<28}{row['base_wall_s']:>10.3f}{row['head_wall_s']:>10.3f}"
+              f"{row['wall_change']:>+9.1%}{row['rss_change']:>+9.1%}{flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Result cache for loaders and statistics.
+This module caches DataFrames returned by `load_parquet_data`,
+`load_csv_data` and `stats_pipeline` so repeated calls on unchanged files
+skip decoding and validation.
+
+Cache keys combine the identity of every input file (resolved path, size,
+mtime and optionally a SHA-256 of the content) with the function name and
+call arguments. Rewriting a file therefore changes the key and the stale
+entry is never served; it ages out of the LRU tiers or can be dropped with
+`ResultCache.invalidate`.
+
+    1) Memory tier: an LRU of DataFrames bounded by a byte budget.
+    2) Disk tier (optional): Arrow IPC (Feather v2) files that are
+       memory-mapped on read, bounded by a byte budget and evicted by
+       least recent use.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from parquet.load_csv import load_csv_data
+from parquet.load_parquet import load_parquet_data
+from parquet.stats_compute import save_statistics_to_csv, stats_pipeline
+from parquet.util import file_sha256, lazy_import, list_data_files, setup_logger
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+_SOURCES_KEY = b"parquet_cache_sources"
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + Arrow IPC on disk) cache of DataFrames keyed on
+    file identity and call arguments.
+
+    Args:
+        memory_bytes (int): Byte budget of the memory tier (0 disables it).
+        disk_dir (Path | str | None): Folder of the disk tier (None disables it).
+        disk_bytes (int): Byte budget of the disk tier.
+        hash_files (bool): Include a content hash in the file identity. Safer
+            when mtimes are unreliable, but reads every input file once per call.
+    """
+
+    def __init__(self, memory_bytes: int = 512 * 1024 * 1024, disk_dir=None,
+                 disk_bytes: int = 4 * 1024 * 1024 * 1024, hash_files: bool = False):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.disk_bytes = disk_bytes
+        self.hash_files = hash_files
+        self._memory = OrderedDict()  # key -> (DataFrame, nbytes, sources)
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def file_identity(self, file_path) -> dict:
+        """Identity of a file as used in cache keys."""
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        identity = {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if self.hash_files:
+            identity["sha256"] = file_sha256(path)
+        return identity
+
+    def make_key(self, func_name: str, files, args=(), kwargs=None, config=()) -> str:
+        """
+        Cache key of a call of `func_name` on `files` with the given arguments.
+
+        `config` names the `Config` sections (e.g. ``"CONFIG_STATISTICS"``)
+        whose values fill in defaults of the call; they are part of the key,
+        so changing the configuration does not serve stale results.
+        """
+        payload = {
+            "func": func_name,
+            "files": [self.file_identity(f) for f in files],
+            "args": [repr(a) for a in args],
+            "kwargs": {k: repr(v) for k, v in sorted((kwargs or {}).items())},
+            "config": _config_sections(config),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf8")).hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Cached DataFrame for `key`, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                # Shallow copy: with copy-on-write (pandas >= 3) callers cannot alter the cached frame
+                return self._memory[key][0].copy(deep=False)
+
+        disk_path = self._disk_path(key)
+        if disk_path is not None and disk_path.exists():
+            with pa.memory_map(str(disk_path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+            sources = json.loads(table.schema.metadata.get(_SOURCES_KEY, b"[]"))
+            df = table.to_pandas()
+            os.utime(disk_path)  # mark as recently used
+            with self._lock:
+                self.counters["disk_hits"] += 1
+            self._put_memory(key, df, sources)
+            return df.copy(deep=False)
+
+        with self._lock:
+            self.counters["misses"] += 1
+        return None
+
+    def put(self, key: str, df: pd.DataFrame, sources=()) -> None:
+        """Store `df` under `key` in both tiers. `sources` are the input file paths."""
+        sources = [str(Path(s).resolve()) for s in sources]
+        self._put_memory(key, df, sources)
+        disk_path = self._disk_path(key)
+        if disk_path is not None:
+            table = pa.Table.from_pandas(df)
+            metadata = dict(table.schema.metadata or {})
+            metadata[_SOURCES_KEY] = json.dumps(sources).encode("utf8")
+            table = table.replace_schema_metadata(metadata)
+            tmp_path = disk_path.with_suffix(".tmp")
+            with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, disk_path)
+            self._evict_disk()
+
+    def _put_memory(self, key: str, df: pd.DataFrame, sources) -> None:
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_used -= self._memory.pop(key)[1]
+            self._memory[key] = (df, nbytes, list(sources))
+            self._memory_used += nbytes
+            while self._memory_used > self.memory_bytes:
+                _, (_, evicted_bytes, _) = self._memory.popitem(last=False)
+                self._memory_used -= evicted_bytes
+                self.counters["evictions"] += 1
+
+    def _disk_path(self, key: str) -> Path | None:
+        return self.disk_dir / f"{key}.arrow" if self.disk_dir is not None else None
+
+    def _evict_disk(self) -> None:
+        entries = sorted(self.disk_dir.glob("*.arrow"), key=lambda p: p.stat().st_mtime)
+        used = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if used <= self.disk_bytes:
+                break
+            used -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.counters["evictions"] += 1
+
+    def invalidate(self, file_path=None) -> int:
+        """
+        Drop entries computed from `file_path`, or every entry if it is None.
+
+        Returns:
+            int: Number of entries removed from both tiers.
+        """
+        target = str(Path(file_path).resolve()) if file_path is not None else None
+        removed = 0
+        with self._lock:
+            for key in [k for k, v in self._memory.items() if target is None or target in v[2]]:
+                self._memory_used -= self._memory.pop(key)[1]
+                removed += 1
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.arrow"):
+                if target is not None:
+                    with pa.memory_map(str(path)) as source:
+                        metadata = pa.ipc.open_file(source).schema.metadata or {}
+                    if target not in json.loads(metadata.get(_SOURCES_KEY, b"[]")):
+                        continue
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters plus memory tier usage."""
+        with self._lock:
+            lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+            hits = lookups - self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+            }
+
+    def cached_call(self, func, files, *args, config=(), **kwargs) -> pd.DataFrame:
+        """
+        Return `func(*args, **kwargs)` from the cache, computing it on a miss.
+
+        `config` lists the `Config` sections the call reads (see `make_key`).
+        """
+        files = list(files)
+        key = self.make_key(f"{func.__module__}.{func.__qualname__}", files, args, kwargs, config)
+        df = self.get(key)
+        if df is not None:
+            LOGGER.info(f"Cache hit for {func.__qualname__} on {len(files)} files")
+            return df
+        df = func(*args, **kwargs)
+        self.put(key, df, sources=files)
+        # Same as a hit: the caller does not get the frame held by the cache
+        return df.copy(deep=False)
+
+
+def _config_sections(names) -> dict:
+    """Current values of the named `Config` sections, for cache keys."""
+    if not names:
+        return {}
+    from parquet.config import get_config
+
+    config = get_config()
+    return {name: getattr(config, name).model_dump(mode="json") for name in names}
+
+
+@lru_cache()
+def get_default_cache() -> ResultCache:
+    """Process-wide cache configured from `CONFIG_CACHE`."""
+    from parquet.config import get_config
+
+    config = get_config().CONFIG_CACHE
+    return ResultCache(
+        memory_bytes=config.memory_bytes,
+        disk_dir=config.disk_dir,
+        disk_bytes=config.disk_bytes,
+        hash_files=config.hash_files,
+    )
+
+
+def cached_load_parquet_data(folder_path, file_name, cache: ResultCache | None = None, **kwargs) -> pd.DataFrame:
+    """`load_parquet_data` through the result cache (same arguments)."""
+    cache = cache or get_default_cache()
+    file_path = Path(folder_path) / file_name
+    if not file_path.exists():
+        return load_parquet_data(folder_path, file_name, **kwargs)  # raises the usual error
+    return cache.cached_call(load_parquet_data, [file_path], folder_path, file_name,
+                             config=("CONFIG_COMPACT",), **kwargs)
+
+
+def cached_load_csv_data(folder_path, file_name, cache: ResultCache | None = None) -> pd.DataFrame:
+    """`load_csv_data` through the result cache."""
+    cache = cache or get_default_cache()
+    file_path = Path(folder_path) / file_name
+    if not file_path.exists():
+        return load_csv_data(folder_path, file_name)  # raises the usual error
+    return cache.cached_call(load_csv_data, [file_path], folder_path, file_name,
+                             config=("CONFIG_CSV_SCHEMA", "CONFIG_COMPACT"))
+
+
+def cached_stats_pipeline(input_path: str = 'data/processed/', stats_path: str = 'data/output',
+                          cache: ResultCache | None = None, **kwargs) -> pd.DataFrame:
+    """
+    `stats_pipeline` through the result cache. On a hit the cached statistics
+    are still written to `statistics.csv`.
+    """
+    cache = cache or get_default_cache()
+    if kwargs.get('dataset') or kwargs.get('incremental'):
+        files = list_data_files(input_path)
+    else:
+        files = [Path(input_path) / 'training_data.parquet']
+    if not all(Path(f).exists() for f in files):
+        return stats_pipeline(input_path, stats_path, **kwargs)  # raises the usual error
+
+    key = cache.make_key("parquet.stats_compute.stats_pipeline", files, (), kwargs, config=("CONFIG_STATISTICS",))
+    stats = cache.get(key)
+    if stats is None:
+        stats = stats_pipeline(input_path, stats_path, **kwargs)
+        cache.put(key, stats, sources=files)
+        stats = stats.copy(deep=False)
+    else:
+        LOGGER.info(f"Cache hit for stats_pipeline on {len(files)} files")
+        save_statistics_to_csv(stats, stats_path)
+    return stats
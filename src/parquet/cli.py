@@ -0,0 +1,370 @@
+"""
+Command line interface of the package: the `parquet` console command.
+
+    parquet convert data/raw/training_data.csv data/processed/training_data.parquet [--streaming]
+    parquet validate data/processed/training_data.parquet [--validation metadata]
+    parquet stats data/processed [--output data/output] [--engine fused]
+    parquet inspect data/processed/training_data.parquet
+    parquet anomaly data/processed data/output/anomaly_scores [--max-workers 4]
+    parquet features data/processed/training_data.parquet data/output/features.parquet [--windows 1h 1D]
+
+Every subcommand prints its result as JSON and exits with status 1 on error.
+
+Daemon mode keeps one interpreter running with pandas/pyarrow imported, the
+configuration loaded and the result cache (`parquet.cache`) warm, and accepts
+jobs over a local Unix socket:
+
+    parquet daemon --socket /tmp/parquet.sock
+    parquet stats data/processed --socket /tmp/parquet.sock
+
+The protocol is one JSON object per line in each direction. A request is
+``{"command": "stats", "args": {...}}`` with the same arguments as the
+subcommand; the reply is ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "...", "type": "ValueError"}``. The commands
+``ping`` and ``shutdown`` control the daemon itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import json
+import logging
+import math
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+from parquet.util import lazy_import, setup_logger
+
+pq = lazy_import("pyarrow.parquet")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+# Environment variable with the daemon socket used when `--socket` is not given
+SOCKET_ENV = "PARQUET_SOCKET"
+DEFAULT_DAEMON_WORKERS = 4
+
+
+def run_convert(source: str, output: str, streaming: bool = False, typed: bool = False,
+                profile: str | None = None, dataset: bool = False, partition_by: list[str] | None = None,
+                max_workers: int | None = None) -> dict:
+    """Convert CSV to Parquet: one file, or many CSV files into a partitioned dataset."""
+    from parquet.csv_to_parquet import convert_csv_dataset, csv_to_parquet
+
+    if dataset:
+        return convert_csv_dataset(source, output, partition_by=tuple(partition_by or ('TO',)),
+                                   max_workers=max_workers)
+    csv_to_parquet(source, output, streaming=streaming, typed=typed, profile=profile)
+    metadata = pq.read_metadata(output)
+    return {"source": source, "output": output, "rows": metadata.num_rows,
+            "row_groups": metadata.num_row_groups, "bytes": Path(output).stat().st_size}
+
+
+def run_validate(path: str, validation: str = "data") -> dict:
+    """Run the loader checks on a Parquet or CSV file; errors are raised."""
+    file_path = Path(path)
+    if file_path.suffix == ".csv":
+        from parquet.load_csv import load_csv_data
+
+        shape = load_csv_data(file_path.parent, file_path.name).shape
+    else:
+        from parquet.load_parquet import load_parquet_table
+
+        shape = load_parquet_table(file_path.parent, file_path.name, validation=validation).shape
+    return {"path": path, "valid": True, "rows": shape[0], "columns": shape[1]}
+
+
+def run_stats(input_path: str, output: str = "data/output", engine: str | None = None,
+              dataset: bool = False, incremental: bool = False, cache: bool = True) -> dict:
+    """Compute the statistics table (see `stats_pipeline`) and write `statistics.csv`."""
+    from parquet.cache import cached_stats_pipeline
+    from parquet.stats_compute import stats_pipeline
+
+    pipeline = cached_stats_pipeline if cache else stats_pipeline
+    stats = pipeline(input_path, output, engine=engine, dataset=dataset, incremental=incremental)
+    return {"output": os.path.join(output, "statistics.csv"), "statistics": stats.to_dict()}
+
+
+def run_inspect(path: str) -> dict:
+    """Schema, row groups, codecs and sizes of a Parquet file, from its footer only."""
+    metadata = pq.read_metadata(path)
+    columns = []
+    for i, field in enumerate(metadata.schema.to_arrow_schema()):
+        chunks = [metadata.row_group(rg).column(i) for rg in range(metadata.num_row_groups)]
+        columns.append({
+            "name": field.name,
+            "type": str(field.type),
+            "compression": sorted({chunk.compression for chunk in chunks}),
+            "encodings": sorted({encoding for chunk in chunks for encoding in chunk.encodings}),
+            "compressed_bytes": sum(chunk.total_compressed_size for chunk in chunks),
+            "uncompressed_bytes": sum(chunk.total_uncompressed_size for chunk in chunks),
+        })
+    return {
+        "path": path,
+        "bytes": Path(path).stat().st_size,
+        "rows": metadata.num_rows,
+        "row_groups": metadata.num_row_groups,
+        "created_by": metadata.created_by,
+        "columns": columns,
+    }
+
+
+def run_anomaly(input_path: str, output: str, sample_size: int | None = None, max_workers: int | None = None,
+                executor: str = "process") -> dict:
+    """Fit Isolation Forest on a sample and write the anomaly scores of every row (see `parquet.anomaly`)."""
+    from parquet.anomaly import DEFAULT_SAMPLE_SIZE, anomaly_pipeline
+
+    return anomaly_pipeline(input_path, output, sample_size=sample_size or DEFAULT_SAMPLE_SIZE,
+                            max_workers=max_workers, executor=executor)
+
+
+def run_features(path: str, output: str, windows: list[str] | None = None) -> dict:
+    """Write rolling-window features per `TO` to a Parquet file (see `rolling_features_to_parquet`)."""
+    from parquet.load_training_data import rolling_features_to_parquet
+
+    path = Path(path)
+    return rolling_features_to_parquet(path.parent, path.name, output, windows=windows)
+
+
+# Subcommand -> function taking the parsed arguments as keywords
+COMMANDS = {
+    "convert": run_convert,
+    "validate": run_validate,
+    "stats": run_stats,
+    "inspect": run_inspect,
+    "anomaly": run_anomaly,
+    "features": run_features,
+}
+
+
+def _json_safe(value):
+    """Replace NaN and infinities (e.g. in `statistics`) with None, recursively."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def _to_json(value, indent: int | None = None) -> str:
+    """Strict JSON of a command result: NaN becomes null, unknown types their str()."""
+    return json.dumps(_json_safe(value), indent=indent, default=str, allow_nan=False)
+
+
+def run_command(command: str, args: dict) -> dict:
+    """Run one subcommand in this process."""
+    if command not in COMMANDS:
+        raise ValueError(f"Unknown command {command!r}, expected one of {sorted(COMMANDS)}.")
+    return COMMANDS[command](**args)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Serve the JSON-lines requests of one client connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            reply = self.server.dispatch(line)
+            self.wfile.write(_to_json(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class ParquetDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Long-lived job server on a Unix socket.
+
+    Each connection is served on its own thread; at most `workers` jobs run
+    at the same time, the others wait for a slot. Jobs that use a process
+    pool start its workers from a fork server (see `parquet.util.process_pool`),
+    not by forking this multithreaded process.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, workers: int = DEFAULT_DAEMON_WORKERS):
+        self.socket_path = str(socket_path)
+        self._slots = threading.BoundedSemaphore(workers)
+        self.started = time.time()
+        self.jobs = 0
+        self._jobs_lock = threading.Lock()
+        super().__init__(self.socket_path, _JobHandler)
+
+    def warm_up(self) -> None:
+        """Import the heavy dependencies and load the configuration and cache up front."""
+        from parquet.cache import get_default_cache
+
+        for module in ("pandas", "pyarrow.parquet", "pyarrow.csv", "pyarrow.dataset",
+                       "parquet.csv_to_parquet", "parquet.stats_compute", "parquet.write_profiles"):
+            importlib.import_module(module)
+        get_default_cache()
+
+    def dispatch(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+            command = request["command"]
+            if command == "ping":
+                return {"ok": True, "result": {"pid": os.getpid(), "uptime_s": time.time() - self.started,
+                                               "jobs": self.jobs}}
+            if command == "shutdown":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"ok": True, "result": "shutting down"}
+            with self._slots:
+                start = time.perf_counter()
+                result = run_command(command, request.get("args") or {})
+            with self._jobs_lock:
+                self.jobs += 1
+            LOGGER.info(f"Job {command} finished in {time.perf_counter() - start:.3f} s")
+            return {"ok": True, "result": result}
+        except Exception as e:
+            LOGGER.error(f"Job failed: {e}")
+            return {"ok": False, "error": str(e), "type": type(e).__name__}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path, workers: int = DEFAULT_DAEMON_WORKERS, warm: bool = True) -> None:
+    """
+    Run the daemon until it receives ``shutdown`` or is interrupted.
+
+    Raises:
+        FileExistsError: If another daemon is already listening on `socket_path`.
+    """
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        try:
+            submit(socket_path, "ping")
+        except OSError:
+            socket_path.unlink()  # stale socket of a daemon that did not exit cleanly
+        else:
+            raise FileExistsError(f"A daemon is already listening on {socket_path}.")
+    with ParquetDaemon(socket_path, workers) as server:
+        if warm:
+            server.warm_up()
+        LOGGER.info(f"Daemon {os.getpid()} listening on {socket_path} with {workers} workers")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def submit(socket_path, command: str, args: dict | None = None, timeout: float | None = None):
+    """
+    Send one job to a running daemon and return its result.
+
+    Raises:
+        OSError: If no daemon listens on `socket_path`.
+        RuntimeError: If the job failed in the daemon.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps({"command": command, "args": args or {}}).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reply_file:
+            reply = json.loads(reply_file.readline())
+    if not reply["ok"]:
+        raise RuntimeError(f"{reply['type']}: {reply['error']}")
+    return reply["result"]
+
+
+def _absolute(path: str) -> str:
+    # The daemon may run in another working directory
+    return os.path.abspath(path)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="parquet", description=__doc__.splitlines()[1])
+    # Shared by every subcommand, so it can follow the subcommand name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", default=os.getenv(SOCKET_ENV),
+                        help=f"Unix socket of the daemon that runs the command (env {SOCKET_ENV})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = partial(commands.add_parser, parents=[common])
+
+    convert = add_parser("convert", help="convert CSV to Parquet")
+    convert.add_argument("source", type=_absolute, help="CSV file (a directory or glob with --dataset)")
+    convert.add_argument("output", type=_absolute, help="Parquet file (dataset directory with --dataset)")
+    convert.add_argument("--streaming", action="store_true", help="bounded-memory conversion")
+    convert.add_argument("--typed", action="store_true", help="parse with the declared CSV schema")
+    convert.add_argument("--profile", default=None, help="write profile, e.g. scan-optimized")
+    convert.add_argument("--dataset", action="store_true", help="convert many CSV files into a partitioned dataset")
+    convert.add_argument("--partition-by", nargs="+", default=None)
+    convert.add_argument("--max-workers", type=int, default=None)
+
+    validate = add_parser("validate", help="check a Parquet or CSV file for emptiness and nulls")
+    validate.add_argument("path", type=_absolute)
+    validate.add_argument("--validation", choices=["data", "metadata"], default="data")
+
+    stats = add_parser("stats", help="compute statistics and write statistics.csv")
+    stats.add_argument("input_path", type=_absolute, help="folder with training_data.parquet, or a dataset")
+    stats.add_argument("--output", type=_absolute, default="data/output")
+    stats.add_argument("--engine", choices=["pandas", "streaming", "fused", "sample"], default=None)
+    stats.add_argument("--dataset", action="store_true")
+    stats.add_argument("--incremental", action="store_true")
+    stats.add_argument("--no-cache", dest="cache", action="store_false")
+
+    inspect = add_parser("inspect", help="show the schema and layout of a Parquet file")
+    inspect.add_argument("path", type=_absolute)
+
+    anomaly = add_parser("anomaly", help="score every row of a Parquet dataset with Isolation Forest")
+    anomaly.add_argument("input_path", type=_absolute, help="Parquet file, directory or glob")
+    anomaly.add_argument("output", type=_absolute, help="folder of the score dataset")
+    anomaly.add_argument("--sample-size", type=int, default=None)
+    anomaly.add_argument("--max-workers", type=int, default=None)
+    anomaly.add_argument("--executor", choices=["process", "thread"], default="process")
+
+    features = add_parser("features", help="write rolling-window features per TO to a Parquet file")
+    features.add_argument("path", type=_absolute, help="Parquet file sorted by time within each TO")
+    features.add_argument("output", type=_absolute, help="Parquet file of the feature table")
+    features.add_argument("--windows", nargs="+", default=None, help="window lengths, e.g. 1h 1D")
+
+    daemon = add_parser("daemon", help="serve jobs on a Unix socket")
+    daemon.add_argument("--workers", type=int, default=DEFAULT_DAEMON_WORKERS, help="jobs run at the same time")
+    daemon.add_argument("--no-warm-up", dest="warm", action="store_false")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    options = vars(args)
+    command, socket_path = options.pop("command"), options.pop("socket")
+
+    if command == "daemon":
+        if not socket_path:
+            parser.error(f"the daemon needs --socket or {SOCKET_ENV}")
+        try:
+            serve(socket_path, **options)
+        except FileExistsError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    try:
+        if socket_path:
+            result = submit(socket_path, command, options)
+        else:
+            # Progress printed by the pipelines goes to stderr, keeping stdout valid JSON
+            with contextlib.redirect_stdout(sys.stderr):
+                result = run_command(command, options)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(_to_json(result, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Compact in-memory representation of loaded frames.
+This module shrinks the dtypes of a pandas DataFrame so more data fits in
+memory: float64 columns become float32 when every value round-trips within
+a relative tolerance, integer columns take the smallest signed integer
+type that holds their range, and low-cardinality ids and strings become
+categoricals (dictionary encoding with small integer codes).
+
+Each conversion is kept only when it reduces the column's memory, and
+`compact_frame` returns a per-column before/after report along with the
+compacted frame. Frames compacted by the loaders carry the report in
+`df.attrs` (see `memory_report`).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from parquet.util import lazy_import, setup_logger
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+# Default maximum relative error of a float64 -> float32 downcast
+DEFAULT_FLOAT_TOLERANCE = 1e-6
+# Default maximum ratio of distinct values to rows for dictionary encoding
+DEFAULT_MAX_CATEGORY_RATIO = 0.5
+REPORT_COLUMNS = ["dtype_before", "dtype_after", "bytes_before", "bytes_after", "saved"]
+# Key of the report in the `attrs` of frames compacted by the loaders
+MEMORY_REPORT_ATTR = "memory_report"
+_INTEGER_TYPES = {
+    "signed": ["int8", "int16", "int32", "int64"],
+    "unsigned": ["uint8", "uint16", "uint32", "uint64"],
+}
+
+
+def downcast_float(values: pd.Series, tolerance: float = DEFAULT_FLOAT_TOLERANCE) -> pd.Series:
+    """
+    Cast a float64 series to float32 if every value round-trips within `tolerance`.
+
+    The error of each value is measured relative to its magnitude; NaN and
+    infinities must be preserved exactly, and values out of the float32
+    range make the cast fail. Returns `values` unchanged otherwise.
+    """
+    if values.dtype != np.float64:
+        return values
+    original = values.to_numpy()
+    with np.errstate(invalid="ignore", over="ignore"):
+        narrowed = original.astype(np.float32)
+        error = np.abs(narrowed.astype(np.float64) - original)
+        exact = (narrowed == original) | (np.isnan(original) & np.isnan(narrowed))
+        if not np.all(exact | (error <= tolerance * np.abs(original))):
+            return values
+    return pd.Series(narrowed, index=values.index, name=values.name)
+
+
+def downcast_integer(values: pd.Series, allow_unsigned: bool = False) -> pd.Series:
+    """
+    Cast an integer series to the smallest integer type that holds its range.
+
+    Signed types are used unless `allow_unsigned` is set, so that arithmetic
+    such as differences of timestamps can still go negative.
+    """
+    if not isinstance(values.dtype, np.dtype) or values.dtype.kind not in "iu" or values.empty:
+        return values
+    low, high = values.min(), values.max()
+    for name in _INTEGER_TYPES["unsigned" if allow_unsigned and low >= 0 else "signed"]:
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            if np.dtype(name).itemsize < values.dtype.itemsize:
+                return values.astype(name)
+            break
+    return values
+
+
+def encode_categorical(values: pd.Series, max_category_ratio: float = DEFAULT_MAX_CATEGORY_RATIO) -> pd.Series:
+    """
+    Dictionary-encode a series as a categorical if it has few distinct values.
+
+    The series is left unchanged when the number of distinct values exceeds
+    ``max_category_ratio * len(values)``.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype) or values.empty:
+        return values
+    if values.nunique(dropna=False) > max_category_ratio * len(values):
+        return values
+    return values.astype("category")
+
+
+def compact_frame(
+        df: pd.DataFrame,
+        float_tolerance: float = DEFAULT_FLOAT_TOLERANCE,
+        max_category_ratio: float = DEFAULT_MAX_CATEGORY_RATIO,
+        categorical_columns: list[str] | tuple[str, ...] = ("TO",),
+        allow_unsigned: bool = False,
+        ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Downcast the columns of `df` to compact dtypes.
+
+    Float64 columns are narrowed with `downcast_float`, integer columns
+    with `downcast_integer`, and string columns as well as the columns in
+    `categorical_columns` (integer ids such as `TO`) are dictionary-encoded
+    with `encode_categorical`. Other dtypes, e.g. timestamps or
+    `pd.ArrowDtype` columns, are kept as they are. A conversion is only
+    applied when it makes the column smaller.
+
+    Args:
+        df (pd.DataFrame): Frame to compact. It is not modified.
+        float_tolerance (float): Maximum relative error of a float32 downcast.
+        max_category_ratio (float): Maximum ratio of distinct values to rows
+            for dictionary encoding.
+        categorical_columns (list[str]): Columns that hold ids and are
+            dictionary-encoded rather than downcast. Missing names are ignored.
+        allow_unsigned (bool): Downcast non-negative integer columns to
+            unsigned types (e.g. `time` to uint32 instead of int64).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: The compacted frame and a report
+        indexed by column with the dtype and memory (bytes, including object
+        contents) before and after, and the bytes saved.
+    """
+    columns = {}
+    report = {}
+    for name in df.columns:
+        values = df[name]
+        before = int(values.memory_usage(index=False, deep=True))
+        if name in categorical_columns or pd.api.types.is_string_dtype(values.dtype):
+            candidate = encode_categorical(values, max_category_ratio)
+        elif not isinstance(values.dtype, np.dtype):
+            candidate = values
+        elif values.dtype.kind == "f":
+            candidate = downcast_float(values, float_tolerance)
+        elif values.dtype.kind in "iu":
+            candidate = downcast_integer(values, allow_unsigned)
+        else:
+            candidate = values
+        after = int(candidate.memory_usage(index=False, deep=True))
+        if after >= before:
+            candidate, after = values, before
+        columns[name] = candidate
+        report[name] = [str(values.dtype), str(candidate.dtype), before, after, before - after]
+
+    compacted = pd.DataFrame(columns, index=df.index)
+    report = pd.DataFrame.from_dict(report, orient="index", columns=REPORT_COLUMNS)
+    return compacted, report
+
+
+def compact_loaded_frame(df: pd.DataFrame, compact: bool | None, source) -> pd.DataFrame:
+    """
+    Apply `compact_frame` with `CONFIG_COMPACT` to a frame returned by a loader.
+
+    `compact=None` uses `CONFIG_COMPACT.enabled`. The memory saved is logged
+    with `source` (the loaded file) and the report is stored in the `attrs`
+    of the returned frame, see `memory_report`.
+    """
+    if compact is False:
+        return df
+    from parquet.config import get_config
+
+    config = get_config().CONFIG_COMPACT
+    if not (compact or config.enabled):
+        return df
+    df, report = compact_frame(
+        df, float_tolerance=config.float_tolerance, max_category_ratio=config.max_category_ratio,
+        categorical_columns=config.categorical_columns, allow_unsigned=config.allow_unsigned,
+    )
+    df.attrs[MEMORY_REPORT_ATTR] = report.to_dict(orient="index")
+    before, after = report["bytes_before"].sum(), report["bytes_after"].sum()
+    LOGGER.info(
+        f"Compacted {source} from {before / 2 ** 20:.1f} MiB to {after / 2 ** 20:.1f} MiB "
+        f"({int((report['saved'] > 0).sum())} of {len(report)} columns downcast)"
+    )
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame | None:
+    """
+    Per-column memory report of a frame compacted by a loader (see
+    `compact_frame`), or None if the frame was not compacted.
+    """
+    report = df.attrs.get(MEMORY_REPORT_ATTR)
+    if report is None:
+        return None
+    return pd.DataFrame.from_dict(report, orient="index", columns=REPORT_COLUMNS)
@@ -62,6 +62,86 @@ class ConfigParametersIsolationForest(BaseModel):
         existing_keys = valid_keys.intersection(self.__fields__.keys())  # Check against model fields
         return self.dict(include=existing_keys)
 
+class ConfigParametersStatistics(BaseModel):
+    """
+    This class defines the configuration parameters for the statistics pipeline.
+    It can be extended with additional configuration variables as needed.
+    """
+
+    engine: str = "pandas"  # "pandas" (df.describe), "streaming" (out-of-core), "fused" (streaming + validation in one pass) or "sample" (approximate)
+    batch_size: int = 65536  # Rows decoded per record batch in streaming mode
+    quantile_error: float = 0.01  # Target normalized rank error of streamed quantiles
+    sample_size: int = 100_000  # Rows sampled by the "sample" engine
+    sample_row_groups: int = 32  # Row groups decoded at least by the "sample" engine
+    confidence: float = 0.95  # Confidence level of the "sample" engine's intervals
+
+
+class ConfigParametersCache(BaseModel):
+    """
+    This class defines the configuration parameters for the result cache.
+    It can be extended with additional configuration variables as needed.
+    """
+
+    memory_bytes: int = 512 * 1024 * 1024  # Byte budget of the in-process LRU tier
+    disk_dir: str | None = None  # Folder of the Arrow IPC tier; None disables it
+    disk_bytes: int = 4 * 1024 * 1024 * 1024  # Byte budget of the disk tier
+    hash_files: bool = False  # Add a content hash to the file identity in cache keys
+
+
+class ConfigParametersCsvSchema(BaseModel):
+    """
+    This class defines the declared schema used to parse CSV files without
+    type inference. It can be extended with additional configuration variables as needed.
+    """
+
+    enabled: bool = False  # Use the declared schema by default in the CSV loaders
+    time_column: str = "time"  # Epoch column parsed as a timestamp
+    time_unit: str = "s"  # Unit of the epoch values in `time_column`
+    id_column: str = "TO"  # Id column, dictionary-encoded (categorical in pandas)
+    value_dtype: str = "float32"  # Arrow type of every other column
+    columns: dict[str, str] = {}  # Per-column Arrow type overrides, e.g. {"sensor1_min": "float64"}
+    use_threads: bool = True  # Parse blocks on multiple threads
+    block_size: int = 16 * 1024 * 1024  # Bytes of CSV parsed per block
+
+
+class ConfigParametersCompact(BaseModel):
+    """
+    This class defines the configuration parameters for compacting loaded frames.
+    It can be extended with additional configuration variables as needed.
+    """
+
+    enabled: bool = False  # Downcast the frames returned by the CSV and Parquet loaders by default
+    float_tolerance: float = 1e-6  # Maximum relative error of a float64 -> float32 downcast
+    max_category_ratio: float = 0.5  # Dictionary-encode strings and ids with at most this ratio of distinct values
+    categorical_columns: list[str] = ["TO"]  # Integer id columns that are dictionary-encoded instead of downcast
+    allow_unsigned: bool = False  # Downcast non-negative integers to unsigned types (differences can wrap around)
+
+
+class ConfigParametersFeatures(BaseModel):
+    """
+    This class defines the configuration parameters for the rolling-window features.
+    It can be extended with additional configuration variables as needed.
+    """
+
+    windows: list[str] = ["1h"]  # Window lengths as pandas offsets, e.g. ["1h", "1D"]
+    stats: list[str] = ["mean", "std", "min", "max"]  # Statistics computed per window
+    batch_size: int = 65536  # Rows read per record batch
+    dtype: str = "float32"  # NumPy dtype of the feature columns
+
+
+class ConfigParametersInstrumentation(BaseModel):
+    """
+    This class defines the configuration parameters for spans, metrics and log format.
+    It can be extended with additional configuration variables as needed.
+    """
+
+    enabled: bool = False  # Record spans and metrics around the loader and pipeline stages
+    log_format: str = "text"  # "text" or "json" (one JSON object per log record)
+    export_format: str = "prometheus"  # "prometheus" (text exposition) or "json"
+    export_path: str | None = None  # Write the metrics here at interpreter exit; None disables it
+    span_log_level: str = "INFO"  # Level of the "parquet.spans" logger; span records are logged at INFO
+
+
 class Config(BaseSettings):
     """
     This config will automatically read in the environment variables that have the same name as its class variables.
@@ -73,6 +153,12 @@ class Config(BaseSettings):
     LOGLEVEL: str = "INFO"
     CONFIG_AUTO_ENCODER: ConfigParametersAutoEncoder = ConfigParametersAutoEncoder()
     CONFIG_ISOLATION_FOREST: ConfigParametersIsolationForest = ConfigParametersIsolationForest()
+    CONFIG_STATISTICS: ConfigParametersStatistics = ConfigParametersStatistics()
+    CONFIG_CACHE: ConfigParametersCache = ConfigParametersCache()
+    CONFIG_CSV_SCHEMA: ConfigParametersCsvSchema = ConfigParametersCsvSchema()
+    CONFIG_INSTRUMENTATION: ConfigParametersInstrumentation = ConfigParametersInstrumentation()
+    CONFIG_COMPACT: ConfigParametersCompact = ConfigParametersCompact()
+    CONFIG_FEATURES: ConfigParametersFeatures = ConfigParametersFeatures()
 
 
 
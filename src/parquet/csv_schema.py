@@ -0,0 +1,142 @@
+"""
+Declared schema for CSV parsing.
+This module parses sensor CSV files with `pyarrow.csv` and an explicit type
+per column instead of letting `pd.read_csv` infer them:
+
+    1) `time` (epoch integers) becomes a timestamp.
+    2) `TO` is dictionary-encoded, i.e. a categorical column in pandas.
+    3) Every other column uses `value_dtype` (float32 by default) unless it
+       has an override in `columns`.
+
+Types are taken from the header and `CONFIG_CSV_SCHEMA`, so no data is
+sampled for inference and blocks are parsed on multiple threads.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from parquet.util import lazy_import, setup_logger
+
+pa = lazy_import("pyarrow")
+pa_csv = lazy_import("pyarrow.csv")
+pq = lazy_import("pyarrow.parquet")
+
+if TYPE_CHECKING:
+    from parquet.config import ConfigParametersCsvSchema
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+
+def _schema_config(schema_config: ConfigParametersCsvSchema | None) -> ConfigParametersCsvSchema:
+    if schema_config is not None:
+        return schema_config
+    from parquet.config import get_config
+
+    return get_config().CONFIG_CSV_SCHEMA
+
+
+def read_csv_header(file_path) -> list[str]:
+    """Column names from the first line of a CSV file."""
+    with open(file_path, "r", encoding="utf-8", newline="") as fp:
+        return next(csv.reader(fp), [])
+
+
+def csv_column_types(names, schema_config: ConfigParametersCsvSchema | None = None) -> dict[str, pa.DataType]:
+    """
+    Arrow type used to parse each column of a CSV file.
+
+    `time` is parsed as an integer here and cast to a timestamp afterwards,
+    since the CSV reader only parses timestamps from date strings.
+    """
+    config = _schema_config(schema_config)
+    types = {}
+    for name in names:
+        if name in config.columns:
+            types[name] = pa.type_for_alias(config.columns[name])
+        elif name == config.time_column:
+            types[name] = pa.int64()
+        elif name == config.id_column:
+            types[name] = pa.dictionary(pa.int32(), pa.int64())
+        else:
+            types[name] = pa.type_for_alias(config.value_dtype)
+    return types
+
+
+def typed_csv_schema(names, schema_config: ConfigParametersCsvSchema | None = None) -> pa.Schema:
+    """Schema of the tables returned by `read_csv_typed` for a header `names`."""
+    config = _schema_config(schema_config)
+    types = csv_column_types(names, config)
+    if config.time_column in types and config.time_column not in config.columns:
+        types[config.time_column] = pa.timestamp(config.time_unit)
+    return pa.schema(list(types.items()))
+
+
+def _options(file_path, config: ConfigParametersCsvSchema):
+    names = read_csv_header(file_path)
+    read_options = pa_csv.ReadOptions(use_threads=config.use_threads, block_size=config.block_size)
+    convert_options = pa_csv.ConvertOptions(column_types=csv_column_types(names, config))
+    return names, read_options, convert_options
+
+
+def read_csv_typed(file_path, schema_config: ConfigParametersCsvSchema | None = None) -> pa.Table:
+    """
+    Read a CSV file with the declared schema.
+
+    Args:
+        file_path (Path | str): Path to the CSV file.
+        schema_config (ConfigParametersCsvSchema | None): Declared schema.
+            Defaults to `CONFIG_CSV_SCHEMA`.
+
+    Returns:
+        pa.Table: Table with the schema given by `typed_csv_schema`.
+    """
+    config = _schema_config(schema_config)
+    names, read_options, convert_options = _options(file_path, config)
+    table = pa_csv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+    return table.cast(typed_csv_schema(names, config))
+
+
+def iter_csv_typed(file_path, schema_config: ConfigParametersCsvSchema | None = None):
+    """
+    Stream a CSV file as record batches of about `block_size` bytes of CSV
+    each, parsed with the declared schema.
+
+    Yields:
+        pa.RecordBatch: Batches with the schema given by `typed_csv_schema`.
+    """
+    config = _schema_config(schema_config)
+    names, read_options, convert_options = _options(file_path, config)
+    schema = typed_csv_schema(names, config)
+    with pa_csv.open_csv(file_path, read_options=read_options, convert_options=convert_options) as reader:
+        for batch in reader:
+            yield batch.cast(schema)
+
+
+def csv_to_parquet_typed(csv_path, parquet_path, row_group_size: int | None = None,
+                         schema_config: ConfigParametersCsvSchema | None = None) -> int:
+    """
+    Convert a CSV file to Parquet with the declared schema, one CSV block at a time.
+
+    Args:
+        csv_path (Path | str): Path to the input CSV file.
+        parquet_path (Path | str): Path to the output Parquet file.
+        row_group_size (int | None): Maximum rows per row group (default: one per block).
+        schema_config (ConfigParametersCsvSchema | None): Declared schema.
+
+    Returns:
+        int: Number of rows written.
+    """
+    config = _schema_config(schema_config)
+    schema = typed_csv_schema(read_csv_header(csv_path), config)
+    n_rows = 0
+    with pq.ParquetWriter(parquet_path, schema) as writer:
+        for batch in iter_csv_typed(csv_path, config):
+            writer.write_batch(batch, row_group_size=row_group_size)
+            n_rows += batch.num_rows
+    LOGGER.info(f"Converted {Path(csv_path).name} to {parquet_path} ({n_rows} rows, declared schema)")
+    return n_rows
+
@@ -1,6 +1,45 @@
-import pandas as pd
+from __future__ import annotations
 
-def csv_to_parquet(csv_path, parquet_path, engine='pyarrow'):
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from parquet.csv_schema import csv_to_parquet_typed, read_csv_typed
+from parquet.util import lazy_import, list_data_files, process_pool, setup_logger
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+ds = lazy_import("pyarrow.dataset")
+pq = lazy_import("pyarrow.parquet")
+# Imports pydantic, so only loaded when a write profile is used
+write_profiles = lazy_import("parquet.write_profiles")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+# Default number of rows per Parquet row group in streaming mode
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+# Default memory ceiling (bytes) for one in-flight batch in streaming mode
+DEFAULT_MAX_MEMORY_BYTES = 256 * 1024 * 1024
+# A decoded batch is held as a pandas chunk and as an Arrow table while it is
+# written, plus writer buffers, so budget a few copies per row.
+_MEMORY_OVERHEAD = 3
+# Number of rows read up front to estimate the in-memory size of one row
+_SAMPLE_ROWS = 1_000
+# Key in the `attrs` of a chunk's empty frame listing the columns without values in that chunk
+_NULL_COLUMNS = 'null_columns'
+# Default size of each file written by the dataset conversion
+DEFAULT_TARGET_FILE_SIZE = 128 * 1024 * 1024
+# Partition key derived from the `time` column (epoch seconds)
+DATE_PARTITION = 'date'
+
+
+def csv_to_parquet(csv_path, parquet_path, engine='pyarrow', streaming=False,
+                   row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                   max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES, typed=False, profile=None):
     """
     Converts a CSV file to a Parquet file.
 
@@ -8,12 +47,339 @@ def csv_to_parquet(csv_path, parquet_path, engine='pyarrow'):
         csv_path (str): Path to the input CSV file.
         parquet_path (str): Path to the output Parquet file.
         engine (str): Parquet engine ('pyarrow' or 'fastparquet').
+        streaming (bool): Convert in bounded-memory batches instead of loading
+            the whole CSV. See `csv_to_parquet_streaming`.
+        row_group_size (int): Maximum rows per row group in streaming mode.
+        max_memory_bytes (int): Memory ceiling for one batch in streaming mode.
+        typed (bool): Parse with the declared schema of `CONFIG_CSV_SCHEMA`
+            (see `parquet.csv_schema`); `time`, `TO` and the values keep their
+            declared types in the Parquet file. Without a profile the CSV is
+            streamed block by block; with one the whole file is read so the
+            profile's sort order applies to the full table.
+        profile (str | WriteProfile | None): Write profile (codec, encodings,
+            sort order, row-group and page sizes), e.g. ``'scan-optimized'``.
+            See `parquet.write_profiles`. The profile's row-group size replaces
+            `row_group_size`. None writes with the pandas defaults.
     """
+    if (typed or streaming or profile is not None) and engine != 'pyarrow':
+        raise ValueError("Typed, streaming and profiled conversion require the 'pyarrow' engine.")
+
+    if typed:
+        if profile is not None:
+            write_profiles.write_table_with_profile(read_csv_typed(csv_path), parquet_path, profile)
+        else:
+            csv_to_parquet_typed(csv_path, parquet_path, row_group_size=row_group_size)
+        print(f"Converted {csv_path} to {parquet_path}")
+        return
+
+    if streaming:
+        csv_to_parquet_streaming(csv_path, parquet_path,
+                                 row_group_size=row_group_size,
+                                 max_memory_bytes=max_memory_bytes,
+                                 profile=profile)
+        return
+
     df = pd.read_csv(csv_path)
-    df.to_parquet(parquet_path, engine=engine)
+    if profile is not None:
+        write_profiles.write_table_with_profile(pa.Table.from_pandas(df), parquet_path, profile)
+    else:
+        df.to_parquet(parquet_path, engine=engine)
     print(f"Converted {csv_path} to {parquet_path}")
 
 
+def csv_to_parquet_streaming(csv_path, parquet_path,
+                             row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                             max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES,
+                             profile=None):
+    """
+    Converts a CSV file to a Parquet file with bounded memory.
+
+    The CSV is read twice in chunks. The first pass resolves one dtype per
+    column the same way a full `pd.read_csv` would (e.g. a column that holds
+    integers in one chunk and floats in another becomes float64) and counts
+    the rows. The second pass parses each chunk with those dtypes and writes
+    it as a row group through a single `pyarrow.parquet.ParquetWriter`, so the
+    file reads back identical to the one written by `csv_to_parquet`.
+
+    Args:
+        csv_path (str): Path to the input CSV file.
+        parquet_path (str): Path to the output Parquet file.
+        row_group_size (int): Maximum number of rows per row group.
+        max_memory_bytes (int): Approximate ceiling for the memory held by one
+            in-flight batch. Chunks are shrunk below `row_group_size` when
+            needed to stay under it.
+        profile (str | WriteProfile | None): Write profile. Its sort order is
+            applied within each row group, since the whole file is never in
+            memory, and its row-group size replaces `row_group_size`.
+
+    Returns:
+        int: Number of rows written.
+    """
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be a positive integer.")
+    if max_memory_bytes < 1:
+        raise ValueError("max_memory_bytes must be a positive integer.")
+
+    if profile is not None:
+        profile = write_profiles.get_write_profile(profile)
+        row_group_size = profile.row_group_size
+
+    chunk_rows = _chunk_rows(csv_path, row_group_size, max_memory_bytes)
+
+    # First pass: resolve dtypes across all chunks and count rows
+    proto, n_rows = _resolve_csv_dtypes(csv_path, chunk_rows)
+
+    if proto is None:
+        # Header-only CSV: nothing to stream, fall back to the eager path
+        pd.read_csv(csv_path).to_parquet(parquet_path, engine='pyarrow')
+        print(f"Converted {csv_path} to {parquet_path}")
+        return 0
+
+    schema = _schema_with_range_index(proto, n_rows)
+    writer = None
+
+    # Second pass: parse with the resolved dtypes and write one row group per chunk
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=proto.dtypes.to_dict()):
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                # The first chunk is the sample for data-dependent profile encodings
+                options = write_profiles.writer_options(schema, profile, sample=table) if profile is not None else {}
+                writer = pq.ParquetWriter(parquet_path, schema, **options)
+            if profile is not None:
+                table = write_profiles.sort_table(table, profile)
+            writer.write_table(table, row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    print(f"Converted {csv_path} to {parquet_path} ({n_rows} rows, streaming)")
+    return n_rows
+
+
+def _resolve_csv_dtypes(csv_path, chunk_rows):
+    """
+    Read the CSV in chunks and return an empty frame with the dtypes a full
+    `pd.read_csv` would infer, plus the number of rows. The frame is None
+    when the CSV has no rows.
+    """
+    protos = []
+    n_rows = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        n_rows += len(chunk)
+        protos.append(_chunk_proto(chunk))
+    return (_merge_protos(protos) if protos else None), n_rows
+
+
+def _chunk_proto(chunk):
+    """
+    Empty frame with the dtypes of one chunk for `_merge_protos`. Booleans
+    with empty values (read as `object`) become the nullable `boolean` dtype,
+    and the columns with no value at all are listed in its `attrs`.
+    """
+    proto = chunk.iloc[:0].copy()
+    for name, dtype in chunk.dtypes.items():
+        if dtype == object and pd.api.types.infer_dtype(chunk[name], skipna=True) == 'boolean':
+            proto[name] = proto[name].astype('boolean')
+    empty = chunk.isna().all()
+    proto.attrs[_NULL_COLUMNS] = empty.index[empty].tolist()
+    return proto
+
+
+def _merge_protos(protos):
+    """
+    Merge the empty per-chunk frames of `_resolve_csv_dtypes` into one.
+
+    Concatenating a string or boolean column with a numeric (or all-empty)
+    chunk of the same column gives `object`, which Arrow maps to `null` for
+    an empty frame. A full `pd.read_csv` reads booleans with empty values as
+    booleans and nulls, so a column whose chunks are booleans or empty is
+    resolved to the nullable `boolean` dtype; any other mix holds strings
+    and is resolved to the `str` dtype.
+    """
+    proto = pd.concat(protos)
+    proto.attrs = {}  # would end up in the pandas metadata of the file
+    resolved = {}
+    for name, dtype in proto.dtypes.items():
+        if dtype != object:
+            continue
+        kinds = {str(p[name].dtype) for p in protos if name not in p.attrs.get(_NULL_COLUMNS, ())}
+        resolved[name] = 'boolean' if kinds <= {'bool', 'boolean'} else 'str'
+    return proto.astype(resolved) if resolved else proto
+
+
+def _chunk_rows(csv_path, row_group_size, max_memory_bytes):
+    """Number of rows per chunk that keeps one batch under the memory ceiling."""
+    sample = pd.read_csv(csv_path, nrows=_SAMPLE_ROWS)
+    if sample.empty:
+        return row_group_size
+    row_bytes = sample.memory_usage(index=False, deep=True).sum() / len(sample)
+    budget_rows = int(max_memory_bytes // max(row_bytes * _MEMORY_OVERHEAD, 1))
+    return max(1, min(row_group_size, budget_rows))
+
+
+def _schema_with_range_index(proto, n_rows):
+    """
+    Arrow schema for `proto` carrying the pandas metadata that `df.to_parquet`
+    would write for the full frame (a RangeIndex over all `n_rows` rows).
+    """
+    schema = pa.Schema.from_pandas(proto, preserve_index=None)
+    pandas_meta = json.loads(schema.metadata[b'pandas'])
+    for index in pandas_meta['index_columns']:
+        if isinstance(index, dict) and index.get('kind') == 'range':
+            index['start'], index['stop'], index['step'] = 0, n_rows, 1
+    for column in pandas_meta['columns']:
+        # `pd.read_csv` holds booleans with nulls in an object column
+        if column['numpy_type'] == 'boolean':
+            column['numpy_type'] = 'object'
+    metadata = dict(schema.metadata)
+    metadata[b'pandas'] = json.dumps(pandas_meta).encode('utf8')
+    return schema.with_metadata(metadata)
+
+
+def convert_csv_dataset(source, output_dir, partition_by=('TO',), max_workers=None,
+                        target_file_size=DEFAULT_TARGET_FILE_SIZE,
+                        row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                        max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES):
+    """
+    Converts many CSV files concurrently into one Hive-partitioned Parquet dataset.
+
+    Conversion runs in two phases over a process pool. First every CSV is
+    scanned in chunks to resolve its column dtypes; the parent unifies them
+    (int and float become float, as in `pd.read_csv`) so all files of the
+    dataset share one schema. Then every CSV is streamed in bounded-memory
+    chunks into `pyarrow.dataset.write_dataset`, which splits rows into
+    ``key=value`` directories. Output files are named after their source CSV
+    and a hash of its full path, so workers writing into the same partition
+    never overwrite each other, even for CSVs with the same name in
+    different directories.
+
+    Args:
+        source (str): A CSV file, a directory (searched recursively) or a glob.
+        output_dir (str): Root directory of the dataset.
+        partition_by (tuple[str, ...]): Partition columns. ``'date'`` is derived
+            from the `time` column (epoch seconds, UTC).
+        max_workers (int | None): Worker processes. Defaults to the CPU count.
+        target_file_size (int): Approximate size in bytes of each output file,
+            estimated from the in-memory row size.
+        row_group_size (int): Maximum rows per row group.
+        max_memory_bytes (int): Memory ceiling for one in-flight chunk per worker.
+
+    Returns:
+        dict: Throughput report with one entry per file, per worker process
+        and in total (rows, bytes, seconds, MB/s and rows/s).
+    """
+    files = list_data_files(source, suffix='.csv')
+    max_workers = min(max_workers or os.cpu_count() or 1, len(files))
+    LOGGER.info(f"Converting {len(files)} CSV files into {output_dir} with {max_workers} workers")
+    start = time.perf_counter()
+
+    with process_pool(max_workers=max_workers) as executor:
+        # Phase 1: per-file dtypes, unified into one schema for the dataset
+        scans = list(executor.map(_scan_csv, files, [row_group_size] * len(files),
+                                  [max_memory_bytes] * len(files)))
+        protos = [proto for proto, _, _ in scans if proto is not None]
+        if not protos:
+            raise ValueError(f"No rows found in the CSV files of {source}.")
+        dtypes = _merge_protos(protos).dtypes.to_dict()
+
+        # Phase 2: stream every file into the partitioned dataset
+        args = [(f, output_dir, tuple(partition_by), dtypes, chunk_rows, target_file_size, row_group_size)
+                for f, (proto, _, chunk_rows) in zip(files, scans) if proto is not None]
+        results = list(executor.map(_convert_to_dataset, *zip(*args)))
+
+    report = _throughput_report(results, time.perf_counter() - start)
+    total = report['total']
+    LOGGER.info(
+        f"Converted {total['rows']} rows from {len(results)} files in {total['seconds']:.2f} s "
+        f"({total['mb_per_s']:.1f} MB/s, {total['rows_per_s']:,.0f} rows/s)"
+    )
+    return report
+
+
+def _scan_csv(csv_path, row_group_size, max_memory_bytes):
+    """Resolve dtypes and row count of one CSV (runs in a worker process)."""
+    chunk_rows = _chunk_rows(csv_path, row_group_size, max_memory_bytes)
+    proto, n_rows = _resolve_csv_dtypes(csv_path, chunk_rows)
+    return proto, n_rows, chunk_rows
+
+
+def _convert_to_dataset(csv_path, output_dir, partition_by, dtypes, chunk_rows,
+                        target_file_size, row_group_size):
+    """Stream one CSV into the partitioned dataset (runs in a worker process)."""
+    start = time.perf_counter()
+    csv_path = Path(csv_path)
+    proto = pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+    schema = _with_partition_columns(pa.Schema.from_pandas(proto, preserve_index=False), partition_by)
+
+    sample = pd.read_csv(csv_path, nrows=_SAMPLE_ROWS, dtype=dtypes)
+    row_bytes = max(sample.memory_usage(index=False, deep=True).sum() / max(len(sample), 1), 1)
+    max_rows_per_file = max(1, int(target_file_size // row_bytes))
+    max_rows_per_group = max(1, min(row_group_size, max_rows_per_file))
+
+    n_rows = 0
+
+    def batches():
+        nonlocal n_rows
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=dtypes):
+            n_rows += len(chunk)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if DATE_PARTITION in partition_by:
+                days = pc.cast(pc.cast(table.column('time'), pa.timestamp('s')), pa.date32())
+                table = table.append_column(DATE_PARTITION, days)
+            yield from table.cast(schema).to_batches()
+
+    ds.write_dataset(
+        batches(), output_dir, schema=schema, format='parquet',
+        partitioning=list(partition_by), partitioning_flavor='hive',
+        basename_template=f"{csv_path.stem}-{_path_digest(csv_path)}-{{i}}.parquet",
+        max_rows_per_file=max_rows_per_file, max_rows_per_group=max_rows_per_group,
+        min_rows_per_group=min(max_rows_per_group, chunk_rows),
+        existing_data_behavior='overwrite_or_ignore',
+    )
+    return {
+        'file': str(csv_path), 'worker': os.getpid(), 'rows': n_rows,
+        'bytes': csv_path.stat().st_size, 'seconds': time.perf_counter() - start,
+    }
+
+
+def _path_digest(path):
+    """Short stable hash of the absolute path of `path`."""
+    return hashlib.sha1(str(Path(path).resolve()).encode('utf8')).hexdigest()[:10]
+
+
+def _with_partition_columns(schema, partition_by):
+    """Add the derived `date` partition column to `schema` when requested."""
+    schema = schema.remove_metadata()
+    if DATE_PARTITION in partition_by and DATE_PARTITION not in schema.names:
+        schema = schema.append(pa.field(DATE_PARTITION, pa.date32()))
+    return schema
+
+
+def _rates(rows, nbytes, seconds):
+    seconds = max(seconds, 1e-9)
+    return {'rows': rows, 'bytes': nbytes, 'seconds': seconds,
+            'mb_per_s': nbytes / seconds / 1e6, 'rows_per_s': rows / seconds}
+
+
+def _throughput_report(results, wall_seconds):
+    """Throughput per file, per worker process (busy time) and in total (wall time)."""
+    workers = {}
+    for result in results:
+        worker = workers.setdefault(result['worker'], {'files': 0, 'rows': 0, 'bytes': 0, 'seconds': 0.0})
+        worker['files'] += 1
+        worker['rows'] += result['rows']
+        worker['bytes'] += result['bytes']
+        worker['seconds'] += result['seconds']
+    return {
+        'files': [{'file': r['file'], 'worker': r['worker'], **_rates(r['rows'], r['bytes'], r['seconds'])}
+                  for r in results],
+        'workers': {pid: {'files': w['files'], **_rates(w['rows'], w['bytes'], w['seconds'])}
+                    for pid, w in workers.items()},
+        'total': _rates(sum(r['rows'] for r in results), sum(r['bytes'] for r in results), wall_seconds),
+    }
+
+
 if __name__ == "__main__":
     # import argparse
 
@@ -24,7 +390,7 @@ if __name__ == "__main__":
 
     # # args = parser.parse_args()
     # # csv_to_parquet(args.csv_path, args.parquet_path, engine=args.engine)
-    
+
     csv_to_parquet("data/raw/training_data.csv", "data/processed/training_data.parquet")
 
     # read or load parquet file to verify creation
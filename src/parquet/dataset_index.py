@@ -0,0 +1,372 @@
+"""
+Sidecar index for lookups across the Parquet files of a dataset.
+Finding the rows of one `TO` id otherwise means reading every file. The
+index is a small JSON file next to the data holding, for each file and each
+of its row groups:
+
+    1) min/max of `time` and the numeric columns, taken from the footer
+       statistics (or computed from the data pages when the footer has none
+       and `scan_pages` is set).
+    2) a bloom filter of the `TO` ids, built from the id column only.
+
+`query_dataset_index` uses the min/max ranges and the bloom filters to pick
+the files and row groups that may hold matching rows; `load_indexed_rows`
+reads only those. Hive partition keys (``TO=10540337/`` directories) are
+recorded per file and treated as columns with a single value. Rebuilding is
+incremental: files whose size and mtime are unchanged keep their entries,
+only new or changed files are scanned.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import math
+from pathlib import Path
+from urllib.parse import unquote
+
+from parquet.load_parquet import check_parquet_file, pandas_index_columns
+from parquet.util import lazy_import, list_data_files, setup_logger, write_json_atomic
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+pq = lazy_import("pyarrow.parquet")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+INDEX_VERSION = 2
+INDEX_FILE = "_index.json"
+
+
+class BloomFilter:
+    """
+    Bloom filter over the 64-bit hashes of `pd.util.hash_array`, with
+    double hashing to derive the `k` bit positions of a value.
+
+    Args:
+        m (int): Number of bits (rounded up to a multiple of 8).
+        k (int): Number of hash functions.
+    """
+
+    def __init__(self, m: int, k: int, bits: np.ndarray | None = None):
+        self.m = max(8, -(-m // 8) * 8)
+        self.k = k
+        self.bits = bits if bits is not None else np.zeros(self.m // 8, dtype=np.uint8)
+
+    @classmethod
+    def for_capacity(cls, n: int, fpp: float = 0.01) -> "BloomFilter":
+        """Filter sized for `n` distinct values at false positive rate `fpp`."""
+        n = max(n, 1)
+        m = math.ceil(-n * math.log(fpp) / math.log(2) ** 2)
+        return cls(m, max(1, round(m / n * math.log(2))))
+
+    def _positions(self, values: np.ndarray) -> np.ndarray:
+        hashes = pd.util.hash_array(values)
+        h1, h2 = hashes & np.uint64(0xFFFFFFFF), (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.k, dtype=np.uint64)
+        return ((h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.m)).ravel()
+
+    def add(self, values: np.ndarray) -> None:
+        """Add an array of values."""
+        positions = self._positions(values)
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8))
+
+    def might_contain(self, value) -> bool:
+        """False if `value` was never added; True if it probably was."""
+        positions = self._positions(np.asarray([value]))
+        mask = (1 << (positions & np.uint64(7))).astype(np.uint8)
+        return bool(np.all(self.bits[positions >> np.uint64(3)] & mask))
+
+    def to_dict(self) -> dict:
+        return {"m": self.m, "k": self.k, "bits": base64.b64encode(self.bits.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BloomFilter":
+        bits = np.frombuffer(base64.b64decode(data["bits"]), dtype=np.uint8).copy()
+        return cls(data["m"], data["k"], bits)
+
+
+def _as_number(value, type_: pa.DataType):
+    """JSON-friendly number of a statistics or query value (timestamps as integers)."""
+    if value is None:
+        return None
+    if pa.types.is_timestamp(type_) or pa.types.is_date(type_):
+        return pa.scalar(value, type=type_).cast(pa.int64()).as_py()
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _id_values(column: pa.ChunkedArray) -> np.ndarray:
+    """Distinct non-null ids of a column as NumPy values (dictionaries decoded)."""
+    unique = pc.unique(column.combine_chunks()).drop_null()
+    if pa.types.is_dictionary(unique.type):
+        unique = unique.dictionary_decode()
+    return unique.to_numpy(zero_copy_only=False)
+
+
+def _index_file(parquet_file: pq.ParquetFile, id_column: str, columns: list[str],
+                scan_pages: bool, fpp: float) -> list[dict]:
+    """Per-row-group ranges and id bloom filters of one Parquet file."""
+    metadata = parquet_file.metadata
+    leaves = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+    schema = parquet_file.schema_arrow
+    row_groups = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        ranges = {}
+        for name in columns:
+            stats = row_group.column(leaves[name]).statistics
+            if stats is not None and stats.has_min_max:
+                low, high = stats.min, stats.max
+            elif scan_pages:
+                min_max = pc.min_max(parquet_file.read_row_group(i, columns=[name]).column(0))
+                low, high = min_max["min"].as_py(), min_max["max"].as_py()
+            else:
+                low = high = None
+            type_ = schema.field(name).type
+            ranges[name] = [_as_number(low, type_), _as_number(high, type_)]
+        entry = {"num_rows": row_group.num_rows, "ranges": ranges, "bloom": None}
+        if id_column in schema.names:
+            ids = _id_values(parquet_file.read_row_group(i, columns=[id_column]).column(0))
+            bloom = BloomFilter.for_capacity(len(ids), fpp)
+            bloom.add(ids)
+            entry["bloom"] = bloom.to_dict()
+        row_groups.append(entry)
+    return row_groups
+
+
+def _merge_ranges(row_groups: list[dict]) -> dict:
+    """File-level min/max from its row groups (None when any range is unknown)."""
+    merged = {}
+    for name in (row_groups[0]["ranges"] if row_groups else {}):
+        lows = [rg["ranges"][name][0] for rg in row_groups]
+        highs = [rg["ranges"][name][1] for rg in row_groups]
+        known = None not in lows and None not in highs
+        merged[name] = [min(lows), max(highs)] if known else [None, None]
+    return merged
+
+
+def load_dataset_index(index_path) -> dict:
+    """Read a sidecar index (an empty one if there is none)."""
+    index_path = Path(index_path)
+    if not index_path.exists():
+        return {"version": INDEX_VERSION, "settings": None, "files": {}}
+    with open(index_path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def build_dataset_index(dataset_path, index_path=None, id_column: str = "TO", columns: list[str] | None = None,
+                        scan_pages: bool = False, fpp: float = 0.01) -> tuple[dict, dict]:
+    """
+    Create or update the sidecar index of a dataset directory.
+
+    Args:
+        dataset_path (Path | str): Directory holding the Parquet files.
+        index_path (Path | str | None): Index file. Defaults to `_index.json`
+            in `dataset_path`.
+        id_column (str): Column indexed with bloom filters.
+        columns (list[str] | None): Columns with min/max ranges. Defaults to
+            `time`, the id column and all numeric columns.
+        scan_pages (bool): Compute min/max from the data when a footer has no
+            statistics for a column.
+        fpp (float): False positive rate of the bloom filters.
+
+    Returns:
+        tuple[dict, dict]: The index and a report with the lists of `added`,
+        `changed`, `removed` and `unchanged` files (paths relative to
+        `dataset_path`).
+    """
+    dataset_path = Path(dataset_path)
+    index_path = Path(index_path) if index_path is not None else dataset_path / INDEX_FILE
+    settings = {"id_column": id_column, "columns": columns, "scan_pages": scan_pages, "fpp": fpp}
+
+    index = load_dataset_index(index_path)
+    if index.get("version") != INDEX_VERSION or index.get("settings") != settings:
+        if index["files"]:
+            LOGGER.info(f"Index {index_path} was built with other settings; rebuilding.")
+        index = {"version": INDEX_VERSION, "settings": settings, "files": {}}
+
+    old_entries, entries = index["files"], {}
+    report = {"added": [], "changed": [], "removed": [], "unchanged": []}
+    for file_path in list_data_files(dataset_path):
+        key = file_path.relative_to(dataset_path).as_posix()
+        stat = file_path.stat()
+        old = old_entries.get(key)
+        if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            entries[key] = old
+            report["unchanged"].append(key)
+            continue
+        report["changed" if old else "added"].append(key)
+
+        check_parquet_file(file_path)
+        parquet_file = pq.ParquetFile(file_path)
+        schema = parquet_file.schema_arrow
+        index_columns = pandas_index_columns(schema)
+        file_columns = columns if columns is not None else [
+            f.name for f in schema
+            if (pa.types.is_integer(f.type) or pa.types.is_floating(f.type) or pa.types.is_timestamp(f.type))
+            and f.name not in index_columns
+        ]
+        row_groups = _index_file(parquet_file, id_column, file_columns, scan_pages, fpp)
+        entries[key] = {
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "num_rows": parquet_file.metadata.num_rows,
+            "time_units": {name: schema.field(name).type.unit for name in file_columns
+                           if pa.types.is_timestamp(schema.field(name).type)},
+            "ranges": _merge_ranges(row_groups), "row_groups": row_groups,
+            "partition": _partition_values(key),
+        }
+    report["removed"] = sorted(set(old_entries) - set(entries))
+
+    index["files"] = entries
+    write_json_atomic(index, index_path)
+    LOGGER.info(
+        f"Index {index_path}: {len(report['added'])} added, {len(report['changed'])} changed, "
+        f"{len(report['removed'])} removed, {len(report['unchanged'])} unchanged files"
+    )
+    return index, report
+
+
+def _partition_values(key: str) -> dict:
+    """
+    Hive partition values (``name=value`` directories) of a relative file path,
+    as integers or floats when they parse as such.
+    """
+    values = {}
+    for part in key.split("/")[:-1]:
+        name, sep, text = part.partition("=")
+        if not sep:
+            continue
+        text = unquote(text)
+        for parse in (int, float):
+            try:
+                values[unquote(name)] = parse(text)
+                break
+            except ValueError:
+                continue
+        else:
+            values[unquote(name)] = text
+    return values
+
+
+def _overlaps(range_: list, low, high) -> bool:
+    """Whether [range_min, range_max] may hold a value in [low, high]; unknown ranges always may."""
+    range_low, range_high = range_
+    if range_low is None or range_high is None:
+        return True
+    return (low is None or range_high >= low) and (high is None or range_low <= high)
+
+
+def _query_value(value, time_unit: str | None):
+    """Convert a query bound to the numbers stored in the index (datetimes to integers)."""
+    if value is None or time_unit is None or isinstance(value, (int, np.integer)):
+        return value
+    return _as_number(pd.Timestamp(value), pa.timestamp(time_unit))
+
+
+def query_dataset_index(index: dict, id_value=None, ranges: dict | None = None) -> dict[str, list[int]]:
+    """
+    Files and row groups that may hold rows matching a lookup.
+
+    Args:
+        index (dict): Index from `build_dataset_index` or `load_dataset_index`.
+        id_value: Id to look up in the bloom filters (None matches every id).
+        ranges (dict | None): Inclusive bounds per column, e.g.
+            ``{"time": (start, None)}``. Timestamp columns accept datetimes.
+
+    Returns:
+        dict[str, list[int]]: Row group numbers per matching file (relative path).
+    """
+    ranges = ranges or {}
+    id_column = index["settings"]["id_column"]
+    matches = {}
+    for key, entry in index["files"].items():
+        units = entry["time_units"]
+        bounds = {name: (_query_value(low, units.get(name)), _query_value(high, units.get(name)))
+                  for name, (low, high) in ranges.items()}
+        if id_value is not None:
+            bounds[id_column] = (id_value, id_value)
+        partition = entry["partition"]
+        if not all(_overlaps([partition[name]] * 2, *b) for name, b in bounds.items() if name in partition):
+            continue
+        if not all(_overlaps(entry["ranges"][name], *b) for name, b in bounds.items() if name in entry["ranges"]):
+            continue
+        row_groups = [
+            i for i, rg in enumerate(entry["row_groups"])
+            if all(_overlaps(rg["ranges"][name], *b) for name, b in bounds.items() if name in rg["ranges"])
+            and (id_value is None or rg["bloom"] is None or BloomFilter.from_dict(rg["bloom"]).might_contain(id_value))
+        ]
+        if row_groups:
+            matches[key] = row_groups
+    return matches
+
+
+def load_indexed_rows(dataset_path, id_value=None, ranges: dict | None = None, columns: list[str] | None = None,
+                      index_path=None, update: bool = True) -> pd.DataFrame:
+    """
+    Load the rows of `id_value` (within `ranges`) reading only the files and
+    row groups the index selects.
+
+    Args:
+        dataset_path (Path | str): Directory holding the Parquet files.
+        id_value: Id to look up (None for all ids).
+        ranges (dict | None): Inclusive bounds per column, see `query_dataset_index`.
+        columns (list[str] | None): Columns to return (default: all).
+        index_path (Path | str | None): Index file (default `_index.json` in `dataset_path`).
+        update (bool): Bring the index up to date with the directory first.
+            Otherwise the stored index is used as is.
+
+    Returns:
+        pd.DataFrame: Matching rows in file and row group order.
+    """
+    dataset_path = Path(dataset_path)
+    index_path = Path(index_path) if index_path is not None else dataset_path / INDEX_FILE
+    if update or not index_path.exists():
+        index, _ = build_dataset_index(dataset_path, index_path)
+    else:
+        index = load_dataset_index(index_path)
+    matches = query_dataset_index(index, id_value, ranges)
+    id_column = index["settings"]["id_column"]
+    LOGGER.info(
+        f"Index selected {sum(map(len, matches.values()))} row groups in {len(matches)} "
+        f"of {len(index['files'])} files"
+    )
+
+    ranges = ranges or {}
+    bounds = dict(ranges)
+    if id_value is not None:
+        bounds[id_column] = (id_value, id_value)
+
+    tables = []
+    for key, row_groups in matches.items():
+        parquet_file = pq.ParquetFile(dataset_path / key)
+        names = parquet_file.schema_arrow.names
+        # Read the filter columns as well, then keep only the requested ones
+        read_columns = None if columns is None else [
+            name for name in dict.fromkeys([*columns, *bounds]) if name in names
+        ]
+        table = parquet_file.read_row_groups(row_groups, columns=read_columns)
+        # Partition keys only live in the directory names; add them as columns
+        for name, value in index["files"][key]["partition"].items():
+            if name not in names:
+                table = table.append_column(name, pa.repeat(pa.scalar(value), table.num_rows))
+        mask = None
+        for name, (low, high) in bounds.items():
+            if name not in table.column_names:
+                raise ValueError(f"Column {name} is neither in {key} nor one of its partition keys.")
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type):
+                column = pc.cast(column, column.type.value_type)
+            for bound, op in ((low, pc.greater_equal), (high, pc.less_equal)):
+                if bound is not None:
+                    condition = op(column, pa.scalar(bound, type=column.type))
+                    mask = condition if mask is None else pc.and_(mask, condition)
+        table = table.filter(mask) if mask is not None else table
+        tables.append(table.select(columns) if columns is not None else table)
+
+    if not tables:
+        schema = pq.read_schema(list_data_files(dataset_path)[0])
+        return schema.empty_table().select(columns or schema.names).to_pandas()
+    return pa.concat_tables(tables, promote_options="default").to_pandas()
@@ -0,0 +1,195 @@
+"""
+Grouped statistics by `TO` and time buckets.
+This module computes the `describe()` statistics (count, mean, std, min,
+25%, 50%, 75%, max) of every sensor column per group, where a group is a
+`TO` id, a time bucket (hour, day or week) or both.
+
+The reductions are vectorized NumPy code instead of pandas
+`groupby().describe()`: group ids come from factorizing the keys, moments
+from `np.bincount`, and min/max/quantiles from a single `np.lexsort` by
+(group, value) per column, indexed at each group's offsets. Quantiles use
+linear interpolation and therefore match pandas exactly.
+
+The result is a tidy Arrow table with one row per (group, column).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from parquet.streaming_stats import ID_COLUMNS, QUANTILES, STAT_INDEX, numeric_columns
+from parquet.util import lazy_import, list_data_files, setup_logger
+
+np = lazy_import("numpy")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+pq = lazy_import("pyarrow.parquet")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+# Width of each supported time bucket in seconds
+TIME_BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+# 1970-01-01 was a Thursday; shift weekly buckets so they start on Mondays
+_WEEK_OFFSET = 3 * 86400
+_SECONDS_PER_UNIT = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+def time_bucket(times: pa.ChunkedArray, bucket: str) -> np.ndarray:
+    """
+    Start of the time bucket (epoch seconds) of each value of `times`.
+
+    Args:
+        times (pa.ChunkedArray): Epoch seconds (integer) or timestamps.
+        bucket (str): One of ``"hour"``, ``"day"`` or ``"week"`` (weeks start on Monday, UTC).
+
+    Returns:
+        np.ndarray: int64 bucket start per row.
+    """
+    if bucket not in TIME_BUCKETS:
+        raise ValueError(f"Unknown time bucket {bucket!r}, expected one of {sorted(TIME_BUCKETS)}.")
+    if pa.types.is_timestamp(times.type):
+        seconds = pc.cast(times, pa.int64()).to_numpy() // _SECONDS_PER_UNIT[times.type.unit]
+    else:
+        seconds = times.to_numpy().astype(np.int64)
+    width = TIME_BUCKETS[bucket]
+    offset = _WEEK_OFFSET if bucket == "week" else 0
+    return (seconds + offset) // width * width - offset
+
+
+def _factorize(keys: list[np.ndarray]) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Dense group id per row and the key values of each group (sorted by key)."""
+    codes = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        _, inverse = np.unique(key, return_inverse=True)
+        codes = codes * (inverse.max() + 1) + inverse
+    _, first_row, group_ids = np.unique(codes, return_index=True, return_inverse=True)
+    return group_ids, [key[first_row] for key in keys]
+
+
+def _describe_groups(values: np.ndarray, group_ids: np.ndarray, n_groups: int) -> dict[str, np.ndarray]:
+    """`describe()` statistics of `values` per group, NaNs excluded."""
+    valid = ~np.isnan(values)
+    valid_ids, valid_values = group_ids[valid], values[valid]
+
+    counts = np.bincount(valid_ids, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.bincount(valid_ids, weights=valid_values, minlength=n_groups) / counts
+        deviations = valid_values - means[valid_ids]
+        m2 = np.bincount(valid_ids, weights=deviations * deviations, minlength=n_groups)
+        stds = np.sqrt(m2 / (counts - 1))
+    stds[counts < 2] = np.nan
+
+    # Sort once by (group, value): each group becomes a contiguous sorted run
+    order = np.lexsort((valid_values, valid_ids))
+    sorted_values = valid_values[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    present = counts > 0
+    last = np.maximum(counts - 1, 0)
+
+    def at(offsets):
+        out = np.full(n_groups, np.nan)
+        out[present] = sorted_values[(starts + offsets)[present]]
+        return out
+
+    stats = {"count": counts.astype(np.float64), "mean": means, "std": stds, "min": at(0)}
+    for q in QUANTILES:
+        position = q * last
+        lower = np.floor(position).astype(np.int64)
+        fraction = position - lower
+        low, high = at(lower), at(np.minimum(lower + 1, last))
+        stats[f"{q:.0%}"] = low + (high - low) * fraction
+    stats["max"] = at(last)
+    return stats
+
+
+def _decode(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Dictionary-encoded keys are grouped and reported by their values."""
+    if pa.types.is_dictionary(column.type):
+        return column.cast(column.type.value_type)
+    return column
+
+
+def compute_grouped_statistics(
+        table: pa.Table,
+        by: tuple[str, ...] = ("TO",),
+        bucket: str | None = None,
+        columns: list[str] | None = None,
+        time_column: str = "time",
+        ) -> pa.Table:
+    """
+    Compute grouped `describe()` statistics of an Arrow table.
+
+    Args:
+        table (pa.Table): Input data.
+        by (tuple[str, ...]): Key columns to group by (e.g. ``("TO",)``).
+        bucket (str | None): Also group by ``"hour"``, ``"day"`` or ``"week"``
+            of `time_column`; the key is added as `time_bucket` (timestamp).
+        columns (list[str] | None): Columns to summarize. Defaults to all
+            numeric columns except `time` and `TO`.
+        time_column (str): Column holding epoch seconds or timestamps.
+
+    Returns:
+        pa.Table: Tidy table with the key columns, `column`, and one column
+        per statistic (`count`, `mean`, `std`, `min`, `25%`, `50%`, `75%`, `max`).
+    """
+    by = list(by)
+    if not by and bucket is None:
+        raise ValueError("Grouped statistics need at least one key column or a time bucket.")
+    if columns is None:
+        columns = [c for c in numeric_columns(table.schema, exclude=ID_COLUMNS) if c not in by]
+
+    key_columns = [_decode(table.column(name)) for name in by]
+    keys = [column.to_numpy() for column in key_columns]
+    key_names = list(by)
+    if bucket is not None:
+        keys.append(time_bucket(table.column(time_column), bucket))
+        key_names.append("time_bucket")
+    if table.num_rows == 0:
+        raise ValueError("Cannot compute grouped statistics of an empty table.")
+
+    group_ids, group_keys = _factorize(keys)
+    n_groups = len(group_keys[0])
+    LOGGER.info(f"Computing statistics for {len(columns)} columns over {n_groups} groups of {key_names}")
+
+    parts = []
+    for name in columns:
+        values = table.column(name).to_numpy().astype(np.float64, copy=False)
+        stats = _describe_groups(values, group_ids, n_groups)
+        part = {key: group_keys[i] for i, key in enumerate(key_names)}
+        part["column"] = np.full(n_groups, name, dtype=object)
+        part.update(stats)
+        parts.append(part)
+
+    result = {
+        name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0)
+        for name in key_names + ["column"] + STAT_INDEX
+    }
+    arrays = [pa.array(result[name], type=column.type) for name, column in zip(by, key_columns)]
+    if bucket is not None:
+        arrays.append(pa.array(result["time_bucket"], type=pa.timestamp("s")))
+    arrays.append(pa.array(result["column"], type=pa.string()))
+    arrays += [pa.array(result[name], type=pa.float64()) for name in STAT_INDEX]
+    return pa.table(arrays, names=key_names + ["column"] + STAT_INDEX)
+
+
+def grouped_statistics_from_parquet(
+        input_path,
+        by: tuple[str, ...] = ("TO",),
+        bucket: str | None = None,
+        columns: list[str] | None = None,
+        time_column: str = "time",
+        ) -> pa.Table:
+    """
+    Read only the key and sensor columns of a Parquet file, directory or glob
+    and compute grouped statistics over all of it.
+
+    See `compute_grouped_statistics` for the arguments and result.
+    """
+    files = list_data_files(input_path)
+    schema = pq.read_schema(files[0])
+    if columns is None:
+        columns = [c for c in numeric_columns(schema, exclude=ID_COLUMNS) if c not in by]
+    needed = list(dict.fromkeys(list(by) + ([time_column] if bucket else []) + list(columns)))
+    table = pa.concat_tables([pq.read_table(f, columns=needed) for f in files])
+    LOGGER.info(f"Read {table.num_rows} rows from {len(files)} files for grouped statistics")
+    return compute_grouped_statistics(table, by=by, bucket=bucket, columns=columns, time_column=time_column)
@@ -3,22 +3,40 @@ Load training data for machine learning model.
 This read data from from a file in specified folder path and returns it as a pandas DataFrame
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import os
 import logging
 from pathlib import Path
 
-from parquet.util import setup_logger
+from parquet.compact import compact_loaded_frame
+from parquet.csv_schema import read_csv_typed
+from parquet.load_parquet import table_to_pandas
+from parquet.util import lazy_import, setup_logger, span
+
+pd = lazy_import("pandas")
 
 LOGGER = setup_logger(__name__, logging.INFO)
 
-def load_csv_data(folder_path: str, file_name: str) -> pd.DataFrame:
+def load_csv_data(
+        folder_path: str,
+        file_name: str,
+        typed: bool | None = None,
+        compact: bool | None = None,
+        ) -> pd.DataFrame:
     """
     Load aggregated data from a CSV file and return it as a DataFrame.
 
     Args:
         folder_path (Path | str): Path to the folder containing the file.
         file_name (str): Name of the CSV file containing aggregated data.
+        typed (bool | None): Parse with the declared schema of `CONFIG_CSV_SCHEMA`
+            (multithreaded, no type inference: timestamp `time`, categorical
+            `TO`, float32 values) instead of `pd.read_csv`. None uses
+            `CONFIG_CSV_SCHEMA.enabled`.
+        compact (bool | None): Downcast the loaded frame to compact dtypes
+            (see `parquet.compact.compact_frame`). None uses
+            `CONFIG_COMPACT.enabled`.
 
     Returns:
         pd.DataFrame: DataFrame containing the training data.
@@ -33,32 +51,43 @@ def load_csv_data(folder_path: str, file_name: str) -> pd.DataFrame:
     LOGGER.info(f"Loading data from {file_path}")
 
     # Perform all validation checks before loading the data
-    if not file_path.exists():
-        LOGGER.error(f"The file {file_path} does not exist.")
-        raise FileNotFoundError(f"The file {file_path} does not exist.")
+    with span("csv.check", file=str(file_path)):
+        if not file_path.exists():
+            LOGGER.error(f"The file {file_path} does not exist.")
+            raise FileNotFoundError(f"The file {file_path} does not exist.")
 
+        if file_path.suffix != ".csv":
+            LOGGER.error(f"The file {file_path} is not a CSV file.")
+            raise ValueError(f"The file {file_path} is not a CSV file.")
 
-    if file_path.suffix != ".csv":
-        LOGGER.error(f"The file {file_path} is not a CSV file.")
-        raise ValueError(f"The file {file_path} is not a CSV file.")
-
-    if not os.access(file_path, os.R_OK):
-        LOGGER.error(f"The file {file_path} is not readable.")
-        raise PermissionError(f"The file {file_path} is not readable.")
+        if not os.access(file_path, os.R_OK):
+            LOGGER.error(f"The file {file_path} is not readable.")
+            raise PermissionError(f"The file {file_path} is not readable.")
 
     LOGGER.info(f"File {file_path} exists and is readable. Proceeding with loading data.")
-    df = pd.read_csv(file_path)
+    if typed is None:
+        from parquet.config import get_config
+
+        typed = get_config().CONFIG_CSV_SCHEMA.enabled
+    with span("csv.read", file=str(file_path), typed=typed) as read_span:
+        if typed:
+            df = table_to_pandas(read_csv_typed(file_path))
+        else:
+            df = pd.read_csv(file_path)
+        read_span.set(rows=len(df), bytes_read=file_path.stat().st_size)
 
     if df.empty:
         LOGGER.warning("The DataFrame is empty after loading data.")
         raise ValueError(f"The file {file_path} contains no data.")
 
-    if df.isnull().values.any():
+    with span("csv.null_check", file=str(file_path), rows=len(df)):
+        has_nulls = df.isnull().values.any()
+    if has_nulls:
         LOGGER.warning("The DataFrame contains null values.")
         raise ValueError(f"The file {file_path} contains null values.")
 
     LOGGER.info(f"Data loaded for training from {file_path} with shape {df.shape}")
-    return df
+    return compact_loaded_frame(df, compact, file_path)
 
 
 
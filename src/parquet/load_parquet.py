@@ -1,23 +1,92 @@
-import pandas as pd
+from __future__ import annotations
+
 import os
 import logging
 from pathlib import Path
 
-from parquet.util import setup_logger
+from parquet.compact import compact_loaded_frame
+from parquet.util import lazy_import, setup_logger, span
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+pq = lazy_import("pyarrow.parquet")
 
 LOGGER = setup_logger(__name__, logging.INFO)
 
-def load_parquet_data(folder_path: str, file_name: str) -> pd.DataFrame:
+def load_parquet_data(
+        folder_path: str,
+        file_name: str,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+        validation: str = "data",
+        dtype_backend: str | None = None,
+        memory_map: bool = False,
+        compact: bool | None = None,
+        zero_copy: bool = False,
+        ) -> pd.DataFrame:
     """
     Load aggregated data from a Parquet file and return it as a DataFrame.
 
+    Projection (`columns`) and predicates (`filters`) are pushed down into the
+    pyarrow reader, so only the selected column chunks are decoded and row
+    groups whose min/max statistics cannot match the filters are skipped.
+    The empty and null checks run on the Arrow data that was actually read,
+    before it is converted to pandas (see `load_parquet_table`).
+
     Args:
         folder_path (Path | str): Path to the folder containing the file.
         file_name (str): Name of the Parquet file containing aggregated data.
+        columns (list[str] | None): Columns to read. Defaults to all columns.
+        filters (list | pyarrow.compute.Expression | None): Row filters in
+            pyarrow DNF form, e.g. ``[("TO", "==", 10540337), ("time", ">=", 1743532199)]``.
+        validation (str): ``"data"`` checks the decoded data for nulls.
+            ``"metadata"`` decides emptiness and nulls from the Parquet footer
+            before any data page is read (see `validate_parquet_metadata`);
+            it covers every row of the projected columns, even when `filters`
+            would skip some of them.
+        dtype_backend (str | None): ``None`` converts to NumPy dtypes.
+            ``"pyarrow"`` returns `pd.ArrowDtype` columns that wrap the Arrow
+            buffers without copying.
+        memory_map (bool): Memory-map the file instead of reading it into
+            memory (local files only).
+        compact (bool | None): Downcast the frame to compact dtypes (see
+            `parquet.compact.compact_frame`). None uses `CONFIG_COMPACT.enabled`.
+        zero_copy (bool): Convert null-free numeric columns without copying
+            (see `table_to_pandas`). They are read-only in the returned frame.
 
     Returns:
         pd.DataFrame: DataFrame containing the training data.
 
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, contains null values, or has invalid data.
+        PermissionError: If the file is not readable.
+    """
+    table = load_parquet_table(folder_path, file_name, columns, filters, validation, memory_map)
+    file_path = Path(folder_path) / file_name
+    with span("parquet.decode", file=str(file_path), rows=table.num_rows):
+        df = table_to_pandas(table, dtype_backend, zero_copy=zero_copy)
+    return compact_loaded_frame(df, compact, file_path)
+
+
+def load_parquet_table(
+        folder_path: str,
+        file_name: str,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+        validation: str = "data",
+        memory_map: bool = False,
+        ) -> pa.Table:
+    """
+    Load aggregated data from a Parquet file as a `pyarrow.Table`.
+
+    Takes the same arguments and runs the same checks as `load_parquet_data`,
+    but skips the conversion to pandas.
+
+    Returns:
+        pa.Table: Table containing the training data.
+
     Raises:
         FileNotFoundError: If the file does not exist.
         ValueError: If the file is empty, contains null values, or has invalid data.
@@ -29,6 +98,139 @@ def load_parquet_data(folder_path: str, file_name: str) -> pd.DataFrame:
 
 
     # Perform all validation checks before loading the data
+    with span("parquet.check", file=str(file_path)):
+        check_parquet_file(file_path)
+
+    if validation == "metadata":
+        # Reject empty or null-bearing files from the footer before decoding
+        with span("parquet.metadata_check", file=str(file_path)):
+            validate_parquet_metadata(file_path, columns=columns)
+    elif validation != "data":
+        raise ValueError(f"Unknown validation mode {validation!r}, expected 'data' or 'metadata'.")
+
+    LOGGER.info(f"File {file_path} exists and is readable. Proceeding with loading data.")
+    if columns is not None or filters is not None:
+        LOGGER.info(f"Reading columns={columns} with filters={filters}")
+    with span("parquet.read", file=str(file_path)) as read_span:
+        table = pq.read_table(file_path, columns=columns, filters=filters, memory_map=memory_map)
+        read_span.set(rows=table.num_rows, bytes_read=file_path.stat().st_size)
+
+    # Validate the table after loading (nulls are already settled by the footer in metadata mode)
+    with span("parquet.null_check", file=str(file_path), rows=table.num_rows):
+        validate_table(table, file_path, check_nulls=validation == "data")
+
+    LOGGER.info(f"Data loaded for training from {file_path} with shape {table.shape}")
+    return table
+
+
+def iter_parquet_batches(
+        folder_path: str,
+        file_name: str,
+        columns: list[str] | None = None,
+        batch_size: int = 65_536,
+        memory_map: bool = False,
+        ):
+    """
+    Iterate over a Parquet file as validated `pyarrow.RecordBatch` objects.
+
+    The file checks run up front, emptiness is decided from the footer and
+    each batch is checked for nulls as it is decoded, so at most one batch
+    is held in memory.
+
+    Args:
+        folder_path (Path | str): Path to the folder containing the file.
+        file_name (str): Name of the Parquet file.
+        columns (list[str] | None): Columns to read. Defaults to all columns.
+        batch_size (int): Maximum number of rows per batch.
+        memory_map (bool): Memory-map the file (local files only).
+
+    Yields:
+        pa.RecordBatch: Batches of at most `batch_size` rows.
+
+    Raises:
+        ValueError: If the file is empty or a batch contains null values.
+    """
+    file_path = Path(folder_path) / file_name
+    check_parquet_file(file_path)
+    parquet_file = pq.ParquetFile(file_path, memory_map=memory_map)
+    if parquet_file.metadata.num_rows == 0:
+        LOGGER.warning(f"The footer of {file_path} reports no rows.")
+        raise ValueError(f"The file {file_path} contains no data.")
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        validate_table(pa.Table.from_batches([batch]), file_path, check_empty=False)
+        yield batch
+
+
+def validate_table(table: pa.Table, file_path, check_empty: bool = True, check_nulls: bool = True) -> None:
+    """
+    Check Arrow data read from `file_path` for emptiness and null values.
+
+    Nulls are counted from the Arrow validity bitmaps; floating point columns
+    are also checked for NaN, matching `DataFrame.isnull()`. Stored pandas
+    index columns are ignored.
+
+    Raises:
+        ValueError: If the table has no rows or data columns, or contains nulls.
+    """
+    index_columns = pandas_index_columns(table.schema)
+    data_columns = [name for name in table.column_names if name not in index_columns]
+
+    # Check if the table is empty
+    if check_empty and (table.num_rows == 0 or not data_columns):
+        LOGGER.warning("The table is empty after loading data.")
+        raise ValueError(f"The file {file_path} contains no data.")
+
+    # Check for null values
+    if check_nulls:
+        for name in data_columns:
+            column = table.column(name)
+            if column.null_count > 0 or _count_nans(column) > 0:
+                LOGGER.warning(f"Column {name} contains null values.")
+                raise ValueError(f"The file {file_path} contains null values.")
+
+
+def table_to_pandas(table: pa.Table, dtype_backend: str | None = None, zero_copy: bool = False) -> pd.DataFrame:
+    """
+    Convert a table to pandas.
+
+    By default the columns are copied into writable NumPy arrays, as
+    `pd.read_parquet` does. With `zero_copy` each column becomes its own
+    block (`split_blocks`) and Arrow buffers are released as they are
+    converted (`self_destruct`), so null-free numeric columns are not copied
+    and peak memory stays close to one copy of the data; those columns are
+    read-only and the table must not be used afterwards. ``"pyarrow"`` wraps
+    the Arrow buffers in `pd.ArrowDtype` columns without converting them.
+    """
+    if dtype_backend == "pyarrow":
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    if dtype_backend is not None:
+        raise ValueError(f"Unknown dtype_backend {dtype_backend!r}, expected None or 'pyarrow'.")
+    if zero_copy:
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    return table.to_pandas()
+
+
+def pandas_index_columns(schema: pa.Schema) -> set[str]:
+    """Names of the columns that store a pandas index in `schema`."""
+    pandas_metadata = schema.pandas_metadata or {}
+    return {c for c in pandas_metadata.get("index_columns", []) if isinstance(c, str)}
+
+
+def check_parquet_file(file_path: Path) -> None:
+    """
+    Check that a Parquet file exists, has a `.parquet` suffix and is readable.
+
+    Args:
+        file_path (Path | str): Path to the Parquet file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a Parquet file.
+        PermissionError: If the file is not readable.
+    """
+    file_path = Path(file_path)
+
     # check if the file exists
     if not file_path.exists():
         LOGGER.error(f"The file {file_path} does not exist.")
@@ -43,23 +245,78 @@ def load_parquet_data(folder_path: str, file_name: str) -> pd.DataFrame:
     if not os.access(file_path, os.R_OK):
         LOGGER.error(f"The file {file_path} is not readable.")
         raise PermissionError(f"The file {file_path} is not readable.")
-    
-    LOGGER.info(f"File {file_path} exists and is readable. Proceeding with loading data.")
-    df = pd.read_parquet(file_path)
 
-    # Validate the DataFrame after loading
-    # Check if the DataFrame is empty
-    if df.empty:
-        LOGGER.warning("The DataFrame is empty after loading data.")
+
+def validate_parquet_metadata(file_path: Path, columns: list[str] | None = None) -> int:
+    """
+    Validate a Parquet file for emptiness and null values without decoding it.
+
+    Emptiness is decided from `num_rows` in the footer. Nulls are decided from
+    the `null_count` statistics of each column chunk. Column chunks written
+    without statistics are checked by streaming just that column of that row
+    group, one at a time, and counting nulls and NaNs in the Arrow array.
+
+    Note that footer statistics count nulls only. Files written by pandas
+    store NaN as null, but NaN values written as plain floats by other
+    writers are only caught by the streaming fallback.
+
+    Args:
+        file_path (Path | str): Path to the Parquet file.
+        columns (list[str] | None): Columns to validate. Defaults to all
+            data columns (the stored pandas index is skipped).
+
+    Returns:
+        int: Number of rows in the file.
+
+    Raises:
+        ValueError: If the file contains no rows or any column contains nulls.
+    """
+    file_path = Path(file_path)
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+
+    if metadata.num_rows == 0:
+        LOGGER.warning(f"The footer of {file_path} reports no rows.")
         raise ValueError(f"The file {file_path} contains no data.")
-    
-    # Check for null values
-    if df.isnull().values.any():
-        LOGGER.warning("The DataFrame contains null values.")
-        raise ValueError(f"The file {file_path} contains null values.")
-    
-    LOGGER.info(f"Data loaded for training from {file_path} with shape {df.shape}")
-    return df
+
+    if columns is None:
+        index_columns = pandas_index_columns(parquet_file.schema_arrow)
+        columns = [name for name in parquet_file.schema_arrow.names if name not in index_columns]
+    wanted = set(columns)
+
+    unresolved = []
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for col in range(row_group.num_columns):
+            chunk = row_group.column(col)
+            name = chunk.path_in_schema
+            if name not in wanted:
+                continue
+            stats = chunk.statistics if chunk.is_stats_set else None
+            if stats is None or not stats.has_null_count:
+                unresolved.append((rg, name))
+            elif stats.null_count > 0:
+                LOGGER.warning(f"Footer statistics report nulls in column {name} of {file_path}.")
+                raise ValueError(f"The file {file_path} contains null values.")
+
+    # Fall back to a streaming check for column chunks without statistics
+    if unresolved:
+        LOGGER.info(f"{len(unresolved)} column chunks in {file_path} have no null statistics; scanning them.")
+    for rg, name in unresolved:
+        array = parquet_file.read_row_group(rg, columns=[name]).column(0)
+        if array.null_count > 0 or _count_nans(array) > 0:
+            LOGGER.warning(f"Column {name} of {file_path} contains null values.")
+            raise ValueError(f"The file {file_path} contains null values.")
+
+    LOGGER.info(f"Footer validation passed for {file_path} ({metadata.num_rows} rows).")
+    return metadata.num_rows
+
+
+def _count_nans(array: pa.ChunkedArray) -> int:
+    """Number of NaN values in a floating point Arrow array (0 for other types)."""
+    if not pa.types.is_floating(array.type):
+        return 0
+    return pc.sum(pc.is_nan(array)).as_py() or 0
     
 if __name__ == "__main__":
     folder_path = os.getenv("FOLDER_PATH", "data/processed")
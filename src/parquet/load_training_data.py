@@ -1,29 +1,55 @@
 """
 Load training data for machine learning model.
 This read data from from a file in specified folder path and returns it as a pandas DataFrame.
+`iter_training_batches` streams fixed-size NumPy batches from Parquet row
+groups instead, for training loops that should not materialize the file.
+`rolling_features_to_parquet` adds moving mean/std/min/max features per `TO`
+over `time` windows in the same streaming fashion and writes them to Parquet.
 """
 
+from __future__ import annotations
+
 # in build
 import logging
-import pandas as pd
+import queue
+import threading
 from pathlib import Path
-import os
 
 # user defined
-from parquet.util import setup_logger
+from parquet.load_csv import load_csv_data as _load_csv_data
+from parquet.load_parquet import check_parquet_file, iter_parquet_batches, load_parquet_table, validate_table
+from parquet.load_parquet import load_parquet_data as _load_parquet_data
+from parquet.streaming_stats import numeric_columns
+from parquet.util import lazy_import, setup_logger, span
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
 
 
 
 setup_logger()
 LOGGER = logging.getLogger(__name__)
 
-def load_csv_data(folder_path: str, file_name: str) -> pd.DataFrame:
+def load_csv_data(
+        folder_path: str,
+        file_name: str,
+        typed: bool | None = None,
+        compact: bool | None = None,
+        ) -> pd.DataFrame:
     """
     Load aggregated data from a CSV file and return it as a DataFrame.
 
+    This is `parquet.load_csv.load_csv_data`.
+
     Args:
         folder_path (Path | str): Path to the folder containing the file.
         file_name (str): Name of the CSV file containing aggregated data.
+        typed (bool | None): Parse with the declared schema of `CONFIG_CSV_SCHEMA`
+            instead of `pd.read_csv`; None uses `CONFIG_CSV_SCHEMA.enabled`.
+        compact (bool | None): Downcast to compact dtypes; None uses
+            `CONFIG_COMPACT.enabled`.
 
     Returns:
         pd.DataFrame: DataFrame containing the training data.
@@ -33,90 +59,461 @@ def load_csv_data(folder_path: str, file_name: str) -> pd.DataFrame:
         ValueError: If the file is empty, contains null values, or has invalid data.
         PermissionError: If the file is not readable.
     """
-    folder_path = Path(folder_path)
-    file_path = folder_path / file_name
-    LOGGER.info(f"Loading data from {file_path}")
+    return _load_csv_data(folder_path, file_name, typed=typed, compact=compact)
 
-    # Perform all validation checks before loading the data
-    if not file_path.exists():
-        LOGGER.error(f"The file {file_path} does not exist.")
-        raise FileNotFoundError(f"The file {file_path} does not exist.")
+def load_parquet_data(
+        folder_path: str,
+        file_name: str,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+        validation: str = "data",
+        dtype_backend: str | None = None,
+        memory_map: bool = False,
+        compact: bool | None = None,
+        zero_copy: bool = False,
+        ) -> pd.DataFrame:
+    """
+    Load aggregated data from a Parquet file and return it as a DataFrame.
 
-    if file_path.suffix != ".csv":
-        LOGGER.error(f"The file {file_path} is not a CSV file.")
-        raise ValueError(f"The file {file_path} is not a CSV file.")
+    This is `parquet.load_parquet.load_parquet_data`; use `load_parquet_table`
+    or `iter_parquet_batches` to keep the data in Arrow format.
 
-    if not os.access(file_path, os.R_OK):
-        LOGGER.error(f"The file {file_path} is not readable.")
-        raise PermissionError(f"The file {file_path} is not readable.")
+    Args:
+        folder_path (Path | str): Path to the folder containing the file.
+        file_name (str): Name of the Parquet file containing aggregated data.
+        columns (list[str] | None): Columns to read. Defaults to all columns.
+        filters (list | None): Row filters pushed down into the reader.
+        validation (str): ``"data"`` or ``"metadata"`` (footer statistics).
+        dtype_backend (str | None): ``None`` or ``"pyarrow"`` (`pd.ArrowDtype`).
+        memory_map (bool): Memory-map the file (local files only).
+        compact (bool | None): Downcast to compact dtypes; None uses
+            `CONFIG_COMPACT.enabled`.
+        zero_copy (bool): Convert numeric columns without copying (read-only).
 
-    LOGGER.info(f"File {file_path} exists and is readable. Proceeding with loading data.")
-    df = pd.read_csv(file_path)
+    Returns:
+        pd.DataFrame: DataFrame containing the training data.
 
-    if df.empty:
-        LOGGER.warning("The DataFrame is empty after loading data.")
-        raise ValueError(f"The file {file_path} contains no data.")
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, contains null values, or has invalid data.
+        PermissionError: If the file is not readable.
+    """
+    return _load_parquet_data(
+        folder_path, file_name, columns=columns, filters=filters, validation=validation,
+        dtype_backend=dtype_backend, memory_map=memory_map, compact=compact,
+        zero_copy=zero_copy,
+    )
 
-    if df.isnull().values.any():
-        LOGGER.warning("The DataFrame contains null values.")
-        raise ValueError(f"The file {file_path} contains null values.")
+def iter_training_batches(
+        folder_path: str,
+        file_name: str,
+        batch_size: int | None = None,
+        columns: list[str] | None = None,
+        epochs: int = 1,
+        shuffle: bool = False,
+        shuffle_buffer_size: int = 10_000,
+        prefetch: int = 2,
+        drop_last: bool = False,
+        seed: int | None = None,
+        dtype="float32",
+        ):
+    """
+    Yield fixed-size NumPy batches from a Parquet file for a training loop.
 
-    LOGGER.info(f"Data loaded for training from {file_path} with shape {df.shape}")
-    return df
+    Row groups are streamed in record batches, so memory is bounded by the
+    read size, the shuffle buffer and the prefetch queue, not by the file.
 
-def load_parquet_data(folder_path: str, file_name: str) -> pd.DataFrame:
-    """
-    Load aggregated data from a Parquet file and return it as a DataFrame.
+    With `shuffle`, the row group order is permuted every epoch and rows pass
+    through a shuffle buffer: once it holds more than `shuffle_buffer_size`
+    rows it is permuted and the surplus is emitted, the rest is kept to mix
+    with the next row groups. Batches are produced on a background thread
+    and queued up to `prefetch` deep so decoding overlaps with training.
 
     Args:
         folder_path (Path | str): Path to the folder containing the file.
-        file_name (str): Name of the Parquet file containing aggregated data.
+        file_name (str): Name of the Parquet file.
+        batch_size (int | None): Rows per batch. Defaults to
+            `CONFIG_AUTO_ENCODER.batch_size`.
+        columns (list[str] | None): Feature columns. Defaults to all numeric
+            columns except `time` and `TO`.
+        epochs (int): Number of passes over the file.
+        shuffle (bool): Shuffle row groups and rows (see above).
+        shuffle_buffer_size (int): Rows kept in the shuffle buffer.
+        prefetch (int): Batches produced ahead on a background thread;
+            ``0`` produces them on the calling thread.
+        drop_last (bool): Drop the final incomplete batch of each epoch.
+        seed (int | None): Seed for reproducible shuffling.
+        dtype: NumPy dtype of the batches.
 
-    Returns:
-        pd.DataFrame: DataFrame containing the training data.
+    Yields:
+        np.ndarray: Array of shape ``(batch_size, len(columns))``.
 
     Raises:
         FileNotFoundError: If the file does not exist.
-        ValueError: If the file is empty, contains null values, or has invalid data.
+        ValueError: If the file is empty or contains null values.
         PermissionError: If the file is not readable.
     """
-    folder_path = Path(folder_path)
-    file_path = folder_path / file_name
-    LOGGER.info(f"Loading data from {file_path}")
-
-
-    # Perform all validation checks before loading the data
-    # check if the file exists
-    if not file_path.exists():
-        LOGGER.error(f"The file {file_path} does not exist.")
-        raise FileNotFoundError(f"The file {file_path} does not exist.")
-    
-    # check if the file is a valid parquet file
-    if file_path.suffix != ".parquet":
-        LOGGER.error(f"The file {file_path} is not a Parquet file.")
-        raise ValueError(f"The file {file_path} is not a Parquet file.")
-    
-    # check if the file is readable
-    if not os.access(file_path, os.R_OK):
-        LOGGER.error(f"The file {file_path} is not readable.")
-        raise PermissionError(f"The file {file_path} is not readable.")
-    
-    LOGGER.info(f"File {file_path} exists and is readable. Proceeding with loading data.")
-    df = pd.read_parquet(file_path)
-
-    # Validate the DataFrame after loading
-    # Check if the DataFrame is empty
-    if df.empty:
-        LOGGER.warning("The DataFrame is empty after loading data.")
+    if not batch_size:
+        from parquet.config import get_config
+
+        batch_size = get_config().CONFIG_AUTO_ENCODER.batch_size
+    file_path = Path(folder_path) / file_name
+    check_parquet_file(file_path)
+    parquet_file = pq.ParquetFile(file_path)
+    if parquet_file.metadata.num_rows == 0:
         raise ValueError(f"The file {file_path} contains no data.")
-    
-    # Check for null values
-    if df.isnull().values.any():
-        LOGGER.warning("The DataFrame contains null values.")
-        raise ValueError(f"The file {file_path} contains null values.")
-    
-    LOGGER.info(f"Data loaded for training from {file_path} with shape {df.shape}")
-    return df
+    if columns is None:
+        columns = numeric_columns(parquet_file.schema_arrow)
+    LOGGER.info(
+        f"Streaming batches of {batch_size} rows x {len(columns)} columns from {file_path} "
+        f"for {epochs} epochs (shuffle={shuffle})"
+    )
+
+    batches = _generate_batches(
+        parquet_file, file_path, columns, batch_size, epochs, shuffle,
+        shuffle_buffer_size, drop_last, np.random.default_rng(seed), dtype,
+    )
+    if prefetch > 0:
+        batches = _prefetch(batches, prefetch)
+    yield from batches
+
+
+def _generate_batches(parquet_file, file_path, columns, batch_size, epochs, shuffle,
+                      shuffle_buffer_size, drop_last, rng, dtype):
+    read_size = max(batch_size, 8192)
+    row_groups = np.arange(parquet_file.metadata.num_row_groups)
+    for _ in range(epochs):
+        order = rng.permutation(row_groups) if shuffle else row_groups
+        pending = np.empty((0, len(columns)), dtype=dtype)
+        for record_batch in parquet_file.iter_batches(batch_size=read_size, row_groups=order.tolist(), columns=columns):
+            validate_table(pa.Table.from_batches([record_batch]), file_path, check_empty=False)
+            rows = np.column_stack([record_batch.column(name).to_numpy() for name in columns]).astype(dtype, copy=False)
+            pending = np.concatenate([pending, rows])
+            if shuffle:
+                if len(pending) <= shuffle_buffer_size:
+                    continue
+                pending = pending[rng.permutation(len(pending))]
+                n_out = (len(pending) - shuffle_buffer_size) // batch_size * batch_size
+            else:
+                n_out = len(pending) // batch_size * batch_size
+            for start in range(0, n_out, batch_size):
+                yield pending[start:start + batch_size]
+            pending = pending[n_out:]
+
+        # End of epoch: flush what is left in the buffer
+        if shuffle:
+            pending = pending[rng.permutation(len(pending))]
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            if len(batch) < batch_size and drop_last:
+                break
+            yield batch
+
+
+def _prefetch(batches, depth: int):
+    """Run `batches` on a daemon thread, buffering up to `depth` items."""
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        # Give up once the consumer has gone away so the thread can exit
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in batches:
+                if not put(item):
+                    return
+            put(done)
+        except BaseException as error:  # re-raised on the consumer thread
+            put(error)
+
+    thread = threading.Thread(target=produce, name="parquet-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+# Rolling statistics computed by `iter_rolling_features`
+ROLLING_STATS = ("mean", "std", "min", "max")
+# Keys of the time and group arrays in the state carried between batches
+_TIME, _GROUP = "__time", "__group"
+
+
+def iter_rolling_features(
+        folder_path: str,
+        file_name: str,
+        windows=("1h",),
+        stats=ROLLING_STATS,
+        columns: list[str] | None = None,
+        group_column: str | None = "TO",
+        time_column: str = "time",
+        batch_size: int = 65_536,
+        dtype="float32",
+        ):
+    """
+    Stream a Parquet file as record batches with rolling-window features added.
+
+    For every row and window, the statistics of each column are taken over
+    the rows of the same group (`group_column`) whose time lies in
+    ``(time - window, time]``, the same rows as pandas
+    ``groupby(group).rolling(window, on=time)``. `std` uses ``ddof=1`` like
+    pandas, but is 0 instead of NaN for a window of a single row, so the
+    feature table passes the null checks of the loaders. Rows must be in
+    time order within each group, groups may be interleaved or one after
+    another.
+
+    Each batch is sorted by (group, time) together with the rows carried
+    over from earlier batches, window starts are found with one
+    `np.searchsorted` over (group, time) ranks, sums come from prefix sums
+    and min/max from a sparse table, so no Python loop runs per row or
+    group. After each batch only the rows that can still fall in a later
+    window are carried over (the last `window` of every group seen so far),
+    so the file is never materialized.
+
+    Args:
+        folder_path (Path | str): Path to the folder containing the file.
+        file_name (str): Name of the Parquet file.
+        windows (tuple): Window lengths as pandas offsets (``"1h"``, ``"30min"``)
+            or seconds.
+        stats (tuple): Statistics among ``"mean"``, ``"std"``, ``"min"`` and ``"max"``.
+        columns (list[str] | None): Feature columns. Defaults to all numeric
+            columns except `time` and `TO`.
+        group_column (str | None): Column the windows are computed per;
+            None treats the file as one group.
+        time_column (str): Epoch seconds or timestamp column.
+        batch_size (int): Maximum number of rows read per batch.
+        dtype: NumPy dtype of the feature columns.
+
+    Yields:
+        pa.RecordBatch: The input batch, in input order, followed by one
+        ``{column}_{stat}_{window}`` column per column, statistic and window.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, contains null values, is out of time
+            order within a group, or a statistic is unknown.
+    """
+    unknown = set(stats) - set(ROLLING_STATS)
+    if unknown:
+        raise ValueError(f"Unknown rolling statistics {sorted(unknown)}, expected some of {list(ROLLING_STATS)}.")
+    file_path = Path(folder_path) / file_name
+    check_parquet_file(file_path)
+    schema = pq.read_schema(file_path)
+    if columns is None:
+        columns = numeric_columns(schema)
+    time_type = schema.field(time_column).type
+    lengths = {_window_label(window): _window_units(window, time_type) for window in windows}
+    LOGGER.info(f"Computing rolling {list(stats)} over {list(lengths)} for {len(columns)} columns of {file_path}")
+
+    carry = None
+    for batch in iter_parquet_batches(folder_path, file_name, batch_size=batch_size):
+        current = {name: batch.column(name).to_numpy() for name in columns}
+        current[_TIME] = _key_array(batch.column(time_column))
+        if group_column is None:
+            current[_GROUP] = np.zeros(batch.num_rows, dtype=np.int8)
+        else:
+            current[_GROUP] = _key_array(batch.column(group_column))
+        combined = current if carry is None else {
+            name: np.concatenate([carry[name], current[name]]) for name in current
+        }
+        n_carry = 0 if carry is None else len(carry[_TIME])
+
+        times = combined[_TIME]
+        codes = np.unique(combined[_GROUP], return_inverse=True)[1].ravel()
+        is_new = np.arange(len(times)) >= n_carry
+        order = np.lexsort((is_new, times, codes))
+        times, codes = times[order], codes[order]
+        same_group = codes[1:] == codes[:-1]
+        if np.any(same_group & is_new[order][:-1] & ~is_new[order][1:]):
+            raise ValueError(f"The file {file_path} is not sorted by {time_column} within each {group_column}.")
+
+        features = {}
+        for label, length in lengths.items():
+            starts = _window_starts(codes, times, length)
+            for name in columns:
+                values = _rolling(combined[name][order], starts, stats)
+                for stat in stats:
+                    # Back from (group, time) order to input order, dropping carried rows
+                    restored = np.empty(len(order), dtype=dtype)
+                    restored[order] = values[stat]
+                    features[f"{name}_{stat}_{label}"] = restored[n_carry:]
+
+        table = pa.Table.from_batches([batch])
+        for name, values in features.items():
+            table = table.append_column(name, pa.array(values))
+        yield from table.to_batches()
+
+        # Keep the rows within the longest window of the last time of their group
+        group_end = np.r_[np.flatnonzero(~same_group), len(codes) - 1]
+        last_time = np.repeat(times[group_end], np.diff(np.r_[-1, group_end]))
+        keep = order[times > last_time - max(lengths.values())]
+        carry = {name: values[keep] for name, values in combined.items()}
+
+
+def rolling_features_to_parquet(
+        folder_path: str,
+        file_name: str,
+        output_path: str,
+        windows=None,
+        stats=None,
+        columns: list[str] | None = None,
+        group_column: str | None = "TO",
+        time_column: str = "time",
+        batch_size: int | None = None,
+        row_group_size: int | None = None,
+        ) -> dict:
+    """
+    Write a Parquet feature table with rolling-window features per group.
+
+    Streams `iter_rolling_features` into a single `pyarrow.parquet.ParquetWriter`,
+    so the output has the input columns followed by the feature columns
+    and can be read back with `iter_training_batches` or `load_parquet_data`.
+
+    Args:
+        folder_path (Path | str): Path to the folder containing the input file.
+        file_name (str): Name of the input Parquet file.
+        output_path (Path | str): Path of the Parquet file to write.
+        windows (tuple | None): Window lengths. Defaults to `CONFIG_FEATURES.windows`.
+        stats (tuple | None): Statistics. Defaults to `CONFIG_FEATURES.stats`.
+        columns (list[str] | None): Feature columns. Defaults to all numeric
+            columns except `time` and `TO`.
+        group_column (str | None): Column the windows are computed per.
+        time_column (str): Epoch seconds or timestamp column.
+        batch_size (int | None): Rows read per batch. Defaults to
+            `CONFIG_FEATURES.batch_size`.
+        row_group_size (int | None): Maximum rows per written row group.
+
+    Returns:
+        dict: ``rows`` and ``batches`` written, the feature ``columns`` and
+        the ``output`` path.
+    """
+    from parquet.config import get_config
+
+    config = get_config().CONFIG_FEATURES
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    batches = iter_rolling_features(
+        folder_path, file_name, windows=windows or config.windows, stats=stats or config.stats,
+        columns=columns, group_column=group_column, time_column=time_column,
+        batch_size=batch_size or config.batch_size, dtype=config.dtype,
+    )
+    writer = None
+    rows = n_batches = 0
+    input_columns = pq.read_schema(Path(folder_path) / file_name).names
+    with span("features.rolling", file=str(output_path)) as feature_span:
+        try:
+            for batch in batches:
+                if writer is None:
+                    # Continuous features gain little from dictionary pages and write twice as fast without
+                    writer = pq.ParquetWriter(output_path, batch.schema, use_dictionary=input_columns)
+                writer.write_batch(batch, row_group_size=row_group_size)
+                rows += batch.num_rows
+                n_batches += 1
+        finally:
+            if writer is not None:
+                writer.close()
+        feature_span.set(rows=rows)
+    LOGGER.info(f"Wrote {rows} rows of rolling features to {output_path}")
+    return {
+        "rows": rows,
+        "batches": n_batches,
+        "columns": [name for name in batch.schema.names if name not in input_columns],
+        "output": str(output_path),
+    }
+
+
+def _window_label(window) -> str:
+    return window if isinstance(window, str) else f"{window}s"
+
+
+def _window_units(window, time_type) -> int:
+    """Length of `window` in the units of the time column (seconds for integers)."""
+    length = pd.Timedelta(window) if isinstance(window, str) else pd.Timedelta(seconds=window)
+    unit = time_type.unit if pa.types.is_timestamp(time_type) else "s"
+    units = length // pd.Timedelta(1, unit=unit)
+    if units <= 0:
+        raise ValueError(f"Window {window!r} must be positive.")
+    return units
+
+
+def _key_array(column) -> np.ndarray:
+    """Time or group column as a NumPy array (timestamps as integers, dictionaries decoded)."""
+    if pa.types.is_timestamp(column.type):
+        column = column.cast(pa.int64())
+    elif pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+    return column.to_numpy(zero_copy_only=False)
+
+
+def _window_starts(codes: np.ndarray, times: np.ndarray, length: int) -> np.ndarray:
+    """
+    Index of the first row of each row's window ``(time - length, time]`` in
+    arrays sorted by (group code, time).
+    """
+    # Dense ranks of the times and window edges keep the composite key small
+    edges = np.unique(np.concatenate([times, times - length]))
+    stride = len(edges) + 1
+    keys = codes.astype(np.int64) * stride + np.searchsorted(edges, times)
+    bounds = codes.astype(np.int64) * stride + np.searchsorted(edges, times - length)
+    return np.searchsorted(keys, bounds, side="right")
+
+
+def _rolling(values: np.ndarray, starts: np.ndarray, stats) -> dict:
+    """Window statistics of `values` over ``[starts[i], i]`` for every row `i`."""
+    ends = np.arange(1, len(values) + 1)
+    counts = ends - starts
+    result = {}
+    if "mean" in stats or "std" in stats:
+        # Shift by the mean to limit cancellation in the prefix sums
+        centered = values.astype(np.float64) - values.mean()
+        sums = np.r_[0.0, np.cumsum(centered)]
+        window_sum = sums[ends] - sums[starts]
+        result["mean"] = window_sum / counts + values.mean()
+        if "std" in stats:
+            squares = np.r_[0.0, np.cumsum(centered * centered)]
+            variance = (squares[ends] - squares[starts] - window_sum * window_sum / counts) / np.maximum(counts - 1, 1)
+            # A single row has no spread (pandas gives NaN)
+            result["std"] = np.sqrt(np.where(counts > 1, np.maximum(variance, 0), 0))
+    if "min" in stats:
+        result["min"] = _range_reduce(values, starts, counts, np.minimum)
+    if "max" in stats:
+        result["max"] = _range_reduce(values, starts, counts, np.maximum)
+    return result
+
+
+def _range_reduce(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, reduce) -> np.ndarray:
+    """
+    `reduce` (np.minimum or np.maximum) over ``values[starts[i]:i + 1]`` with
+    a sparse table: level k holds the reduction of the 2**k rows from each
+    position, and every window is covered by two overlapping blocks.
+    """
+    levels = [values]
+    while 2 ** len(levels) <= counts.max():
+        width = 2 ** (len(levels) - 1)
+        previous = levels[-1]
+        levels.append(reduce(previous[:-width], previous[width:]))
+    level = np.log2(counts).astype(np.int64)
+    result = np.empty(len(values), dtype=values.dtype)
+    for k, table in enumerate(levels):
+        rows = np.flatnonzero(level == k)
+        result[rows] = reduce(table[starts[rows]], table[rows - 2 ** k + 1])
+    return result
+
 
 if __name__ == "__main__":
     # Example usage for CSV
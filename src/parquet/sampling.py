@@ -0,0 +1,361 @@
+"""
+Sampling readers and approximate statistics for large Parquet datasets.
+Exploration and quick health checks do not need every row. This module
+reads a random subset of row groups and samples rows from them:
+
+    1) Row groups are drawn without replacement with equal probability, so
+       only `max_row_groups` of them are decoded, plus as many more as the
+       sample size needs at the average row-group size (row counts come from
+       the footers). All rows of the drawn row groups are candidates, so a
+       row's inclusion probability does not depend on the size of its row
+       group and the sample needs no weights.
+    2) `sample_parquet_table` keeps a uniform reservoir of `sample_size`
+       rows of the decoded row groups: every row gets a random key and the
+       rows with the smallest keys are kept, so memory stays bounded by the
+       sample plus one batch.
+    3) `stratified_sample_table` keeps up to `per_stratum` rows per `TO`
+       and/or time bucket the same way and adds a `sample_weight` column (the
+       number of dataset rows each sampled row stands for).
+    4) `approximate_statistics` summarizes a uniform sample like
+       `DataFrame.describe()` and adds confidence intervals for the mean and
+       the quartiles. Estimates are ratio estimates over the drawn row
+       groups; standard errors account for the rows of one row group being
+       correlated (ultimate-cluster variance); quartile intervals use
+       the same design effect (Woodruff intervals). `count`, `min` and `max`
+       come from the footer statistics when every row group has them.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from pathlib import Path
+from statistics import NormalDist
+
+from parquet.grouped_stats import time_bucket
+from parquet.streaming_stats import QUANTILES, STAT_INDEX, numeric_columns
+from parquet.util import lazy_import, list_data_files, setup_logger, span
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+DEFAULT_SAMPLE_SIZE = 100_000
+DEFAULT_PER_STRATUM = 1_000
+# Row groups decoded at least (more when they hold fewer rows than the sample)
+DEFAULT_MAX_ROW_GROUPS = 32
+DEFAULT_BATCH_SIZE = 65_536
+DEFAULT_CONFIDENCE = 0.95
+WEIGHT_COLUMN = "sample_weight"
+# Rows added by `approximate_statistics` after the `describe()` rows
+CI_INDEX = ["mean_ci_low", "mean_ci_high"] + [
+    f"{q:.0%}_ci_{side}" for q in QUANTILES for side in ("low", "high")
+]
+
+
+def _read_footers(files) -> list[tuple[Path, pq.FileMetaData]]:
+    """The footer of each file, read once and shared by the helpers below."""
+    return [(Path(file_path), pq.read_metadata(file_path)) for file_path in files]
+
+
+def _row_groups(footers) -> list[tuple[Path, int, int]]:
+    """(file, row group, rows) of every row group, from the footers."""
+    groups = []
+    for file_path, metadata in footers:
+        groups += [(file_path, rg, metadata.row_group(rg).num_rows) for rg in range(metadata.num_row_groups)]
+    return groups
+
+
+def _choose_row_groups(groups, sample_size: int, max_row_groups: int | None, rng) -> list[int]:
+    """
+    Indices of the non-empty row groups to decode. All of them when there
+    are at most `max_row_groups` (or it is None); otherwise a simple random
+    subset of a fixed number of groups: at least `max_row_groups`, and enough
+    to hold `sample_size` rows at the average row-group size.
+
+    Drawing with equal probability rather than proportional to size matters:
+    the rows of the drawn groups are pooled and sampled uniformly, so
+    size-weighted draws would over-represent the rows of large row groups.
+    """
+    sizes = np.array([rows for _, _, rows in groups], dtype=np.float64)
+    nonempty = np.flatnonzero(sizes > 0)
+    if max_row_groups is None or len(nonempty) <= max_row_groups:
+        return nonempty.tolist()
+    k = min(max(max_row_groups, math.ceil(sample_size / sizes[nonempty].mean())), len(nonempty))
+    return sorted(rng.choice(nonempty, size=k, replace=False).tolist())
+
+
+def _iter_row_groups(groups, chosen, columns, batch_size):
+    """Yield (row group index, record batch) for the chosen row groups, file by file."""
+    parquet_file, current = None, None
+    for index in chosen:
+        file_path, rg, _ = groups[index]
+        if file_path != current:
+            parquet_file, current = pq.ParquetFile(file_path), file_path
+        for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=[rg], columns=columns):
+            yield index, batch
+
+
+def _sample_row_groups(input_path, footers, sample_size, columns, max_row_groups, seed, batch_size):
+    """Uniform reservoir sample plus its design: row group per sampled row and population sizes."""
+    rng = np.random.default_rng(seed)
+    groups = _row_groups(footers)
+    chosen = _choose_row_groups(groups, sample_size, max_row_groups, rng)
+
+    tables, clusters, keys = [], np.empty(0, dtype=np.int64), np.empty(0)
+    for index, batch in _iter_row_groups(groups, chosen, columns, batch_size):
+        tables.append(pa.Table.from_batches([batch]))
+        clusters = np.concatenate([clusters, np.full(batch.num_rows, index)])
+        keys = np.concatenate([keys, rng.random(batch.num_rows)])
+        if len(keys) > sample_size:
+            keep = np.sort(np.argpartition(keys, sample_size)[:sample_size])
+            tables = [pa.concat_tables(tables).take(keep)]
+            clusters, keys = clusters[keep], keys[keep]
+    if not tables:
+        raise ValueError(f"No rows to sample in {input_path}.")
+    design = {
+        "row_groups": len(groups),
+        "row_groups_read": len(chosen),
+        # Share of the non-empty row groups that were drawn
+        "group_fraction": len(chosen) / sum(1 for _, _, rows in groups if rows > 0),
+        "population_rows": sum(rows for _, _, rows in groups),
+        "rows_read": sum(groups[i][2] for i in chosen),
+    }
+    return pa.concat_tables(tables).combine_chunks(), clusters, design
+
+
+def sample_parquet_table(
+        input_path,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        columns: list[str] | None = None,
+        max_row_groups: int | None = DEFAULT_MAX_ROW_GROUPS,
+        seed: int | None = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ) -> pa.Table:
+    """
+    Uniform random sample of the rows of a Parquet file, directory or glob.
+
+    Args:
+        input_path (Path | str): Parquet file, directory or glob pattern.
+        sample_size (int): Rows in the sample (fewer if the data is smaller).
+        columns (list[str] | None): Columns to read. Defaults to all columns.
+        max_row_groups (int | None): Row groups decoded at least; the sample
+            is drawn from them. None decodes every row group.
+        seed (int | None): Seed of the row group choice and the reservoir.
+        batch_size (int): Rows decoded at a time.
+
+    Returns:
+        pa.Table: The sampled rows, in file order.
+    """
+    with span("sample.uniform", path=str(input_path)) as sample_span:
+        footers = _read_footers(list_data_files(input_path))
+        table, _, design = _sample_row_groups(input_path, footers, sample_size, columns, max_row_groups, seed,
+                                              batch_size)
+        sample_span.set(rows=table.num_rows, rows_read=design["rows_read"])
+    LOGGER.info(f"Sampled {table.num_rows} of {design['population_rows']} rows from "
+                f"{design['row_groups_read']}/{design['row_groups']} row groups")
+    return table
+
+
+def _stratum_codes(batch, by, bucket, time_column, strata: dict) -> np.ndarray:
+    """
+    Stratum code per row of `batch`. `strata` maps each key tuple (values of
+    `by`, then the time bucket) to its code and grows as new strata appear.
+    """
+    keys = []
+    for name in by:
+        column = batch.column(name)
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        keys.append(column.to_numpy(zero_copy_only=False))
+    if bucket is not None:
+        keys.append(time_bucket(pa.chunked_array([batch.column(time_column)]), bucket))
+    # Factorize within the batch, then translate the few distinct keys to global codes
+    local = np.zeros(batch.num_rows, dtype=np.int64)
+    for key in keys:
+        _, inverse = np.unique(key, return_inverse=True)
+        local = local * (inverse.max() + 1) + inverse
+    _, first_row, local = np.unique(local, return_index=True, return_inverse=True)
+    codes = [strata.setdefault(tuple(key[i].item() for key in keys), len(strata)) for i in first_row]
+    return np.asarray(codes, dtype=np.int64)[local]
+
+
+def stratified_sample_table(
+        input_path,
+        per_stratum: int = DEFAULT_PER_STRATUM,
+        by: tuple[str, ...] = ("TO",),
+        bucket: str | None = None,
+        columns: list[str] | None = None,
+        max_row_groups: int | None = DEFAULT_MAX_ROW_GROUPS,
+        seed: int | None = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        time_column: str = "time",
+        ) -> pa.Table:
+    """
+    Sample up to `per_stratum` rows of every stratum, where a stratum is a
+    value of the `by` columns and/or a ``"hour"``, ``"day"`` or ``"week"``
+    bucket of `time_column`.
+
+    Strata are found in the decoded row groups only, so with `max_row_groups`
+    set a stratum confined to row groups that were not drawn is missing; pass
+    None to cover all of them.
+
+    Returns:
+        pa.Table: The sampled rows with a `sample_weight` column (estimated
+        rows of the dataset in the stratum divided by the rows sampled from it).
+    """
+    by = tuple(by)
+    if not by and bucket is None:
+        raise ValueError("Stratified sampling needs at least one key column or a time bucket.")
+    rng = np.random.default_rng(seed)
+    groups = _row_groups(_read_footers(list_data_files(input_path)))
+    chosen = _choose_row_groups(groups, per_stratum, max_row_groups, rng)
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys([*by, *([time_column] if bucket else []), *columns]))
+
+    strata, population = {}, np.zeros(0, dtype=np.int64)
+    table, codes, keys = None, np.empty(0, dtype=np.int64), np.empty(0)
+    with span("sample.stratified", path=str(input_path)) as sample_span:
+        for _, batch in _iter_row_groups(groups, chosen, read_columns, batch_size):
+            batch_codes = _stratum_codes(batch, by, bucket, time_column, strata)
+            counts = np.bincount(batch_codes, minlength=len(strata))
+            population = np.r_[population, np.zeros(len(strata) - len(population), dtype=np.int64)] + counts
+            batch_table = pa.Table.from_batches([batch])
+            table = batch_table if table is None else pa.concat_tables([table, batch_table])
+            codes = np.concatenate([codes, batch_codes])
+            keys = np.concatenate([keys, rng.random(batch.num_rows)])
+            # Keep the `per_stratum` smallest keys of each stratum
+            order = np.lexsort((keys, codes))
+            starts = np.r_[0, np.flatnonzero(np.diff(codes[order])) + 1]
+            rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+            keep = np.sort(order[rank < per_stratum])
+            table, codes, keys = table.take(keep), codes[keep], keys[keep]
+        if table is None:
+            raise ValueError(f"No rows to sample in {input_path}.")
+        sample_span.set(rows=table.num_rows, strata=len(strata))
+
+    # Rows of the dataset per stratum, scaled up from the row groups that were read
+    scale = sum(rows for _, _, rows in groups) / max(sum(groups[i][2] for i in chosen), 1)
+    weights = population[codes] * scale / np.bincount(codes, minlength=len(strata))[codes]
+    key_names = [*by, "time_bucket"] if bucket is not None else list(by)
+    LOGGER.info(f"Sampled {table.num_rows} rows from {len(strata)} strata of {key_names}")
+    if columns is not None:
+        table = table.select(columns)
+    return table.append_column(WEIGHT_COLUMN, pa.array(weights, type=pa.float64()))
+
+
+def _footer_extremes(footers, name) -> tuple[float, float, int] | None:
+    """Exact (min, max, null count) of a column, or None unless every row group has statistics."""
+    lows, highs, nulls = [], [], 0
+    for _, metadata in footers:
+        # Leaf column of `name` in the Parquet schema (Arrow field indices differ with nested columns)
+        leaves = [i for i in range(metadata.num_columns) if metadata.schema.column(i).path == name]
+        if not leaves:
+            return None
+        index = leaves[0]
+        for rg in range(metadata.num_row_groups):
+            if metadata.row_group(rg).num_rows == 0:
+                continue
+            stats = metadata.row_group(rg).column(index).statistics
+            if stats is None or not stats.has_min_max or stats.null_count is None:
+                return None
+            lows.append(stats.min)
+            highs.append(stats.max)
+            nulls += stats.null_count
+    return (float(min(lows)), float(max(highs)), nulls) if lows else None
+
+
+def _column_estimates(values, clusters, population_rows, group_fraction, z) -> dict:
+    """
+    Mean, std and quartiles of one column with their confidence intervals.
+    `group_fraction` is the share of the row groups that were drawn.
+    """
+    valid = ~np.isnan(values)
+    values, clusters = values[valid], clusters[valid]
+    n = len(values)
+    if n == 0:
+        return {}
+    mean = float(values.mean())
+    std = float(values.std(ddof=1)) if n > 1 else math.nan
+    srs_variance = std * std / n if n > 1 else math.nan
+
+    cluster_ids, inverse = np.unique(clusters, return_inverse=True)
+    k = len(cluster_ids)
+    if group_fraction >= 1 or k < 2:
+        # Simple random sample of the rows, with finite population correction
+        variance = srs_variance * max(1 - n / population_rows, 0.0)
+    else:
+        # Ultimate-cluster variance of the ratio mean over the row groups drawn
+        # with equal probability, with finite population correction
+        sums = np.bincount(inverse, weights=values)
+        counts = np.bincount(inverse)
+        variance = (1 - group_fraction) * k / (k - 1) * float(((sums - mean * counts) ** 2).sum()) / (n * n)
+    deff = max(variance / srs_variance, 1.0) if srs_variance > 0 else 1.0
+    half_width = z * math.sqrt(variance) if variance == variance else math.nan
+
+    estimates = {"mean": mean, "std": std, "mean_ci_low": mean - half_width, "mean_ci_high": mean + half_width}
+    probabilities = []
+    for q in QUANTILES:
+        spread = z * math.sqrt(q * (1 - q) * deff / n)
+        probabilities += [q, max(q - spread, 0.0), min(q + spread, 1.0)]
+    quantiles = np.quantile(values, probabilities)
+    for i, q in enumerate(QUANTILES):
+        label = f"{q:.0%}"
+        estimates[label], estimates[f"{label}_ci_low"], estimates[f"{label}_ci_high"] = quantiles[3 * i:3 * i + 3]
+    estimates.update({"min": float(values.min()), "max": float(values.max()),
+                      "count": n / len(valid) * population_rows})
+    return estimates
+
+
+def approximate_statistics(
+        input_path,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        columns: list[str] | None = None,
+        max_row_groups: int | None = DEFAULT_MAX_ROW_GROUPS,
+        confidence: float = DEFAULT_CONFIDENCE,
+        seed: int | None = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ) -> pd.DataFrame:
+    """
+    Approximate `describe()` statistics from a uniform sample.
+
+    Args:
+        input_path (Path | str): Parquet file, directory or glob pattern.
+        sample_size (int): Rows sampled.
+        columns (list[str] | None): Columns to summarize. Defaults to the
+            numeric columns except `time` and `TO`.
+        max_row_groups (int | None): Row groups decoded at least (see
+            `sample_parquet_table`).
+        confidence (float): Confidence level of the intervals.
+        seed (int | None): Seed of the sample.
+        batch_size (int): Rows decoded at a time.
+
+    Returns:
+        pd.DataFrame: One column per input column with the rows of
+        `DataFrame.describe()` followed by `CI_INDEX`. `count` is the
+        estimated number of non-null values in the dataset.
+    """
+    footers = _read_footers(list_data_files(input_path))
+    if columns is None:
+        columns = numeric_columns(footers[0][1].schema.to_arrow_schema())
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    with span("sample.approximate_stats", path=str(input_path)) as stats_span:
+        table, clusters, design = _sample_row_groups(input_path, footers, sample_size, columns, max_row_groups,
+                                                     seed, batch_size)
+        stats = {}
+        for name in columns:
+            values = table.column(name).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            stats[name] = _column_estimates(values, clusters, design["population_rows"],
+                                             design["group_fraction"], z)
+            footer = _footer_extremes(footers, name)
+            if footer is not None:
+                low, high, nulls = footer
+                stats[name].update({"min": low, "max": high, "count": float(design["population_rows"] - nulls)})
+        stats_span.set(rows=table.num_rows, rows_read=design["rows_read"])
+    LOGGER.info(f"Approximate statistics of {len(columns)} columns from {table.num_rows} sampled rows "
+                f"({design['rows_read']} of {design['population_rows']} rows decoded)")
+    return pd.DataFrame(stats, index=STAT_INDEX + CI_INDEX, dtype="float64")
@@ -1,51 +1,185 @@
-from parquet.load_parquet import load_parquet_data
-import os
-import pandas as pd
+from __future__ import annotations
 
-# from parquet.config import get_config
-from config import get_config
+from parquet.load_parquet import load_parquet_data, check_parquet_file, validate_parquet_metadata
+from parquet.grouped_stats import grouped_statistics_from_parquet
+from parquet.streaming_stats import (
+    compute_dataset_statistics,
+    compute_fused_statistics,
+    compute_streaming_statistics,
+    summaries_to_frame,
+)
+from parquet.sampling import approximate_statistics
+from parquet.stats_state import update_statistics_state
+from parquet.util import lazy_import, list_data_files, span
+import os
+from pathlib import Path
 
-CONFIG = get_config()
-CONFIG_AUTO_ENCODER = CONFIG.CONFIG_AUTO_ENCODER
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
 
 # Load the Parquet file and compute statistics
 
 def stats_pipeline(
-        input_path: str = 'data/processed/', 
-        stats_path: str = 'data/output'
+        input_path: str = 'data/processed/',
+        stats_path: str = 'data/output',
+        engine: str | None = None,
+        batch_size: int | None = None,
+        quantile_error: float | None = None,
+        dataset: bool = False,
+        max_workers: int | None = None,
+        incremental: bool = False,
+        sample_size: int | None = None,
         ):
     """
     Load the Parquet file and compute statistics.
-    
+
+    Args:
+        input_path (str): Folder containing `training_data.parquet`, or in
+            dataset mode a directory (searched recursively) or glob pattern.
+        stats_path (str): Folder to write `statistics.csv` to.
+        engine (str | None): ``"pandas"`` loads the file and runs
+            `df.describe()`. ``"streaming"`` computes the same table over
+            record batches with constant memory; its quantiles come from a
+            sketch and are approximate once a column exceeds the sketch size.
+            ``"fused"`` is the streaming engine with the validation folded
+            into the same pass: every column chunk is decoded once for the
+            null/NaN checks and the statistics together. ``"sample"`` is
+            approximate: it decodes a random subset of row groups and adds
+            confidence intervals of the mean and quartiles (see
+            `parquet.sampling.approximate_statistics`); with `dataset` it
+            samples every file matched by `input_path`.
+            Defaults to `CONFIG_STATISTICS.engine`.
+        batch_size (int | None): Rows per batch for the streaming engine.
+        quantile_error (float | None): Rank error bound for streamed quantiles.
+        dataset (bool): Summarize every Parquet file matched by `input_path`
+            with per-file partial statistics computed in a process pool and
+            merged into one table. Only the ``"streaming"`` (the default in
+            this mode) and ``"sample"`` engines apply; passing another engine
+            raises a ValueError.
+        max_workers (int | None): Worker processes in dataset mode.
+        incremental (bool): Dataset mode that keeps mergeable state and a
+            manifest of input files in `<stats_path>/statistics_state`, so
+            only new or changed files are read on later runs. Always uses the
+            streaming engine; passing another engine raises a ValueError.
+        sample_size (int | None): Rows sampled by the ``"sample"`` engine.
+
     Returns:
         pd.DataFrame: DataFrame containing the computed statistics.
     """
+    from parquet.config import get_config
 
+    config_statistics = get_config().CONFIG_STATISTICS
+    if incremental and engine not in (None, 'streaming'):
+        raise ValueError(f"Incremental statistics use the streaming engine, got engine {engine!r}.")
+    if dataset and engine not in (None, 'streaming', 'sample'):
+        raise ValueError(f"Dataset statistics use the 'streaming' or 'sample' engine, got engine {engine!r}.")
+    engine = engine or config_statistics.engine
     file_name = 'training_data.parquet'
-    df = load_parquet_data(input_path, file_name)
-    
-    stats = df.describe()
-    stats.drop(['time', 'TO'], axis=1, inplace=True)
+    batch_size = batch_size or config_statistics.batch_size
+    quantile_error = quantile_error or config_statistics.quantile_error
+
+    if engine == 'sample' and not incremental:
+        source = input_path if dataset else Path(input_path) / file_name
+        if not dataset:
+            check_parquet_file(source)
+        with span("stats.compute", engine=engine):
+            stats = approximate_statistics(
+                source,
+                sample_size=sample_size or config_statistics.sample_size,
+                max_row_groups=config_statistics.sample_row_groups,
+                confidence=config_statistics.confidence,
+                batch_size=batch_size,
+            )
+    elif incremental:
+        files = list_data_files(input_path)
+        state_dir = os.path.join(stats_path, 'statistics_state')
+        summaries, _ = update_statistics_state(
+            files, state_dir, batch_size=batch_size, quantile_error=quantile_error, max_workers=max_workers,
+        )
+        stats = summaries_to_frame(summaries)
+    elif dataset:
+        files = list_data_files(input_path)
+        summaries = compute_dataset_statistics(
+            files, batch_size=batch_size, quantile_error=quantile_error, max_workers=max_workers,
+        )
+        stats = summaries_to_frame(summaries)
+    elif engine == 'pandas':
+        with span("stats.load", engine=engine):
+            df = load_parquet_data(input_path, file_name)
+
+        with span("stats.describe", rows=len(df)):
+            stats = df.describe()
+        stats.drop(['time', 'TO'], axis=1, inplace=True)
+    elif engine == 'streaming':
+        file_path = Path(input_path) / file_name
+        check_parquet_file(file_path)
+        validate_parquet_metadata(file_path)
+        with span("stats.compute", engine=engine):
+            summaries = compute_streaming_statistics(
+                file_path, batch_size=batch_size, quantile_error=quantile_error,
+            )
+        stats = summaries_to_frame(summaries)
+    elif engine == 'fused':
+        file_path = Path(input_path) / file_name
+        check_parquet_file(file_path)
+        with span("stats.compute", engine=engine) as compute_span:
+            summaries, report = compute_fused_statistics(
+                file_path, batch_size=batch_size, quantile_error=quantile_error,
+            )
+            compute_span.set(rows=report["rows"], bytes_read=file_path.stat().st_size)
+        stats = summaries_to_frame(summaries)
+    else:
+        raise ValueError(
+            f"Unknown statistics engine {engine!r}, expected 'pandas', 'streaming', 'fused' or 'sample'."
+        )
 
     print(stats)
 
     save_statistics_to_csv(stats, stats_path)
     print("Statistics computed and saved successfully.")
+    return stats
+
 
 
 
+def grouped_stats_pipeline(
+        input_path: str = 'data/processed/',
+        stats_path: str = 'data/output',
+        by: tuple[str, ...] = ('TO',),
+        bucket: str | None = None,
+        ) -> pa.Table:
+    """
+    Compute statistics per `TO` and/or time bucket and save them as Parquet.
+
+    Args:
+        input_path (str): Parquet file, directory or glob pattern.
+        stats_path (str): Folder to write `grouped_statistics.parquet` to.
+        by (tuple[str, ...]): Key columns to group by.
+        bucket (str | None): Time bucket of `time`: "hour", "day" or "week".
+
+    Returns:
+        pa.Table: Tidy table with one row per group and sensor column.
+    """
+    stats = grouped_statistics_from_parquet(input_path, by=by, bucket=bucket)
+    output_file = os.path.join(stats_path, 'grouped_statistics.parquet')
+    print(f"Saving grouped statistics ({stats.num_rows} rows) to {output_file}")
+    pq.write_table(stats, output_file)
+    return stats
+
 
 def save_statistics_to_csv(stats: pd.DataFrame, stats_path: str):
     """
     Save the computed statistics to a CSV file.
-    
+
     Args:
         stats (pd.DataFrame): DataFrame containing the computed statistics.
         output_file (str): Path to the output CSV file.
     """
     output_file = os.path.join(stats_path, 'statistics.csv')
     print(f"Saving statistics to {output_file}")
-    stats.to_csv(output_file)
+    with span("stats.write_csv", file=output_file):
+        stats.to_csv(output_file)
 
 
 def main():
@@ -54,8 +188,17 @@ def main():
     """
     input_path = os.getenv('INPUT_PATH', 'data/processed/')
     stats_path = os.getenv('STATS_PATH', 'data/output')
-    stats_pipeline(input_path, stats_path)
+    engine = os.getenv('STATS_ENGINE')
+    dataset = os.getenv('STATS_DATASET', '').lower() in ('1', 'true', 'yes')
+    incremental = os.getenv('STATS_INCREMENTAL', '').lower() in ('1', 'true', 'yes')
+    group_by = os.getenv('STATS_GROUP_BY')
+    bucket = os.getenv('STATS_TIME_BUCKET')
+    if group_by or bucket:
+        by = tuple(c for c in (group_by or '').split(',') if c)
+        grouped_stats_pipeline(input_path, stats_path, by=by, bucket=bucket)
+        return
+    stats_pipeline(input_path, stats_path, engine=engine, dataset=dataset, incremental=incremental)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,141 @@
+"""
+Persistent state for incremental statistics.
+This module keeps mergeable statistics (moments, min/max and quantile
+sketches) on disk next to `statistics.csv`, so a nightly run only reads the
+files that are new or changed since the previous run.
+
+The state directory holds:
+    1) `manifest.json` - one entry per input file with its size, mtime,
+       SHA-256 content hash and the name of its partial summary, plus the
+       merge of all partials ("totals"). It is replaced atomically, so the
+       manifest and the totals always agree.
+    2) `partials/<sha256>.json` - the summary of each input file.
+
+New files are merged into the stored totals directly. Changed or removed
+files cannot be subtracted from the totals, so the totals are rebuilt from
+the stored partials instead; no data pages are re-read either way.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from parquet.streaming_stats import (
+    ColumnSummary,
+    compute_file_partials,
+    load_summaries,
+    merge_summaries,
+    save_summaries,
+    summaries_from_dict,
+    summaries_to_dict,
+)
+from parquet.util import file_sha256, setup_logger, write_json_atomic
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+STATE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+PARTIALS_DIR = "partials"
+
+
+def load_manifest(state_dir) -> dict:
+    """Read the manifest of a state directory (an empty one if there is none)."""
+    manifest_path = Path(state_dir) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return {"version": STATE_VERSION, "settings": None, "files": {}, "totals": None}
+    with open(manifest_path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def update_statistics_state(
+        files,
+        state_dir,
+        batch_size: int = 65_536,
+        quantile_error: float = 0.01,
+        max_workers: int | None = None,
+        ) -> tuple[dict[str, ColumnSummary], dict]:
+    """
+    Bring the stored statistics up to date with `files` and return the totals.
+
+    A file whose size and mtime match the manifest is taken as unchanged
+    without hashing. Otherwise its content hash decides: an unchanged hash
+    only refreshes the manifest entry, a new hash recomputes its partial.
+
+    Args:
+        files (Iterable[Path | str]): All Parquet files of the dataset.
+        state_dir (Path | str): Directory holding the state (created if missing).
+        batch_size (int): Maximum number of rows decoded at a time.
+        quantile_error (float): Target normalized rank error of the quantiles.
+            Changing it discards the stored state.
+        max_workers (int | None): Worker processes for new or changed files.
+
+    Returns:
+        tuple[dict[str, ColumnSummary], dict]: Merged summary per column and a
+        report with the lists of `added`, `changed`, `removed` and `unchanged` files.
+    """
+    state_dir = Path(state_dir)
+    partials_dir = state_dir / PARTIALS_DIR
+    partials_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = load_manifest(state_dir)
+    settings = {"quantile_error": quantile_error}
+    if manifest.get("version") != STATE_VERSION or manifest.get("settings") != settings:
+        if manifest["files"]:
+            LOGGER.info(f"Statistics state in {state_dir} was built with other settings; rebuilding.")
+        for stale in partials_dir.glob("*.json"):
+            stale.unlink()
+        manifest = {"version": STATE_VERSION, "settings": settings, "files": {}, "totals": None}
+
+    old_entries = manifest["files"]
+    entries, to_compute = {}, []
+    report = {"added": [], "changed": [], "removed": [], "unchanged": []}
+
+    for file_path in (Path(f).resolve() for f in files):
+        key = str(file_path)
+        stat = file_path.stat()
+        old = old_entries.get(key)
+        if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            entries[key] = old
+            report["unchanged"].append(key)
+            continue
+        sha256 = file_sha256(file_path)
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256, "partial": f"{sha256}.json"}
+        entries[key] = entry
+        if old and old["sha256"] == sha256:
+            report["unchanged"].append(key)
+            continue
+        report["changed" if old else "added"].append(key)
+        # Content seen before (e.g. a renamed file) reuses the stored partial
+        if not (partials_dir / entry["partial"]).exists():
+            to_compute.append((file_path, entry))
+    report["removed"] = sorted(set(old_entries) - set(entries))
+
+    LOGGER.info(
+        f"Statistics state: {len(report['added'])} added, {len(report['changed'])} changed, "
+        f"{len(report['removed'])} removed, {len(report['unchanged'])} unchanged files"
+    )
+
+    partials = compute_file_partials(
+        [f for f, _ in to_compute], batch_size=batch_size,
+        quantile_error=quantile_error, max_workers=max_workers,
+    )
+    for (_, entry), partial in zip(to_compute, partials):
+        save_summaries(partial, partials_dir / entry["partial"])
+
+    if not report["changed"] and not report["removed"] and manifest.get("totals") is not None:
+        # Append-only update: merge the new partials into the stored totals
+        new_partials = [load_summaries(partials_dir / entries[f]["partial"]) for f in report["added"]]
+        totals = merge_summaries([summaries_from_dict(manifest["totals"]), *new_partials])
+    else:
+        totals = merge_summaries(load_summaries(partials_dir / e["partial"]) for e in entries.values())
+
+    manifest["files"] = entries
+    manifest["totals"] = summaries_to_dict(totals)
+    write_json_atomic(manifest, state_dir / MANIFEST_FILE)
+
+    # Drop partials that no manifest entry refers to any more
+    referenced = {e["partial"] for e in entries.values()}
+    for orphan in partials_dir.glob("*.json"):
+        if orphan.name not in referenced:
+            orphan.unlink()
+    return totals, report
@@ -0,0 +1,482 @@
+"""
+Out-of-core statistics for Parquet files.
+This module computes the same summary as `pandas.DataFrame.describe()`
+(count, mean, std, min, 25%, 50%, 75%, max) while reading a Parquet file in
+record batches, so memory stays constant regardless of the number of rows.
+
+    1) `ColumnSummary` keeps count, mean and the sum of squared deviations
+       (merged batch by batch with Chan's parallel form of Welford's update)
+       plus min/max.
+    2) `QuantileSketch` is a KLL-style mergeable quantile sketch. While the
+       sketch holds fewer values than its capacity it is exact, so small
+       files reproduce `describe()` quantiles.
+
+Both classes can be merged and serialized to plain dicts, so partial results
+can be combined later. `compute_dataset_statistics` summarizes many files in
+a process pool and `merge_summaries` combines the per-file partials; partials
+saved with `save_summaries` on other machines can be merged the same way.
+
+`compute_fused_statistics` also validates the file (rows, nulls and NaN)
+from the same pass, so a stats run decodes each column chunk exactly once.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from pathlib import Path
+
+from parquet.load_parquet import check_parquet_file, pandas_index_columns, validate_parquet_metadata
+from parquet.util import lazy_import, process_pool, setup_logger
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+pq = lazy_import("pyarrow.parquet")
+
+LOGGER = setup_logger(__name__, logging.INFO)
+
+# Row labels of `DataFrame.describe()` for numeric columns, in order
+STAT_INDEX = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+QUANTILES = (0.25, 0.5, 0.75)
+# Columns that identify a record rather than measure it
+ID_COLUMNS = ("time", "TO")
+
+# Sketch size needed per unit of normalized rank error (k = ceil(K / error))
+_K_PER_ERROR = 4.0
+# Ratio between the capacities of successive sketch levels
+_CAPACITY_DECAY = 2.0 / 3.0
+_MIN_CAPACITY = 2
+
+
+class QuantileSketch:
+    """
+    KLL-style quantile sketch over float values.
+
+    Values are kept in levels; a value on level `h` stands for `2**h` inputs.
+    When a level outgrows its capacity it is sorted and every other value
+    (random offset) is promoted to the next level. Top levels keep `k` values
+    and lower levels geometrically fewer, which bounds the memory to O(k) and
+    the normalized rank error to roughly `quantile_error`.
+    """
+
+    def __init__(self, k: int = 400, seed: int | None = None):
+        if k < _MIN_CAPACITY:
+            raise ValueError(f"k must be at least {_MIN_CAPACITY}.")
+        self.k = int(k)
+        self.n = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_error(cls, quantile_error: float, seed: int | None = None) -> "QuantileSketch":
+        """Create a sketch sized for the given normalized rank error (e.g. 0.01)."""
+        if not 0 < quantile_error < 1:
+            raise ValueError("quantile_error must be between 0 and 1.")
+        return cls(k=math.ceil(_K_PER_ERROR / quantile_error), seed=seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(_MIN_CAPACITY, math.ceil(self.k * _CAPACITY_DECAY ** depth))
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of (non-NaN) values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        self.n += values.size
+        level = 0
+        if values.size > self.k:
+            # Compact a large batch on its own: one sort, then every halving
+            # keeps it sorted, instead of re-sorting it on each level it passes
+            values = np.sort(values)
+            while values.size > self.k:
+                keep = values[:1] if values.size % 2 else values[:0]
+                self._append(level, keep)
+                values = values[keep.size:][self._rng.integers(2)::2]
+                level += 1
+        self._append(level, values)
+        self._compress()
+
+    def _append(self, level: int, items: np.ndarray) -> None:
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0, dtype=np.float64))
+        self.levels[level] = np.concatenate([self.levels[level], items])
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch into this one."""
+        self.k = max(self.k, other.k)
+        self.n += other.n
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            items = np.sort(items)
+            # An odd item out stays on this level so total weight is preserved
+            keep = items[:1] if items.size % 2 else items[:0]
+            pairs = items[keep.size:]
+            promoted = pairs[self._rng.integers(2)::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Capacities shift when a level is added, so re-check from the bottom
+            level = 0
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Estimate quantiles with linear interpolation between ranks.
+
+        Exact (and equal to `numpy.quantile`) while no compaction has happened.
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(lvl.size, 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+        total = weights.sum()
+        # Centre rank of each item; equals its index when all weights are 1
+        centres = np.cumsum(weights) - (weights + 1) / 2
+        return np.interp(q * (total - 1), centres, items)
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "n": self.n, "levels": [lvl.tolist() for lvl in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(k=data["k"])
+        sketch.n = data["n"]
+        sketch.levels = [np.asarray(lvl, dtype=np.float64) for lvl in data["levels"]] or [np.empty(0)]
+        return sketch
+
+
+class ColumnSummary:
+    """
+    Mergeable summary of one numeric column: count, mean, M2 (sum of squared
+    deviations from the mean), min, max and a quantile sketch.
+    """
+
+    def __init__(self, quantile_error: float = 0.01, seed: int | None = None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch.from_error(quantile_error, seed=seed)
+
+    def update(self, values: np.ndarray, nan_free: bool = False) -> None:
+        """
+        Add a batch of values; NaNs are ignored like in `describe()`.
+        `nan_free` skips the NaN filter for values already known to hold none.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not nan_free:
+            values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        batch_mean = values.mean()
+        batch_m2 = np.square(values - batch_mean).sum()
+        self._merge_moments(values.size, batch_mean, batch_m2)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.sketch.update(values)
+
+    def merge(self, other: "ColumnSummary") -> None:
+        """Merge another summary of the same column into this one."""
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def _merge_moments(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def describe(self) -> dict:
+        """Statistics keyed like the rows of `DataFrame.describe()`."""
+        if self.count == 0:
+            return {"count": 0.0, **{key: np.nan for key in STAT_INDEX[1:]}}
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        q25, q50, q75 = self.sketch.quantile(QUANTILES)
+        return {
+            "count": float(self.count), "mean": self.mean, "std": std, "min": self.min,
+            "25%": q25, "50%": q50, "75%": q75, "max": self.max,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count, "mean": self.mean, "m2": self.m2,
+            "min": self.min, "max": self.max, "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnSummary":
+        summary = cls()
+        summary.count = data["count"]
+        summary.mean = data["mean"]
+        summary.m2 = data["m2"]
+        summary.min = data["min"]
+        summary.max = data["max"]
+        summary.sketch = QuantileSketch.from_dict(data["sketch"])
+        return summary
+
+
+def numeric_columns(schema: pa.Schema, exclude=ID_COLUMNS) -> list[str]:
+    """
+    Names of the integer and floating point columns of `schema`, skipping
+    `exclude` and any pandas index columns stored in the file.
+    """
+    index_columns = pandas_index_columns(schema)
+    return [
+        field.name for field in schema
+        if (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))
+        and field.name not in exclude and field.name not in index_columns
+    ]
+
+
+def compute_streaming_statistics(
+        file_path: str,
+        columns: list[str] | None = None,
+        batch_size: int = 65_536,
+        quantile_error: float = 0.01,
+        ) -> dict[str, ColumnSummary]:
+    """
+    Summarize the numeric columns of a Parquet file in a single pass over
+    record batches.
+
+    Args:
+        file_path (Path | str): Path to the Parquet file.
+        columns (list[str] | None): Columns to summarize. Defaults to all
+            numeric columns except `time` and `TO`.
+        batch_size (int): Maximum number of rows decoded at a time.
+        quantile_error (float): Target normalized rank error of the quantiles.
+
+    Returns:
+        dict[str, ColumnSummary]: Mergeable summary per column.
+    """
+    parquet_file = pq.ParquetFile(file_path)
+    if columns is None:
+        columns = numeric_columns(parquet_file.schema_arrow)
+    summaries = {name: ColumnSummary(quantile_error) for name in columns}
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        for name in columns:
+            values = batch.column(name).to_numpy(zero_copy_only=False)
+            summaries[name].update(values)
+
+    LOGGER.info(f"Streaming statistics computed for {len(columns)} columns of {Path(file_path)}")
+    return summaries
+
+
+def compute_fused_statistics(
+        file_path: str,
+        columns: list[str] | None = None,
+        batch_size: int = 65_536,
+        quantile_error: float = 0.01,
+        validate: bool = True,
+        ) -> tuple[dict[str, ColumnSummary], dict]:
+    """
+    Validate a Parquet file and summarize its numeric columns in one pass.
+
+    Each record batch is decoded once. Per column chunk the null count comes
+    from the Arrow validity bitmap and a single NaN mask serves both the
+    validation and the statistics (count, moments, min/max and the quantile
+    sketch), so no column is read twice and, unlike footer-only validation,
+    NaN values written by non-pandas writers are caught as well.
+
+    Args:
+        file_path (Path | str): Path to the Parquet file.
+        columns (list[str] | None): Columns to summarize. Defaults to all
+            numeric columns except `time` and `TO`.
+        batch_size (int): Maximum number of rows decoded at a time.
+        quantile_error (float): Target normalized rank error of the quantiles.
+        validate (bool): Check every data column for nulls/NaN and the file
+            for rows, raising on the first failure as `load_parquet_data` does.
+            Otherwise only the statistics columns are read and failures are
+            left to the caller via the report.
+
+    Returns:
+        tuple[dict[str, ColumnSummary], dict]: Mergeable summary per column
+        and a report with the number of `rows` and the `null_counts` (nulls
+        plus NaN) of every scanned column.
+
+    Raises:
+        ValueError: With `validate`, if the file has no rows or contains nulls.
+    """
+    file_path = Path(file_path)
+    parquet_file = pq.ParquetFile(file_path)
+    schema = parquet_file.schema_arrow
+    if columns is None:
+        columns = numeric_columns(schema)
+    scanned = list(columns)
+    if validate:
+        index_columns = pandas_index_columns(schema)
+        scanned += [name for name in schema.names if name not in index_columns and name not in columns]
+
+    summaries = {name: ColumnSummary(quantile_error) for name in columns}
+    null_counts = dict.fromkeys(scanned, 0)
+    rows = 0
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=scanned):
+        rows += batch.num_rows
+        for name in scanned:
+            array = batch.column(name)
+            if name in summaries:
+                # Nulls become NaN here, so one mask counts both
+                values = array.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+                nan = np.isnan(values)
+                missing = int(np.count_nonzero(nan))
+                summaries[name].update(values[~nan] if missing else values, nan_free=True)
+            else:
+                missing = array.null_count
+                if pa.types.is_floating(array.type):
+                    missing += pc.sum(pc.is_nan(array)).as_py() or 0
+            null_counts[name] += missing
+            if validate and missing:
+                LOGGER.warning(f"Column {name} of {file_path} contains null values.")
+                raise ValueError(f"The file {file_path} contains null values.")
+
+    if validate and rows == 0:
+        LOGGER.warning(f"The file {file_path} has no rows.")
+        raise ValueError(f"The file {file_path} contains no data.")
+
+    LOGGER.info(f"Fused validation and statistics computed for {len(columns)} columns of {file_path}")
+    return summaries, {"rows": rows, "null_counts": null_counts}
+
+
+def summaries_to_frame(summaries: dict[str, ColumnSummary]) -> pd.DataFrame:
+    """Lay out summaries like `DataFrame.describe()` (one column per input column)."""
+    return pd.DataFrame(
+        {name: summary.describe() for name, summary in summaries.items()},
+        index=STAT_INDEX,
+        dtype="float64",
+    )
+
+
+def merge_summaries(partials) -> dict[str, ColumnSummary]:
+    """
+    Merge partial summaries (e.g. one per file or per machine) column by column.
+
+    The inputs are not modified. Columns missing from some partials are
+    merged over the partials that have them.
+
+    Args:
+        partials (Iterable[dict[str, ColumnSummary]]): Partial summaries.
+
+    Returns:
+        dict[str, ColumnSummary]: Combined summary per column, in order of
+        first appearance.
+    """
+    merged = {}
+    for partial in partials:
+        for name, summary in partial.items():
+            if name not in merged:
+                merged[name] = ColumnSummary.from_dict(summary.to_dict())
+            else:
+                merged[name].merge(summary)
+    return merged
+
+
+def summaries_to_dict(summaries: dict[str, ColumnSummary]) -> dict:
+    """Serialize summaries to JSON-compatible dicts."""
+    return {name: summary.to_dict() for name, summary in summaries.items()}
+
+
+def summaries_from_dict(data: dict) -> dict[str, ColumnSummary]:
+    """Inverse of `summaries_to_dict`."""
+    return {name: ColumnSummary.from_dict(summary) for name, summary in data.items()}
+
+
+def save_summaries(summaries: dict[str, ColumnSummary], file_path: str) -> None:
+    """Write summaries to a JSON file so they can be merged elsewhere."""
+    with open(file_path, "w", encoding="utf-8") as fp:
+        json.dump(summaries_to_dict(summaries), fp)
+
+
+def load_summaries(file_path: str) -> dict[str, ColumnSummary]:
+    """Read summaries written by `save_summaries`."""
+    with open(file_path, "r", encoding="utf-8") as fp:
+        return summaries_from_dict(json.load(fp))
+
+
+def _file_partial(file_path, columns, batch_size, quantile_error) -> dict[str, ColumnSummary]:
+    """Validate one file and summarize it (runs in a worker process)."""
+    check_parquet_file(file_path)
+    validate_parquet_metadata(file_path)
+    return compute_streaming_statistics(file_path, columns, batch_size, quantile_error)
+
+
+def compute_file_partials(
+        files,
+        columns: list[str] | None = None,
+        batch_size: int = 65_536,
+        quantile_error: float = 0.01,
+        max_workers: int | None = None,
+        ) -> list[dict[str, ColumnSummary]]:
+    """
+    Validate and summarize each Parquet file in its own worker process.
+
+    Only the small per-file summaries travel back to the parent, so the work
+    scales with the number of cores.
+
+    Args:
+        files (Iterable[Path | str]): Parquet files to summarize.
+        columns (list[str] | None): Columns to summarize. Defaults to the
+            numeric columns of each file except `time` and `TO`.
+        batch_size (int): Maximum number of rows decoded at a time per worker.
+        quantile_error (float): Target normalized rank error of the quantiles.
+        max_workers (int | None): Worker processes. Defaults to the CPU count;
+            ``1`` runs in the current process.
+
+    Returns:
+        list[dict[str, ColumnSummary]]: One partial summary per file, in order.
+    """
+    files = [Path(f) for f in files]
+    if not files:
+        return []
+    max_workers = min(max_workers or os.cpu_count() or 1, len(files))
+    LOGGER.info(f"Computing statistics for {len(files)} files with {max_workers} workers")
+
+    args = ([columns] * len(files), [batch_size] * len(files), [quantile_error] * len(files))
+    if max_workers == 1:
+        return list(map(_file_partial, files, *args))
+
+    with process_pool(max_workers=max_workers) as executor:
+        return list(executor.map(_file_partial, files, *args))
+
+
+def compute_dataset_statistics(
+        files,
+        columns: list[str] | None = None,
+        batch_size: int = 65_536,
+        quantile_error: float = 0.01,
+        max_workers: int | None = None,
+        ) -> dict[str, ColumnSummary]:
+    """
+    Summarize many Parquet files in parallel and merge the partial results.
+
+    See `compute_file_partials` for the arguments.
+
+    Returns:
+        dict[str, ColumnSummary]: Merged summary per column.
+    """
+    partials = compute_file_partials(files, columns, batch_size, quantile_error, max_workers)
+    return merge_summaries(partials)
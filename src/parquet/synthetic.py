@@ -0,0 +1,89 @@
+"""
+Synthetic sensor data for tests and benchmarks.
+The generated frames follow the schema of `data/raw/training_data.csv`:
+`time` (epoch seconds), `TO` (integer id) and `sensorN_min`, `sensorN_max`,
+`sensorN_mean` columns with percent-scale values.
+
+`write_sensor_csv` and `write_sensor_parquet` stream the same data to disk
+in chunks, so files of 1e9 rows can be generated with bounded memory.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# First timestamp of data/raw/training_data.csv
+START_TIME = 1743532199
+
+
+def make_sensor_frame(
+        n_rows: int,
+        n_ids: int = 100,
+        n_sensors: int = 3,
+        step_seconds: int = 3600,
+        start_time: int = START_TIME,
+        seed: int | None = 0,
+        first_row: int = 0,
+        ) -> pd.DataFrame:
+    """
+    Generate a sensor DataFrame sorted by `time`.
+
+    Args:
+        n_rows (int): Number of rows.
+        n_ids (int): Number of distinct `TO` ids.
+        n_sensors (int): Number of sensors (three columns each).
+        step_seconds (int): Seconds between consecutive timestamps of one id.
+        start_time (int): Epoch seconds of the first row.
+        seed (int | None): Seed of the random generator.
+        first_row (int): Row number of the first row, to continue the `time`
+            and `TO` sequence of an earlier chunk.
+
+    Returns:
+        pd.DataFrame: Frame with `time`, `TO` and `sensorN_min/max/mean` columns.
+    """
+    rng = np.random.default_rng(seed)
+    ids = 10_540_000 + np.arange(n_ids, dtype=np.int64)
+    row = np.arange(first_row, first_row + n_rows, dtype=np.int64)
+    data = {
+        'time': start_time + (row // n_ids) * step_seconds,
+        'TO': ids[row % n_ids],
+    }
+    for sensor in range(1, n_sensors + 1):
+        low = np.round(rng.uniform(5, 60, n_rows), 2)
+        high = np.round(low + rng.uniform(0, 40, n_rows), 2)
+        data[f'sensor{sensor}_min'] = low
+        data[f'sensor{sensor}_max'] = high
+        data[f'sensor{sensor}_mean'] = np.round((low + high) / 2 + rng.normal(0, 1, n_rows), 2)
+    return pd.DataFrame(data)
+
+
+def iter_sensor_chunks(n_rows: int, chunk_rows: int = 1_000_000, seed: int = 0, **kwargs):
+    """
+    Yield `make_sensor_frame` chunks that together form one `n_rows` dataset.
+    Each chunk has its own seed derived from `seed` and its position.
+    """
+    for chunk, first_row in enumerate(range(0, n_rows, chunk_rows)):
+        yield make_sensor_frame(min(chunk_rows, n_rows - first_row), seed=seed + chunk,
+                                first_row=first_row, **kwargs)
+
+
+def write_sensor_csv(file_path, n_rows: int, chunk_rows: int = 1_000_000, **kwargs) -> None:
+    """Write `n_rows` of synthetic sensor data to a CSV file, one chunk at a time."""
+    with open(file_path, "w", encoding="utf-8", newline="") as fp:
+        for i, chunk in enumerate(iter_sensor_chunks(n_rows, chunk_rows, **kwargs)):
+            chunk.to_csv(fp, index=False, header=i == 0)
+
+
+def write_sensor_parquet(file_path, n_rows: int, chunk_rows: int = 1_000_000, **kwargs) -> None:
+    """Write `n_rows` of synthetic sensor data to Parquet, one row group per chunk."""
+    writer = None
+    try:
+        for chunk in iter_sensor_chunks(n_rows, chunk_rows, **kwargs):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(file_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
@@ -2,15 +2,107 @@
 Utility functions for anomaly detection module.
 This module sets up following:
     1) the logging configuration.
+    2) discovery of data files in a directory or glob pattern.
+    3) content hashing of data files.
+    4) atomic writes of JSON state files.
+    5) instrumentation: timed spans around pipeline stages, a metrics
+       registry (durations, rows, bytes read, peak memory) and exporters in
+       Prometheus text format or JSON. Spans cost one flag check while
+       instrumentation is disabled (the default, see `CONFIG_INSTRUMENTATION`).
+    6) lazy imports: `lazy_import` defers pandas, pyarrow and numpy until
+       their first use, so importing the package stays fast.
+
+This module imports only the standard library and reads the configuration
+on first use, never at import time.
 """
 
+import atexit
+import glob
+import hashlib
+import importlib
+import json
 import logging
-from parquet.config import get_config
+import os
+import resource
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+class _LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute access."""
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        # Copy the attributes over so later lookups bypass __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return `name` if it is already imported, otherwise a placeholder that
+    imports it when one of its attributes is first used.
+
+    Example:
+        pd = lazy_import("pandas")  # pandas is imported by the first pd.<attr>
+    """
+    return sys.modules.get(name) or _LazyModule(name)
+
+
+def _config():
+    """The package configuration, loaded on first use (pydantic is imported then)."""
+    from parquet.config import get_config
+
+    return get_config()
 
-CONFIG = get_config()
+# Attributes every LogRecord has; anything else was passed with `extra=`
+_LOG_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+_TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s -%(lineno)s - %(message)s'
 
 
-def setup_logger(name=__name__, level=logging.INFO) -> logging.Logger:
+class JsonFormatter(logging.Formatter):
+    """Format each log record as one JSON object, including `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        data.update({k: v for k, v in vars(record).items() if k not in _LOG_RECORD_FIELDS})
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class _ConfiguredFormatter(logging.Formatter):
+    """Text or JSON formatter chosen from the configuration when the first record is logged."""
+
+    def __init__(self):
+        super().__init__(_TEXT_FORMAT)
+        self._delegate = None
+
+    def format(self, record: logging.LogRecord) -> str:
+        if self._delegate is None:
+            json_format = _config().CONFIG_INSTRUMENTATION.log_format == "json"
+            self._delegate = JsonFormatter() if json_format else logging.Formatter(_TEXT_FORMAT)
+        return self._delegate.format(record)
+
+
+def setup_logger(name=__name__, level=logging.INFO, json_format: bool | None = None) -> logging.Logger:
+    """
+    Configure a logger with one stream handler.
+
+    `json_format` emits one JSON object per record; None follows
+    `CONFIG_INSTRUMENTATION.log_format`.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
@@ -18,7 +110,12 @@ def setup_logger(name=__name__, level=logging.INFO) -> logging.Logger:
     if logger.hasHandlers():
         logger.handlers.clear()
 
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s -%(lineno)s - %(message)s')
+    if json_format is None:
+        formatter = _ConfiguredFormatter()
+    elif json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(_TEXT_FORMAT)
 
     ch = logging.StreamHandler()
     ch.setLevel(level)
@@ -27,13 +124,278 @@ def setup_logger(name=__name__, level=logging.INFO) -> logging.Logger:
     logger.addHandler(ch)
     return logger
 
+
+def list_data_files(path_or_glob, suffix: str = ".parquet") -> list[Path]:
+    """
+    Resolve a file, a directory or a glob pattern to a sorted list of files.
+
+    Args:
+        path_or_glob (Path | str): A single file, a directory (searched
+            recursively for `suffix` files) or a glob pattern (``**`` allowed).
+        suffix (str): File suffix to keep when expanding a directory or glob.
+
+    Returns:
+        list[Path]: Matching files in sorted order.
+
+    Raises:
+        FileNotFoundError: If nothing matches.
+    """
+    path = Path(path_or_glob)
+    if path.is_file():
+        files = [path]
+    elif path.is_dir():
+        files = [p for p in path.rglob(f"*{suffix}") if p.is_file()]
+    else:
+        files = [Path(p) for p in glob.glob(str(path_or_glob), recursive=True)]
+        files = [p for p in files if p.is_file() and p.suffix == suffix]
+
+    if not files:
+        raise FileNotFoundError(f"No {suffix} files found for {path_or_glob}.")
+    return sorted(files)
+
+
+def file_sha256(file_path) -> str:
+    """SHA-256 of a file's content, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(data: dict, file_path) -> None:
+    """Write JSON atomically so an interrupted run leaves the old file intact."""
+    file_path = Path(file_path)
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=1)
+    os.replace(tmp_path, file_path)
+
+
+# Modules imported by the fork server of `process_pool` before it forks workers
+_FORKSERVER_PRELOAD = ["numpy", "pandas", "pyarrow", "pyarrow.parquet"]
+
+
+def process_pool(max_workers: int | None = None, **kwargs):
+    """
+    `ProcessPoolExecutor` whose workers are not forked from this process.
+
+    Forking a multithreaded process (the CLI daemon, prefetch threads) can
+    copy locks held by other threads into the child, so workers start from
+    a ``forkserver`` where the platform has one and are spawned otherwise.
+    The fork server imports numpy, pandas and pyarrow once, so its workers
+    start without importing them again.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(_FORKSERVER_PRELOAD)
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context, **kwargs)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Metrics:
+    """
+    Thread-safe registry of span metrics: call count, total and maximum
+    duration, rows and bytes read per span name, plus the peak RSS seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = {}
+        self.peak_rss_bytes = 0
+
+    def record(self, name: str, duration: float, rows: int | None = None, bytes_read: int | None = None,
+               peak_rss: int = 0) -> None:
+        with self._lock:
+            entry = self.spans.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                 "rows": 0, "bytes_read": 0})
+            entry["count"] += 1
+            entry["seconds"] += duration
+            entry["max_seconds"] = max(entry["max_seconds"], duration)
+            entry["rows"] += rows or 0
+            entry["bytes_read"] += bytes_read or 0
+            self.peak_rss_bytes = max(self.peak_rss_bytes, peak_rss)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self.peak_rss_bytes = 0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"spans": {k: dict(v) for k, v in self.spans.items()}, "peak_rss_bytes": self.peak_rss_bytes}
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = []
+        for metric, kind, field in (
+                ("parquet_span_seconds", "summary", None),
+                ("parquet_span_max_seconds", "gauge", "max_seconds"),
+                ("parquet_rows_total", "counter", "rows"),
+                ("parquet_bytes_read_total", "counter", "bytes_read")):
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, entry in sorted(data["spans"].items()):
+                if field is None:
+                    lines.append(f'{metric}_count{{span="{name}"}} {entry["count"]}')
+                    lines.append(f'{metric}_sum{{span="{name}"}} {entry["seconds"]:.6f}')
+                else:
+                    lines.append(f'{metric}{{span="{name}"}} {entry[field]}')
+        lines.append("# TYPE parquet_peak_rss_bytes gauge")
+        lines.append(f"parquet_peak_rss_bytes {data['peak_rss_bytes']}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+# None until the configuration is read by the first span or `enable_instrumentation`
+_INSTRUMENTATION = {"enabled": None, "outputs": False}
+_SPAN_LOGGER = logging.getLogger("parquet.spans")
+
+
+class Span:
+    """An open span; stages attach `rows`, `bytes_read` or other attributes with `set`."""
+
+    __slots__ = ("name", "attributes")
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    """Span handed out while instrumentation is disabled; ignores everything."""
+
+    __slots__ = ()
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _configure_outputs(config) -> None:
+    """
+    Give the span logger a handler at `config.span_log_level` and write the
+    metrics to `config.export_path` at interpreter exit, once per process.
+    """
+    if _INSTRUMENTATION["outputs"]:
+        return
+    setup_logger(_SPAN_LOGGER.name, config.span_log_level)
+    if config.export_path:
+        atexit.register(write_metrics, config.export_path, config.export_format)
+    _INSTRUMENTATION["outputs"] = True
+
+
+def _configure_instrumentation() -> bool:
+    """Read `CONFIG_INSTRUMENTATION` once: the enabled flag, the span logger and the exit-time exporter."""
+    config = _config().CONFIG_INSTRUMENTATION
+    _configure_outputs(config)
+    if _INSTRUMENTATION["enabled"] is None:
+        _INSTRUMENTATION["enabled"] = config.enabled
+    return _INSTRUMENTATION["enabled"]
+
+
+def instrumentation_enabled() -> bool:
+    enabled = _INSTRUMENTATION["enabled"]
+    return enabled if enabled is not None else _configure_instrumentation()
+
+
+def enable_instrumentation(enabled: bool = True) -> None:
+    """
+    Turn span recording on or off for this process.
+
+    Enabling also sets up the span logger and the exit-time exporter of
+    `CONFIG_INSTRUMENTATION.export_path`, as the first span would.
+    """
+    if enabled:
+        _configure_outputs(_config().CONFIG_INSTRUMENTATION)
+    _INSTRUMENTATION["enabled"] = enabled
+
+
+def span(name: str, **attributes):
+    """
+    Time a stage as a context manager yielding the span.
+
+    On exit the duration, `rows`, `bytes_read` and the peak RSS are added to
+    `METRICS` and a structured record is logged to the `parquet.spans`
+    logger at INFO level (see `CONFIG_INSTRUMENTATION.span_log_level`). While instrumentation is disabled a shared no-op
+    span is returned without any timing.
+
+    Example:
+        with span("parquet.read", file=str(path)) as s:
+            table = pq.read_table(path)
+            s.set(rows=table.num_rows)
+    """
+    enabled = _INSTRUMENTATION["enabled"]
+    if enabled is None:
+        enabled = _configure_instrumentation()
+    if not enabled:
+        return _NULL_SPAN
+    return _timed_span(name, attributes)
+
+
+@contextmanager
+def _timed_span(name: str, attributes: dict):
+    current = Span(name, attributes)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield current
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        peak = peak_rss_bytes()
+        attrs = current.attributes
+        METRICS.record(name, duration, attrs.get("rows"), attrs.get("bytes_read"), peak)
+        if _SPAN_LOGGER.isEnabledFor(logging.INFO):
+            _SPAN_LOGGER.info(f"{name} took {duration:.6f} s", extra={
+                "span": name, "duration_s": duration, "status": status, "peak_rss_bytes": peak, **attrs,
+            })
+
+
+def write_metrics(file_path, export_format: str = "prometheus") -> None:
+    """Write `METRICS` to a file as Prometheus text or JSON."""
+    if export_format == "prometheus":
+        content = METRICS.to_prometheus()
+    elif export_format == "json":
+        content = json.dumps(METRICS.to_dict(), indent=1)
+    else:
+        raise ValueError(f"Unknown metrics format {export_format!r}, expected 'prometheus' or 'json'.")
+    tmp_path = Path(str(file_path) + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, file_path)
+
+
 # LOGGER = setup_logger(__name__, logging.INFO)
 
 if __name__ == "__main__":
     from pathlib import Path
     print("current working directory:", Path.cwd())
     # If this module is run directly, set up the logger
-    CONFIG = get_config()
+    CONFIG = _config()
     print("Config level:", CONFIG.LOGLEVEL)
     setup_logger()
     LOGGER = logging.getLogger(__name__)
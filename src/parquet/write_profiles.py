@@ -0,0 +1,123 @@
+"""
+Write profiles for Parquet output.
+A profile bundles the writer settings that trade write speed, file size and
+scan speed against each other:
+
+    1) Compression codec and level (lz4, snappy, zstd).
+    2) Encodings: dictionary encoding for id/time columns and
+       `BYTE_STREAM_SPLIT` for float sensor columns, which groups the bytes
+       of each value so the codec compresses them better. Readings with few
+       distinct values (e.g. percentages with two decimals) compress better
+       with a dictionary, so ``"auto"`` picks per column from the data.
+    3) Sort order (`TO`, `time`), so the min/max statistics of each row group
+       and page cover narrow ranges and filtered reads skip most of the file.
+    4) Row-group and data page sizes.
+
+Profiles are selected by name (see `WRITE_PROFILES`) or passed as a
+`WriteProfile` instance.
+"""
+
+from typing import Literal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+# "auto" uses BYTE_STREAM_SPLIT for float columns with at least this many
+# distinct values per row; below it dictionary encoding yields smaller files.
+BSS_MIN_DISTINCT_RATIO = 0.1
+
+
+class WriteProfile(BaseModel):
+    """
+    Settings passed to `pyarrow.parquet` when writing a table.
+    """
+
+    compression: str = "snappy"  # Codec of every column
+    compression_level: int | None = None  # Codec level (zstd: 1-22), None for the codec default
+    byte_stream_split: bool | Literal["auto"] = False  # BYTE_STREAM_SPLIT for float columns instead of dictionary encoding
+    sort_by: tuple[str, ...] = ()  # Columns the rows are sorted by (ascending) before writing
+    row_group_size: int = 1_000_000  # Maximum rows per row group
+    data_page_size: int = 1024 * 1024  # Target bytes per data page
+    write_page_index: bool = False  # Page-level min/max index for finer pruning
+
+
+WRITE_PROFILES = {
+    # Cheapest codec, no sorting: minimal CPU per written row
+    "fast-write": WriteProfile(compression="lz4"),
+    # Strong zstd on sorted rows with the float encoding picked per column: smallest files
+    "small-files": WriteProfile(
+        compression="zstd", compression_level=9, byte_stream_split="auto", sort_by=("TO", "time"),
+    ),
+    # Sorted data in small row groups and pages with a page index: selective reads
+    "scan-optimized": WriteProfile(
+        compression="zstd", compression_level=3, byte_stream_split="auto", sort_by=("TO", "time"),
+        row_group_size=128 * 1024, data_page_size=64 * 1024, write_page_index=True,
+    ),
+}
+
+
+def get_write_profile(profile: str | WriteProfile) -> WriteProfile:
+    """Resolve a profile name to its `WriteProfile`."""
+    if isinstance(profile, WriteProfile):
+        return profile
+    if profile not in WRITE_PROFILES:
+        raise ValueError(f"Unknown write profile {profile!r}, expected one of {sorted(WRITE_PROFILES)}.")
+    return WRITE_PROFILES[profile]
+
+
+def writer_options(schema: pa.Schema, profile: str | WriteProfile, sample: pa.Table | None = None) -> dict:
+    """
+    Keyword arguments for `pq.write_table` / `pq.ParquetWriter` implementing
+    `profile` for a table with `schema`.
+
+    `sample` is data representative of the table (e.g. its first chunk) used
+    to choose the float encodings when ``byte_stream_split="auto"``. Without
+    it "auto" keeps dictionary encoding.
+    """
+    profile = get_write_profile(profile)
+    options = {
+        "compression": profile.compression,
+        "compression_level": profile.compression_level,
+        "data_page_size": profile.data_page_size,
+        "write_page_index": profile.write_page_index,
+    }
+    sort_by = [c for c in profile.sort_by if c in schema.names]
+    if sort_by:
+        options["sorting_columns"] = pq.SortingColumn.from_ordering(schema, [(c, "ascending") for c in sort_by])
+    if profile.byte_stream_split:
+        floats = [f.name for f in schema if pa.types.is_floating(f.type)]
+        if profile.byte_stream_split == "auto":
+            floats = [name for name in floats if sample is not None and _high_cardinality(sample.column(name))]
+        # Parquet allows only one of dictionary and an explicit encoding per column
+        options["use_dictionary"] = [f.name for f in schema if f.name not in floats]
+        options["column_encoding"] = {name: "BYTE_STREAM_SPLIT" for name in floats}
+    return options
+
+
+def _high_cardinality(column) -> bool:
+    if len(column) == 0:
+        return False
+    return pc.count_distinct(column).as_py() >= BSS_MIN_DISTINCT_RATIO * len(column)
+
+
+def sort_table(table: pa.Table, profile: str | WriteProfile) -> pa.Table:
+    """Sort `table` by the profile's sort columns that it contains."""
+    sort_by = [(c, "ascending") for c in get_write_profile(profile).sort_by if c in table.column_names]
+    return table.sort_by(sort_by) if sort_by else table
+
+
+def write_table_with_profile(table: pa.Table, parquet_path, profile: str | WriteProfile) -> None:
+    """
+    Sort `table` and write it to `parquet_path` with the settings of `profile`.
+
+    Args:
+        table (pa.Table): Table to write.
+        parquet_path (Path | str): Output Parquet file.
+        profile (str | WriteProfile): Profile name from `WRITE_PROFILES` or a profile.
+    """
+    profile = get_write_profile(profile)
+    table = sort_table(table, profile)
+    pq.write_table(table, parquet_path, row_group_size=profile.row_group_size,
+                   **writer_options(table.schema, profile, sample=table))
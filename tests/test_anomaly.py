@@ -0,0 +1,105 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.anomaly import (
+    anomaly_pipeline,
+    anomaly_scaling_report,
+    fit_isolation_forest,
+    sample_parquet_rows,
+    score_parquet_dataset,
+)
+from parquet.synthetic import make_sensor_frame
+
+MODEL_PARAMS = {"n_estimators": 50, "max_samples": "auto", "contamination": 0.01, "max_features": 1.0}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Two files with small row groups and a few extreme readings"""
+    folder = tmp_path / "data"
+    folder.mkdir()
+    df = make_sensor_frame(4000, n_ids=10)
+    df.loc[[100, 2500, 3900], df.columns.str.startswith('sensor')] = 1e6
+    pq.write_table(pa.Table.from_pandas(df.iloc[:2000], preserve_index=False), folder / "a.parquet",
+                   row_group_size=500)
+    pq.write_table(pa.Table.from_pandas(df.iloc[2000:], preserve_index=False), folder / "b.parquet",
+                   row_group_size=500)
+    return folder, df
+
+
+def test_sample_is_bounded_and_uniform(dataset):
+    folder, df = dataset
+    files = sorted(folder.glob("*.parquet"))
+    sample = sample_parquet_rows(files, ['time'], sample_size=1000, batch_size=300)
+    assert sample.shape == (1000, 1) and sample.dtype == np.float32
+    # Both files contribute about half of the sample
+    assert 350 < (sample[:, 0] < df['time'].iloc[2000]).sum() < 650
+    assert len(sample_parquet_rows(files, ['time'], sample_size=10_000)) == len(df)
+
+
+def test_scores_line_up_with_input(dataset, tmp_path):
+    folder, df = dataset
+    files = sorted(folder.glob("*.parquet"))
+    model, columns = fit_isolation_forest(files, sample_size=2000, model_params=MODEL_PARAMS)
+    assert 'time' not in columns and 'sensor1_max' in columns
+
+    report = score_parquet_dataset(files, tmp_path / "scores", model, columns, batch_size=256,
+                                   max_workers=2, task_rows=1000)
+    assert report['rows'] == len(df) and report['tasks'] == 4
+
+    scores = pd.read_parquet(tmp_path / "scores")
+    np.testing.assert_array_equal(scores['time'], df['time'])
+    expected = -model.score_samples(df[columns].to_numpy(np.float32))
+    np.testing.assert_allclose(scores['anomaly_score'], expected)
+    assert scores.loc[[100, 2500, 3900], 'is_anomaly'].all()
+    assert scores.loc[[100, 2500, 3900], 'anomaly_score'].min() > scores['anomaly_score'].quantile(0.95)
+
+
+def test_thread_executor_matches_process(dataset, tmp_path):
+    folder, _ = dataset
+    files = sorted(folder.glob("*.parquet"))
+    model, columns = fit_isolation_forest(files, sample_size=2000, model_params=MODEL_PARAMS)
+    score_parquet_dataset(files, tmp_path / "process", model, columns, max_workers=2)
+    score_parquet_dataset(files, tmp_path / "thread", model, columns, max_workers=2, executor="thread")
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "thread"), pd.read_parquet(tmp_path / "process"))
+    with pytest.raises(ValueError, match="Unknown executor"):
+        score_parquet_dataset(files, tmp_path / "x", model, columns, executor="gpu")
+
+
+def test_concurrent_thread_runs_keep_their_own_model(dataset, tmp_path):
+    folder, df = dataset
+    files = sorted(folder.glob("*.parquet"))
+    runs = [fit_isolation_forest(files, sample_size=2000, model_params=MODEL_PARAMS),
+            fit_isolation_forest(files, columns=['sensor1_min', 'sensor1_max'], sample_size=2000, seed=1,
+                                 model_params=MODEL_PARAMS)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for future in [pool.submit(score_parquet_dataset, files, tmp_path / f"run{i}", model, columns,
+                                   batch_size=128, max_workers=2, executor="thread", task_rows=500)
+                       for i, (model, columns) in enumerate(runs)]:
+            future.result()
+    for i, (model, columns) in enumerate(runs):
+        expected = -model.score_samples(df[columns].to_numpy(np.float32))
+        np.testing.assert_allclose(pd.read_parquet(tmp_path / f"run{i}")['anomaly_score'], expected)
+
+def test_pipeline_uses_config_and_rejects_nulls(dataset, tmp_path):
+    folder, df = dataset
+    report = anomaly_pipeline(folder, tmp_path / "scores", max_workers=1)
+    assert report['rows'] == len(df)
+    assert len(list((tmp_path / "scores").glob("part-*.parquet"))) == 2
+
+    df.loc[5, 'sensor2_min'] = np.nan
+    df.to_parquet(folder / "a.parquet")
+    with pytest.raises(ValueError, match="null values"):
+        anomaly_pipeline(folder / "a.parquet", tmp_path / "scores")
+
+
+def test_scaling_report(dataset):
+    folder, _ = dataset
+    rows = anomaly_scaling_report(folder, worker_counts=(1, 2), sample_size=1000, executor="thread",
+                                  task_rows=500)
+    assert [row['workers'] for row in rows] == [1, 2]
+    assert rows[0]['speedup'] == 1.0
+    assert all(row['rows_per_s'] > 0 and row['efficiency'] > 0 for row in rows)
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.async_loader import iter_parquet_many_async, load_parquet_many, load_parquet_many_async
+from parquet.synthetic import START_TIME, make_sensor_frame
+
+
+@pytest.fixture
+def daily_files(tmp_path):
+    """Creates ten small daily Parquet files"""
+    frames = []
+    for day in range(10):
+        df = make_sensor_frame(50, n_ids=5, start_time=START_TIME + day * 86400, seed=day)
+        df.to_parquet(tmp_path / f"day{day:02d}.parquet", index=False)
+        frames.append(df)
+    return tmp_path, frames
+
+
+def test_concatenates_in_input_order(daily_files):
+    folder, frames = daily_files
+    files = sorted(folder.glob("*.parquet"), reverse=True)
+    table = asyncio.run(load_parquet_many_async(files, columns=['time', 'sensor1_min'], max_concurrency=3))
+    expected = np.concatenate([f['time'].to_numpy() for f in reversed(frames)])
+    np.testing.assert_array_equal(table.column('time').to_numpy(), expected)
+    assert table.column_names == ['time', 'sensor1_min']
+
+
+def test_directory_and_filters(daily_files):
+    folder, frames = daily_files
+    target = int(frames[0]['TO'].iloc[0])
+    table = load_parquet_many(folder, filters=[('TO', '==', target)])
+    assert table.num_rows == 10 * 10
+    assert set(table.column('TO').to_pylist()) == {target}
+
+
+def test_async_iterator_yields_every_file(daily_files):
+    folder, _ = daily_files
+
+    async def collect():
+        return [(path.name, table.num_rows) async for path, table in iter_parquet_many_async(folder, max_concurrency=4)]
+
+    results = asyncio.run(collect())
+    assert sorted(name for name, _ in results) == [f"day{d:02d}.parquet" for d in range(10)]
+    assert all(rows == 50 for _, rows in results)
+
+
+def test_validation_error_is_raised(daily_files):
+    folder, frames = daily_files
+    broken = frames[0].copy()
+    broken.loc[3, 'sensor1_min'] = np.nan
+    pq.write_table(pa.Table.from_pandas(broken, preserve_index=False), folder / "day99.parquet")
+    with pytest.raises(ValueError, match="contains null values"):
+        load_parquet_many(folder, validation="metadata")
+
+
+def test_invalid_concurrency(daily_files):
+    folder, _ = daily_files
+    with pytest.raises(ValueError, match="max_concurrency"):
+        load_parquet_many(folder, max_concurrency=0)
@@ -0,0 +1,47 @@
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from parquet.benchmark import compare_results, main, run_suite
+from parquet.synthetic import make_sensor_frame, write_sensor_csv, write_sensor_parquet
+
+
+def test_chunked_writers_continue_the_sequence(tmp_path):
+    write_sensor_csv(tmp_path / "data.csv", 2500, chunk_rows=1000, n_ids=7)
+    write_sensor_parquet(tmp_path / "data.parquet", 2500, chunk_rows=1000, n_ids=7)
+    expected = make_sensor_frame(2500, n_ids=7)
+    for df in (pd.read_csv(tmp_path / "data.csv"), pd.read_parquet(tmp_path / "data.parquet")):
+        assert len(df) == 2500
+        np.testing.assert_array_equal(df['time'], expected['time'])
+        np.testing.assert_array_equal(df['TO'], expected['TO'])
+        assert (df['sensor2_max'] >= df['sensor2_min']).all()
+
+
+def test_run_suite_records_metrics(tmp_path):
+    suite = run_suite(2000, cases=['load_parquet_data', 'stats_pipeline_fused'], repeat=1, workdir=tmp_path)
+    assert suite['meta']['rows'] == 2000
+    assert set(suite['results']) == {'load_parquet_data', 'stats_pipeline_fused'}
+    for result in suite['results'].values():
+        assert result['wall_s'] > 0 and result['rows_per_s'] > 0 and result['mb_per_s'] > 0
+        assert result['peak_rss_mb'] > 10
+
+
+def test_run_suite_unknown_case():
+    with pytest.raises(ValueError, match="Unknown benchmark cases"):
+        run_suite(10, cases=['load_everything'])
+
+
+def _results(**walls):
+    return {"meta": {}, "results": {name: {"wall_s": wall, "peak_rss_mb": 100.0} for name, wall in walls.items()}}
+
+
+def test_compare_flags_regressions(tmp_path):
+    base, head = _results(a=1.0, b=1.0, c=1.0), _results(a=1.05, b=1.5, d=1.0)
+    rows = {row['case']: row for row in compare_results(base, head, threshold=0.1)}
+    assert set(rows) == {'a', 'b'}
+    assert not rows['a']['regression'] and rows['b']['regression']
+
+    (tmp_path / "base.json").write_text(json.dumps(base))
+    (tmp_path / "head.json").write_text(json.dumps(head))
+    assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "head.json")]) == 1
+    assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "base.json")]) == 0
@@ -0,0 +1,108 @@
+import pytest
+import os
+import pandas as pd
+from parquet.cache import ResultCache, cached_load_csv_data, cached_load_parquet_data, cached_stats_pipeline
+from parquet.config import get_config
+from parquet.synthetic import make_sensor_frame
+
+
+@pytest.fixture
+def sensor_files(tmp_path):
+    """Creates matching Parquet and CSV sensor files"""
+    df = make_sensor_frame(200, n_ids=4)
+    df.to_parquet(tmp_path / "training_data.parquet")
+    df.to_csv(tmp_path / "training_data.csv", index=False)
+    return tmp_path, df
+
+
+def test_memory_hit_and_invalidation_on_change(sensor_files):
+    folder, df = sensor_files
+    cache = ResultCache()
+    first = cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    second = cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    pd.testing.assert_frame_equal(first, second)
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Rewriting the file changes its identity, so the stale entry is not served
+    df.head(10).to_parquet(folder / "training_data.parquet")
+    os.utime(folder / "training_data.parquet", ns=(1, 1))
+    third = cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    assert len(third) == 10
+    assert cache.stats()["misses"] == 2
+
+
+def test_arguments_are_part_of_the_key(sensor_files):
+    folder, _ = sensor_files
+    cache = ResultCache()
+    full = cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    projected = cached_load_parquet_data(folder, "training_data.parquet", cache=cache, columns=["TO"])
+    assert list(projected.columns) == ["TO"] and len(full.columns) > 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_miss_returns_a_copy(sensor_files):
+    folder, df = sensor_files
+    cache = ResultCache()
+    first = cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    first.loc[0, 'sensor1_min'] = -1.0
+    second = cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    assert second.loc[0, 'sensor1_min'] == df.loc[0, 'sensor1_min']
+
+
+def test_config_defaults_are_part_of_the_key(sensor_files, monkeypatch):
+    folder, _ = sensor_files
+    cache = ResultCache()
+    assert cached_load_csv_data(folder, "training_data.csv", cache=cache)['sensor1_min'].dtype == 'float64'
+    monkeypatch.setattr(get_config().CONFIG_COMPACT, "enabled", True)
+    assert cached_load_csv_data(folder, "training_data.csv", cache=cache)['sensor1_min'].dtype == 'float32'
+    assert cache.stats()["misses"] == 2
+
+
+def test_disk_tier_survives_new_cache(sensor_files, tmp_path):
+    folder, _ = sensor_files
+    disk = tmp_path / "cache"
+    expected = cached_load_csv_data(folder, "training_data.csv", cache=ResultCache(disk_dir=disk))
+    cache = ResultCache(disk_dir=disk)
+    result = cached_load_csv_data(folder, "training_data.csv", cache=cache)
+    pd.testing.assert_frame_equal(result, expected)
+    assert cache.stats()["disk_hits"] == 1
+    # Served from memory afterwards
+    cached_load_csv_data(folder, "training_data.csv", cache=cache)
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_memory_budget_evicts_lru(sensor_files):
+    folder, _ = sensor_files
+    cache = ResultCache(memory_bytes=30_000)
+    cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    cached_load_csv_data(folder, "training_data.csv", cache=cache)
+    stats = cache.stats()
+    assert stats["evictions"] >= 1 and stats["memory_bytes"] <= 30_000
+
+
+def test_invalidate_by_path(sensor_files, tmp_path):
+    folder, _ = sensor_files
+    cache = ResultCache(disk_dir=tmp_path / "cache")
+    cached_load_parquet_data(folder, "training_data.parquet", cache=cache)
+    cached_load_csv_data(folder, "training_data.csv", cache=cache)
+    assert cache.invalidate(folder / "training_data.csv") == 2  # memory + disk
+    assert cache.stats()["memory_entries"] == 1
+    assert cache.invalidate() == 2
+
+
+def test_cached_stats_pipeline_writes_csv(sensor_files, tmp_path):
+    folder, _ = sensor_files
+    out = tmp_path / "out"
+    out.mkdir()
+    cache = ResultCache()
+    expected = cached_stats_pipeline(folder, out, cache=cache)
+    (out / "statistics.csv").unlink()
+    result = cached_stats_pipeline(folder, out, cache=cache)
+    pd.testing.assert_frame_equal(result, expected)
+    assert (out / "statistics.csv").exists()
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cached_load_parquet_data(tmp_path, "missing.parquet", cache=ResultCache())
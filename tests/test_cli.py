@@ -0,0 +1,116 @@
+import json
+import threading
+import pytest
+import pandas as pd
+from pathlib import Path
+from parquet.cli import ParquetDaemon, main, submit
+
+RAW_CSV = Path(__file__).parents[1] / "data" / "raw" / "training_data.csv"
+
+
+@pytest.fixture
+def parquet_folder(tmp_path):
+    assert main(['convert', str(RAW_CSV), str(tmp_path / 'training_data.parquet')]) == 0
+    return tmp_path
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = ParquetDaemon(tmp_path / 'parquet.sock', workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _run(capsys, argv):
+    code = main(argv)
+    captured = capsys.readouterr()
+    return code, captured
+
+
+def test_convert_and_inspect(parquet_folder, capsys):
+    capsys.readouterr()
+    code, captured = _run(capsys, ['inspect', str(parquet_folder / 'training_data.parquet')])
+    result = json.loads(captured.out)
+    assert code == 0
+    assert result['rows'] == len(pd.read_csv(RAW_CSV))
+    assert {c['name'] for c in result['columns']} >= {'time', 'TO'}
+
+
+def test_validate_reports_errors(tmp_path, capsys):
+    code, captured = _run(capsys, ['validate', str(tmp_path / 'missing.parquet')])
+    assert code == 1
+    assert 'error:' in captured.err
+
+
+def test_stats_writes_csv(parquet_folder, capsys):
+    code, captured = _run(capsys, ['stats', str(parquet_folder), '--output', str(parquet_folder),
+                                   '--engine', 'fused', '--no-cache'])
+    assert code == 0
+    assert (parquet_folder / 'statistics.csv').exists()
+    assert 'sensor1_min' in json.loads(captured.out)['statistics']
+
+
+def test_daemon_runs_jobs(daemon, parquet_folder):
+    socket_path = daemon.socket_path
+    assert submit(socket_path, 'ping')['jobs'] == 0
+    result = submit(socket_path, 'validate', {'path': str(parquet_folder / 'training_data.parquet')})
+    assert result['valid'] and result['rows'] > 0
+    assert submit(socket_path, 'ping')['jobs'] == 1
+    with pytest.raises(RuntimeError, match="FileNotFoundError"):
+        submit(socket_path, 'validate', {'path': str(parquet_folder / 'missing.parquet')})
+    with pytest.raises(RuntimeError, match="Unknown command"):
+        submit(socket_path, 'compact')
+
+
+def test_daemon_counts_concurrent_jobs(daemon, parquet_folder):
+    args = {'path': str(parquet_folder / 'training_data.parquet')}
+    threads = [threading.Thread(target=submit, args=(daemon.socket_path, 'validate', args)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert submit(daemon.socket_path, 'ping')['jobs'] == 8
+
+
+def test_daemon_replies_with_strict_json(daemon, tmp_path):
+    pd.DataFrame({'time': [1], 'TO': [7], 'sensor1_min': [1.5]}).to_parquet(tmp_path / 'training_data.parquet')
+    result = submit(daemon.socket_path, 'stats', {'input_path': str(tmp_path), 'output': str(tmp_path),
+                                                  'engine': 'pandas', 'cache': False})
+    assert result['statistics']['sensor1_min']['std'] is None  # NaN for a single row
+
+
+def test_daemon_runs_process_pool_jobs(daemon, tmp_path):
+    (tmp_path / 'landing').mkdir()
+    for i in range(2):
+        pd.read_csv(RAW_CSV).to_csv(tmp_path / 'landing' / f'drop{i}.csv', index=False)
+    result = submit(daemon.socket_path, 'convert', {'source': str(tmp_path / 'landing'),
+                                                    'output': str(tmp_path / 'dataset'),
+                                                    'dataset': True, 'max_workers': 2})
+    assert result['total']['rows'] == 2 * len(pd.read_csv(RAW_CSV))
+
+
+def test_cli_submits_to_daemon(daemon, parquet_folder, capsys):
+    code, captured = _run(capsys, ['inspect', str(parquet_folder / 'training_data.parquet'),
+                                   '--socket', daemon.socket_path])
+    assert code == 0
+    assert json.loads(captured.out)['row_groups'] >= 1
+
+
+def test_anomaly_command(parquet_folder, capsys):
+    code, captured = _run(capsys, ['anomaly', str(parquet_folder), str(parquet_folder / 'scores'),
+                                   '--executor', 'thread', '--max-workers', '1'])
+    assert code == 0
+    assert json.loads(captured.out)['rows'] == len(pd.read_csv(RAW_CSV))
+    assert 'anomaly_score' in pd.read_parquet(parquet_folder / 'scores').columns
+
+
+def test_features_command(parquet_folder, capsys):
+    code, captured = _run(capsys, ['features', str(parquet_folder / 'training_data.parquet'),
+                                   str(parquet_folder / 'features.parquet'), '--windows', '1D'])
+    assert code == 0
+    assert 'sensor1_min_mean_1D' in json.loads(captured.out)['columns']
+    assert len(pd.read_parquet(parquet_folder / 'features.parquet')) == len(pd.read_csv(RAW_CSV))
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import pandas as pd
+from parquet.compact import REPORT_COLUMNS, compact_frame, downcast_float, downcast_integer, memory_report
+from parquet.load_csv import load_csv_data
+from parquet.load_parquet import load_parquet_data
+from parquet.synthetic import make_sensor_frame
+
+
+@pytest.fixture
+def sensor_frame():
+    """Sensor frame with two-decimal readings, like data/raw/training_data.csv"""
+    df = make_sensor_frame(2000, n_ids=5)
+    sensors = df.columns.str.startswith('sensor')
+    df.loc[:, sensors] = df.loc[:, sensors].round(2).astype('float64')
+    return df
+
+
+def test_compact_frame_downcasts_and_reports(sensor_frame):
+    df = sensor_frame.astype({'time': 'int64', 'TO': 'int64'})
+    compacted, report = compact_frame(df)
+    assert list(report.columns) == REPORT_COLUMNS
+    assert list(report.index) == list(df.columns)
+    assert isinstance(compacted['TO'].dtype, pd.CategoricalDtype)
+    assert compacted['time'].dtype == np.int32
+    assert (compacted['time'].diff().dropna() >= 0).all() and compacted['time'].diff(-1).min() < 0
+    assert (compacted.filter(like='sensor').dtypes == np.float32).all()
+    assert (report['bytes_after'] < report['bytes_before']).all()
+    assert report['saved'].sum() == (df.memory_usage(index=False, deep=True).sum()
+                                     - compacted.memory_usage(index=False, deep=True).sum())
+    # Values are kept within the tolerance and the input frame is untouched
+    np.testing.assert_allclose(compacted.filter(like='sensor'), df.filter(like='sensor'), rtol=1e-6)
+    np.testing.assert_array_equal(compacted['TO'].astype('int64'), df['TO'])
+    assert (df.dtypes.drop(['time', 'TO']) == np.float64).all()
+
+
+def test_float_downcast_respects_tolerance():
+    precise = pd.Series([1.0, 1 + 1e-9, np.nan, np.inf])
+    assert downcast_float(precise).dtype == np.float32
+    assert downcast_float(precise, tolerance=1e-12).dtype == np.float64
+    assert downcast_float(pd.Series([1e300])).dtype == np.float64  # out of float32 range
+
+
+def test_integer_downcast_and_unchanged_columns():
+    assert downcast_integer(pd.Series([-5, 100])).dtype == np.int8
+    assert downcast_integer(pd.Series([0, 70_000])).dtype == np.int32
+    assert downcast_integer(pd.Series([0, 70_000]), allow_unsigned=True).dtype == np.uint32
+    assert downcast_integer(pd.Series([0, 200])).dtype == np.int16
+    assert downcast_integer(pd.Series([-(2 ** 40), 0])).dtype == np.int64
+    df = pd.DataFrame({'name': [f'id{i}' for i in range(100)], 'flag': [True] * 100,
+                       'site': ['a', 'b'] * 50})
+    compacted, report = compact_frame(df)
+    # Unique strings stay strings, booleans are kept, repeated strings become categories
+    assert compacted['name'].dtype == df['name'].dtype
+    assert compacted['flag'].dtype == bool and report.loc['flag', 'saved'] == 0
+    assert isinstance(compacted['site'].dtype, pd.CategoricalDtype)
+
+
+def test_loaders_compact_on_request(sensor_frame, tmp_path):
+    sensor_frame.to_csv(tmp_path / 'training_data.csv', index=False)
+    sensor_frame.to_parquet(tmp_path / 'training_data.parquet', index=False)
+    csv = load_csv_data(tmp_path, 'training_data.csv', compact=True)
+    parquet = load_parquet_data(tmp_path, 'training_data.parquet', compact=True)
+    pd.testing.assert_frame_equal(csv, parquet)
+    assert csv['sensor1_min'].dtype == np.float32
+    report = memory_report(parquet)
+    assert list(report.columns) == REPORT_COLUMNS and list(report.index) == list(sensor_frame.columns)
+    assert report.loc['sensor1_min', 'dtype_after'] == 'float32'
+    uncompacted = load_parquet_data(tmp_path, 'training_data.parquet')
+    assert uncompacted['sensor1_min'].dtype == np.float64 and memory_report(uncompacted) is None
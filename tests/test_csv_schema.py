@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.config import ConfigParametersCsvSchema
+from parquet.csv_schema import iter_csv_typed, read_csv_typed, typed_csv_schema
+from parquet.csv_to_parquet import csv_to_parquet
+from parquet.load_csv import load_csv_data
+from parquet.load_training_data import load_csv_data as load_training_csv
+from parquet.synthetic import make_sensor_frame
+
+
+@pytest.fixture
+def sensor_csv(tmp_path):
+    """Creates a sensor CSV file"""
+    df = make_sensor_frame(500, n_ids=5)
+    file_path = tmp_path / "training_data.csv"
+    df.to_csv(file_path, index=False)
+    return file_path, df
+
+
+def test_declared_types(sensor_csv):
+    file_path, df = sensor_csv
+    table = read_csv_typed(file_path, ConfigParametersCsvSchema())
+    assert table.schema.field('time').type == pa.timestamp('s')
+    assert pa.types.is_dictionary(table.schema.field('TO').type)
+    assert table.schema.field('sensor1_min').type == pa.float32()
+    assert table.schema == typed_csv_schema(df.columns, ConfigParametersCsvSchema())
+
+    result = table.to_pandas()
+    assert (result['time'] == pd.to_datetime(df['time'], unit='s')).all()
+    assert list(result['TO'].astype('int64')) == list(df['TO'])
+    np.testing.assert_allclose(result['sensor2_mean'], df['sensor2_mean'], rtol=1e-6)
+
+
+def test_column_overrides(sensor_csv):
+    file_path, df = sensor_csv
+    config = ConfigParametersCsvSchema(columns={'sensor1_min': 'float64', 'time': 'int64'}, value_dtype='float64')
+    table = read_csv_typed(file_path, config)
+    assert table.schema.field('time').type == pa.int64()
+    assert table.column('sensor1_min').to_pylist() == df['sensor1_min'].tolist()
+
+
+def test_streaming_blocks(sensor_csv):
+    file_path, df = sensor_csv
+    batches = list(iter_csv_typed(file_path, ConfigParametersCsvSchema(block_size=4096, use_threads=False)))
+    assert len(batches) > 1
+    assert sum(b.num_rows for b in batches) == len(df)
+
+
+@pytest.mark.parametrize("loader", [load_csv_data, load_training_csv])
+def test_load_csv_data_typed(sensor_csv, loader):
+    file_path, df = sensor_csv
+    result = loader(file_path.parent, file_path.name, typed=True)
+    assert result.shape == df.shape
+    assert result['sensor1_max'].dtype == np.float32
+    assert isinstance(result['TO'].dtype, pd.CategoricalDtype)
+    assert loader(file_path.parent, file_path.name, typed=False)['TO'].dtype == np.int64
+
+
+def test_load_csv_data_typed_rejects_nulls(tmp_path):
+    file_path = tmp_path / "nulls.csv"
+    file_path.write_text("time,TO,sensor1_min\n1743532199,1,\n")
+    with pytest.raises(ValueError, match="contains null values"):
+        load_csv_data(tmp_path, "nulls.csv", typed=True)
+
+
+def test_csv_to_parquet_typed(tmp_path, sensor_csv):
+    file_path, df = sensor_csv
+    out = tmp_path / "typed.parquet"
+    csv_to_parquet(file_path, out, typed=True, row_group_size=100)
+    metadata = pq.ParquetFile(out).metadata
+    assert metadata.num_rows == len(df)
+    assert metadata.num_row_groups == 5
+    assert pq.read_schema(out).field('sensor3_max').type == pa.float32()
@@ -0,0 +1,161 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+from parquet.csv_to_parquet import convert_csv_dataset, csv_to_parquet, csv_to_parquet_streaming
+from parquet.synthetic import START_TIME, make_sensor_frame
+
+RAW_CSV = Path(__file__).parents[1] / "data" / "raw" / "training_data.csv"
+
+
+@pytest.fixture
+def mixed_csv_file(tmp_path):
+    """Creates a CSV whose column types only settle after the first rows"""
+    csv_path = tmp_path / "mixed.csv"
+    lines = ["time,TO,value,label"]
+    lines += [f"{i},{i % 3},{i},a{i}" for i in range(50)]
+    lines += [f"{i},{i % 3},{i}.5,b{i}" for i in range(50, 100)]
+    csv_path.write_text("\n".join(lines) + "\n")
+    return csv_path
+
+
+def test_streaming_matches_eager(tmp_path):
+    eager = tmp_path / "eager.parquet"
+    streamed = tmp_path / "streamed.parquet"
+    csv_to_parquet(RAW_CSV, eager)
+    n_rows = csv_to_parquet_streaming(RAW_CSV, streamed, row_group_size=10)
+
+    expected = pd.read_parquet(eager)
+    result = pd.read_parquet(streamed)
+    assert n_rows == len(expected)
+    pd.testing.assert_frame_equal(result, expected)
+    assert pq.read_schema(streamed).equals(pq.read_schema(eager), check_metadata=True)
+    assert pq.ParquetFile(streamed).metadata.num_row_groups == -(-n_rows // 10)
+
+
+def test_streaming_resolves_dtypes_across_chunks(tmp_path, mixed_csv_file):
+    eager = tmp_path / "eager.parquet"
+    streamed = tmp_path / "streamed.parquet"
+    csv_to_parquet(mixed_csv_file, eager)
+    csv_to_parquet(mixed_csv_file, streamed, streaming=True, row_group_size=16)
+
+    result = pd.read_parquet(streamed)
+    assert result["value"].dtype == "float64"
+    pd.testing.assert_frame_equal(result, pd.read_parquet(eager))
+
+
+@pytest.mark.parametrize("late_rows", [
+    [f"{i},x{i}" for i in range(50, 60)],  # numeric column holding a string later
+    [f"{i},s{i}" if i % 7 == 0 else f"{i}," for i in range(50, 60)],  # sparse strings after an empty chunk
+])
+def test_streaming_resolves_late_strings(tmp_path, late_rows):
+    csv_path = tmp_path / "late.csv"
+    early = [f"{i},{i}" if "x" in late_rows[0] else f"{i}," for i in range(50)]
+    csv_path.write_text("\n".join(["time,note"] + early + late_rows) + "\n")
+    eager = tmp_path / "eager.parquet"
+    streamed = tmp_path / "streamed.parquet"
+    csv_to_parquet(csv_path, eager)
+    csv_to_parquet(csv_path, streamed, streaming=True, row_group_size=16)
+
+    assert pq.read_schema(streamed).field("note").type == pq.read_schema(eager).field("note").type
+    pd.testing.assert_frame_equal(pd.read_parquet(streamed), pd.read_parquet(eager))
+
+
+@pytest.mark.parametrize("late_rows", [
+    [f"{i}," for i in range(48, 64)],  # a chunk of empty values only
+    [f"{i},True" if i % 3 else f"{i}," for i in range(48, 64)],  # booleans with some empty values
+])
+def test_streaming_keeps_booleans_with_nulls(tmp_path, late_rows):
+    csv_path = tmp_path / "flags.csv"
+    early = [f"{i},{i % 2 == 0}" for i in range(48)]
+    csv_path.write_text("\n".join(["time,flag"] + early + late_rows) + "\n")
+    eager = tmp_path / "eager.parquet"
+    streamed = tmp_path / "streamed.parquet"
+    csv_to_parquet(csv_path, eager)
+    csv_to_parquet(csv_path, streamed, streaming=True, row_group_size=16)
+
+    assert pq.read_schema(streamed).field("flag").type == pa.bool_()
+    assert pq.read_schema(streamed).equals(pq.read_schema(eager), check_metadata=True)
+    pd.testing.assert_frame_equal(pd.read_parquet(streamed), pd.read_parquet(eager))
+
+def test_streaming_memory_ceiling_limits_row_groups(tmp_path):
+    streamed = tmp_path / "streamed.parquet"
+    csv_to_parquet_streaming(RAW_CSV, streamed, row_group_size=1000, max_memory_bytes=2048)
+    metadata = pq.ParquetFile(streamed).metadata
+    assert metadata.num_row_groups > 1
+    assert all(metadata.row_group(i).num_rows < 1000 for i in range(metadata.num_row_groups))
+
+
+def test_streaming_requires_pyarrow(tmp_path):
+    with pytest.raises(ValueError, match="pyarrow"):
+        csv_to_parquet(RAW_CSV, tmp_path / "out.parquet", engine="fastparquet", streaming=True)
+
+
+@pytest.fixture
+def csv_drops(tmp_path):
+    """Creates three daily CSV drops; the second one has float-only values"""
+    folder = tmp_path / "landing"
+    folder.mkdir()
+    frames = []
+    for day in range(3):
+        df = make_sensor_frame(240, n_ids=3, step_seconds=900, start_time=START_TIME + day * 86400, seed=day)
+        if day != 1:
+            df['sensor1_min'] = df['sensor1_min'].round().astype('int64')
+        df.to_csv(folder / f"drop{day}.csv", index=False)
+        frames.append(df)
+    return folder, pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("partition_by", [("TO",), ("TO", "date"), ("date",)])
+def test_convert_csv_dataset_partitions(tmp_path, csv_drops, partition_by):
+    folder, expected = csv_drops
+    out = tmp_path / "dataset"
+    report = convert_csv_dataset(folder, out, partition_by=partition_by, max_workers=2, row_group_size=50)
+
+    assert report['total']['rows'] == len(expected)
+    assert len(report['files']) == 3
+    assert sum(w['rows'] for w in report['workers'].values()) == len(expected)
+    assert all(f['rows_per_s'] > 0 and f['mb_per_s'] > 0 for f in report['files'])
+
+    top_level = {p.name.split('=')[0] for p in out.iterdir()}
+    assert top_level == {partition_by[0]}
+    table = ds.dataset(out, format='parquet', partitioning='hive').to_table()
+    assert table.num_rows == len(expected)
+    assert table.schema.field('sensor1_min').type == 'double'
+    result = table.to_pandas().sort_values(['time', 'TO']).reset_index(drop=True)
+    expected = expected.sort_values(['time', 'TO']).reset_index(drop=True)
+    np.testing.assert_allclose(result['sensor1_min'].astype(float), expected['sensor1_min'])
+    if 'date' in partition_by:
+        days = pd.to_datetime(expected['time'], unit='s').dt.date
+        assert list(result['date'].astype(str)) == list(days.astype(str))
+
+
+def test_convert_csv_dataset_target_file_size(tmp_path, csv_drops):
+    folder, _ = csv_drops
+    out = tmp_path / "dataset"
+    convert_csv_dataset(folder, out, partition_by=("TO",), max_workers=1, target_file_size=2_000)
+    files = list(out.rglob("*.parquet"))
+    assert len(files) > 9  # more than one file per source and partition
+    assert all(pq.ParquetFile(f).metadata.num_rows <= 2_000 // 80 + 1 for f in files)
+
+
+def test_convert_csv_dataset_same_name_in_subdirectories(tmp_path):
+    frames = []
+    for seed, sub in enumerate(["a", "b"]):
+        (tmp_path / "landing" / sub).mkdir(parents=True)
+        df = make_sensor_frame(60, n_ids=3, seed=seed)
+        df.to_csv(tmp_path / "landing" / sub / "x.csv", index=False)
+        frames.append(df)
+    out = tmp_path / "dataset"
+    report = convert_csv_dataset(tmp_path / "landing", out, partition_by=("TO",), max_workers=2)
+
+    assert report['total']['rows'] == 120
+    table = ds.dataset(out, format='parquet', partitioning='hive').to_table()
+    assert table.num_rows == 120
+    assert len(list(out.rglob("*.parquet"))) == 6  # one file per source and id
+    expected = pd.concat(frames).sort_values(['time', 'TO', 'sensor1_min'], ignore_index=True)
+    result = table.to_pandas().sort_values(['time', 'TO', 'sensor1_min'], ignore_index=True)
+    np.testing.assert_allclose(result['sensor1_min'], expected['sensor1_min'])
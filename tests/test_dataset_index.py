@@ -0,0 +1,110 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.dataset_index import (
+    INDEX_FILE,
+    BloomFilter,
+    build_dataset_index,
+    load_indexed_rows,
+    query_dataset_index,
+)
+from parquet.synthetic import START_TIME, make_sensor_frame
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Creates four daily files; each holds 4 of 16 ids in row groups of one id"""
+    folder = tmp_path / "dataset"
+    folder.mkdir()
+    frames = []
+    for day in range(4):
+        df = make_sensor_frame(96, n_ids=4, step_seconds=3600, start_time=START_TIME + day * 86400, seed=day)
+        df['TO'] += 4 * day
+        df = df.sort_values(['TO', 'time'], ignore_index=True)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), folder / f"day{day}.parquet", row_group_size=24)
+        frames.append(df)
+    return folder, pd.concat(frames, ignore_index=True)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    values = np.arange(1000, dtype=np.int64) * 7
+    bloom = BloomFilter.for_capacity(len(values), fpp=0.01)
+    bloom.add(values)
+    assert all(bloom.might_contain(v) for v in values)
+    false_positives = sum(bloom.might_contain(v) for v in range(1, 7000, 7))
+    assert false_positives < 30
+    assert BloomFilter.from_dict(bloom.to_dict()).might_contain(values[5])
+
+
+def test_query_selects_matching_row_groups(dataset):
+    folder, df = dataset
+    index, report = build_dataset_index(folder)
+    assert len(report['added']) == 4
+    assert (folder / INDEX_FILE).exists()
+
+    target = int(df['TO'].iloc[30])
+    matches = query_dataset_index(index, id_value=target)
+    expected_file = f"day{(target - df['TO'].min()) // 4}.parquet"
+    assert list(matches) == [expected_file]
+    assert len(matches[expected_file]) == 1
+    assert query_dataset_index(index, id_value=1) == {}
+
+    times = sorted(df['time'].unique())
+    matches = query_dataset_index(index, ranges={'time': (times[0], times[10])})
+    assert list(matches) == ["day0.parquet"]
+
+
+def test_load_indexed_rows(dataset):
+    folder, df = dataset
+    target = int(df['TO'].iloc[100])
+    low = int(df['time'].iloc[100])
+    result = load_indexed_rows(folder, id_value=target, ranges={'time': (low, None)}, columns=['time', 'sensor1_min'])
+    expected = df[(df['TO'] == target) & (df['time'] >= low)][['time', 'sensor1_min']].reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
+    assert load_indexed_rows(folder, id_value=1).empty
+
+
+def test_load_indexed_rows_with_hive_partition_key(tmp_path):
+    folder = tmp_path / "partitioned"
+    df = make_sensor_frame(4000, n_ids=8)
+    pq.write_to_dataset(pa.Table.from_pandas(df, preserve_index=False), folder, partition_cols=['TO'])
+    assert 'TO' not in pq.read_schema(next(folder.rglob('*.parquet'))).names
+
+    target = int(df['TO'].iloc[3])
+    index, _ = build_dataset_index(folder)
+    assert len(query_dataset_index(index, id_value=target)) == 1
+    result = load_indexed_rows(folder, id_value=target, columns=['time', 'TO'])
+    expected = df.loc[df['TO'] == target, ['time', 'TO']].reset_index(drop=True)
+    assert len(result) == 500
+    pd.testing.assert_frame_equal(result, expected)
+    with pytest.raises(ValueError, match="partition keys"):
+        load_indexed_rows(folder, ranges={'site': (1, 2)})
+
+
+def test_incremental_update(dataset):
+    folder, df = dataset
+    build_dataset_index(folder)
+    extra = make_sensor_frame(10, n_ids=1, start_time=START_TIME + 10 * 86400).assign(TO=42)
+    extra.to_parquet(folder / "day9.parquet", index=False)
+    (folder / "day1.parquet").unlink()
+
+    index, report = build_dataset_index(folder)
+    assert report['added'] == ["day9.parquet"]
+    assert report['removed'] == ["day1.parquet"]
+    assert len(report['unchanged']) == 3
+    assert list(query_dataset_index(index, id_value=42)) == ["day9.parquet"]
+
+
+def test_timestamp_ranges_and_missing_statistics(tmp_path):
+    df = make_sensor_frame(50, n_ids=5).assign(time=lambda d: pd.to_datetime(d['time'], unit='s'))
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path / "a.parquet", write_statistics=False)
+
+    index, _ = build_dataset_index(tmp_path)
+    assert index['files']['a.parquet']['ranges']['time'] == [None, None]
+    index, _ = build_dataset_index(tmp_path, scan_pages=True)
+    low, high = index['files']['a.parquet']['ranges']['time']
+    assert high > low
+    assert query_dataset_index(index, ranges={'time': (df['time'].max() + pd.Timedelta('1D'), None)}) == {}
+    assert query_dataset_index(index, ranges={'time': (df['time'].max(), None)}) == {'a.parquet': [0]}
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.grouped_stats import compute_grouped_statistics, time_bucket
+from parquet.stats_compute import grouped_stats_pipeline
+from parquet.streaming_stats import STAT_INDEX
+from parquet.synthetic import make_sensor_frame
+
+
+@pytest.fixture
+def sensor_frame():
+    """Synthetic sensor data with one missing value"""
+    df = make_sensor_frame(3000, n_ids=4, step_seconds=1800)
+    df.loc[7, 'sensor1_min'] = np.nan
+    return df
+
+
+def _expected(df, keys, column):
+    return df.groupby(keys)[column].describe()
+
+
+def test_grouped_by_to_matches_pandas(sensor_frame):
+    table = pa.Table.from_pandas(sensor_frame, preserve_index=False)
+    result = compute_grouped_statistics(table, by=('TO',)).to_pandas()
+    assert list(result.columns) == ['TO', 'column'] + STAT_INDEX
+    for column in ('sensor1_min', 'sensor3_mean'):
+        got = result[result['column'] == column].set_index('TO')[STAT_INDEX]
+        pd.testing.assert_frame_equal(got, _expected(sensor_frame, 'TO', column), rtol=1e-9, check_names=False)
+
+
+def test_grouped_by_to_and_day_matches_pandas(sensor_frame):
+    table = pa.Table.from_pandas(sensor_frame, preserve_index=False)
+    result = compute_grouped_statistics(table, by=('TO',), bucket='day').to_pandas()
+    df = sensor_frame.assign(time_bucket=pd.to_datetime(sensor_frame['time'] // 86400 * 86400, unit='s'))
+    got = result[result['column'] == 'sensor1_min'].set_index(['TO', 'time_bucket'])[STAT_INDEX]
+    expected = _expected(df, ['TO', 'time_bucket'], 'sensor1_min')
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-9)
+    assert got.index.tolist() == expected.index.tolist()
+
+
+def test_week_buckets_start_on_monday():
+    # 2025-04-02 (Wednesday) and 2025-04-06 (Sunday) fall in the week of Monday 2025-03-31
+    times = pa.chunked_array([[1743552000, 1743897600, 1743984000]])
+    starts = pd.to_datetime(time_bucket(times, 'week'), unit='s')
+    assert [str(d.date()) for d in starts] == ['2025-03-31', '2025-03-31', '2025-04-07']
+
+
+def test_unknown_bucket():
+    with pytest.raises(ValueError, match="Unknown time bucket"):
+        time_bucket(pa.chunked_array([[0]]), 'month')
+
+
+def test_grouped_stats_pipeline_writes_parquet(tmp_path, sensor_frame):
+    sensor_frame.dropna().to_parquet(tmp_path / 'data.parquet')
+    stats = grouped_stats_pipeline(tmp_path / 'data.parquet', tmp_path, by=(), bucket='hour')
+    written = pq.read_table(tmp_path / 'grouped_statistics.parquet')
+    # Parquet has no second-resolution timestamps, so time_bucket comes back as ms
+    assert written.cast(stats.schema).equals(stats)
+    assert written.column_names[0] == 'time_bucket'
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+import pytest
+
+ENTRY_MODULES = [
+    'parquet.util',
+    'parquet.load_parquet',
+    'parquet.load_csv',
+    'parquet.csv_to_parquet',
+    'parquet.stats_compute',
+    'parquet.load_training_data',
+]
+# Generous ceiling for the package's own import time; pandas alone takes ~500 ms
+IMPORT_BUDGET_MS = 250
+
+
+def _import_in_subprocess(code):
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          check=True, capture_output=True, text=True)
+
+
+@pytest.mark.parametrize('module', ENTRY_MODULES)
+def test_heavy_dependencies_load_lazily(module):
+    code = (f"import sys, {module}; "
+            "print(','.join(m for m in ('numpy', 'pandas', 'pyarrow', 'pydantic') if m in sys.modules))")
+    assert _import_in_subprocess(code).stdout.strip() == ''
+
+
+def test_import_time_budget():
+    result = _import_in_subprocess('import ' + ', '.join(ENTRY_MODULES))
+    # Top-level entries ("| parquet.x", without nesting indent) carry the cumulative time
+    total_us = sum(
+        int(line.split('|')[1]) for line in result.stderr.splitlines()
+        if line.startswith('import time:') and line.rsplit('|', 1)[1].startswith(' parquet.')
+    )
+    assert total_us / 1000 < IMPORT_BUDGET_MS
+
+
+def test_lazy_module_loads_on_first_attribute():
+    code = ("import sys; from parquet.util import lazy_import; pd = lazy_import('pandas'); "
+            "before = 'pandas' in sys.modules; pd.DataFrame; print(before, 'pandas' in sys.modules)")
+    assert _import_in_subprocess(code).stdout.strip() == 'False True'
@@ -0,0 +1,106 @@
+import json
+import logging
+import pytest
+from pathlib import Path
+from parquet.load_parquet import load_parquet_data
+from parquet.stats_compute import stats_pipeline
+import parquet.util
+from parquet.config import get_config
+from parquet.util import METRICS, JsonFormatter, enable_instrumentation, span, write_metrics
+
+PROCESSED = Path(__file__).parents[1] / "data" / "processed"
+
+
+@pytest.fixture
+def instrumentation():
+    """Enables instrumentation on a clean registry for one test"""
+    METRICS.reset()
+    enable_instrumentation(True)
+    yield METRICS
+    enable_instrumentation(False)
+    METRICS.reset()
+
+
+def test_loader_and_pipeline_spans(tmp_path, instrumentation):
+    df = load_parquet_data(PROCESSED, "training_data.parquet")
+    stats_pipeline(PROCESSED, tmp_path, engine='pandas')
+    spans = instrumentation.to_dict()['spans']
+    for name in ('parquet.check', 'parquet.read', 'parquet.null_check', 'parquet.decode',
+                 'stats.load', 'stats.describe', 'stats.write_csv'):
+        assert spans[name]['count'] >= 1
+    assert spans['parquet.read']['rows'] == 2 * len(df)
+    assert spans['parquet.read']['bytes_read'] == 2 * (PROCESSED / "training_data.parquet").stat().st_size
+    assert instrumentation.peak_rss_bytes > 0
+
+
+def test_span_records_errors_and_logs_json(instrumentation, caplog):
+    with pytest.raises(ValueError):
+        with span("stage", file="a.parquet") as s:
+            s.set(rows=5)
+            raise ValueError("boom")
+    record = caplog.records[-1]
+    assert record.status == "error" and record.rows == 5
+    data = json.loads(JsonFormatter().format(record))
+    assert data['span'] == "stage" and data['file'] == "a.parquet" and data['level'] == "INFO"
+    assert instrumentation.to_dict()['spans']['stage']['rows'] == 5
+
+
+def test_span_records_reach_the_log(instrumentation, capsys, monkeypatch):
+    logger = logging.getLogger("parquet.spans")
+    monkeypatch.setattr(logger, "handlers", [])
+    monkeypatch.setattr(logger, "level", logger.level)
+    monkeypatch.setitem(parquet.util._INSTRUMENTATION, "outputs", False)
+    # Enabling instrumentation sets up the handler, no log level is raised here
+    enable_instrumentation(True)
+    load_parquet_data(PROCESSED, "training_data.parquet")
+    err = capsys.readouterr().err
+    assert "parquet.spans" in err and "parquet.read took" in err
+
+def test_disabled_spans_record_nothing():
+    METRICS.reset()
+    # One shared no-op span: no timer, no allocation per call
+    assert span("a") is span("b", file="x")
+    for _ in range(1000):
+        with span("noop") as s:
+            s.set(rows=1)
+    assert METRICS.to_dict()['spans'] == {}
+
+
+@pytest.mark.parametrize("export_format", ["prometheus", "json"])
+def test_write_metrics(tmp_path, instrumentation, export_format):
+    with span("parquet.read") as s:
+        s.set(rows=10, bytes_read=100)
+    out = tmp_path / "metrics.txt"
+    write_metrics(out, export_format)
+    text = out.read_text()
+    if export_format == "prometheus":
+        assert 'parquet_span_seconds_count{span="parquet.read"} 1' in text
+        assert 'parquet_bytes_read_total{span="parquet.read"} 100' in text
+        assert "# TYPE parquet_peak_rss_bytes gauge" in text
+    else:
+        assert json.loads(text)['spans']['parquet.read']['rows'] == 10
+    with pytest.raises(ValueError, match="Unknown metrics format"):
+        write_metrics(out, "xml")
+
+
+def test_enable_instrumentation_registers_the_exporter(tmp_path, monkeypatch):
+    out = tmp_path / "metrics.json"
+    monkeypatch.setattr(get_config().CONFIG_INSTRUMENTATION, "export_path", str(out))
+    monkeypatch.setattr(get_config().CONFIG_INSTRUMENTATION, "export_format", "json")
+    monkeypatch.setitem(parquet.util._INSTRUMENTATION, "outputs", False)
+    registered = []
+    monkeypatch.setattr(parquet.util.atexit, "register", lambda *args: registered.append(args))
+    METRICS.reset()
+    try:
+        # No span has run yet, the exporter must still be in place
+        enable_instrumentation(True)
+        enable_instrumentation(True)
+        assert len(registered) == 1
+        with span("test.stage"):
+            pass
+    finally:
+        enable_instrumentation(False)
+    func, *args = registered[0]
+    func(*args)
+    assert json.loads(out.read_text())["spans"]["test.stage"]["count"] == 1
+    METRICS.reset()
@@ -1,7 +1,9 @@
 import pytest
 import pandas as pd
 from pathlib import Path
-from parquet.load_parquet import load_parquet_data
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.load_parquet import iter_parquet_batches, load_parquet_data, load_parquet_table, validate_parquet_metadata
 import os
 
 # Fixtures and temp files
@@ -66,3 +68,112 @@ def test_unreadable_file(tmp_path):
     finally:
         # Reset permissions to allow cleanup
         os.chmod(unreadable, 0o644)
+
+@pytest.fixture
+def sensor_parquet_file(tmp_path):
+    """Creates a Parquet file with one row group per TO, nulls only in TO=2"""
+    df = pd.DataFrame({
+        'time': [1, 2, 3, 4, 5, 6],
+        'TO': [1, 1, 2, 2, 3, 3],
+        'sensor1_min': [0.1, 0.2, None, 0.4, 0.5, 0.6],
+        'sensor1_max': [1.1, 1.2, 1.3, 1.4, 1.5, 1.6],
+    })
+    file_path = tmp_path / "sensors.parquet"
+    df.to_parquet(file_path, row_group_size=2)
+    return tmp_path, "sensors.parquet"
+
+def test_columns_projection(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    df = load_parquet_data(folder, fname, columns=['time', 'sensor1_max'])
+    assert list(df.columns) == ['time', 'sensor1_max']
+    assert len(df) == 6
+
+def test_filters_skip_rows_with_nulls(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    df = load_parquet_data(folder, fname, filters=[('TO', '==', 3)])
+    assert df['TO'].tolist() == [3, 3]
+    df = load_parquet_data(folder, fname, filters=[('time', '<', 3)])
+    assert df['time'].tolist() == [1, 2]
+
+def test_filters_with_nulls_in_selection(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    with pytest.raises(ValueError, match="contains null values"):
+        load_parquet_data(folder, fname, filters=[('TO', '==', 2)])
+
+def test_filters_matching_nothing(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    with pytest.raises(ValueError, match="contains no data"):
+        load_parquet_data(folder, fname, columns=['TO'], filters=[('TO', '>', 10)])
+
+def test_metadata_validation_valid(sample_parquet_file):
+    folder, fname = sample_parquet_file
+    assert validate_parquet_metadata(folder / fname) == 2
+    df = load_parquet_data(folder, fname, validation="metadata")
+    assert df.shape == (2, 2)
+
+def test_metadata_validation_empty(empty_parquet_file):
+    folder, fname = empty_parquet_file
+    with pytest.raises(ValueError, match="contains no data"):
+        validate_parquet_metadata(folder / fname)
+
+def test_metadata_validation_nulls(null_parquet_file):
+    folder, fname = null_parquet_file
+    with pytest.raises(ValueError, match="contains null values"):
+        load_parquet_data(folder, fname, validation="metadata")
+
+def test_metadata_validation_projection(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    assert validate_parquet_metadata(folder / fname, columns=['TO', 'sensor1_max']) == 6
+    with pytest.raises(ValueError, match="contains null values"):
+        validate_parquet_metadata(folder / fname)
+
+def test_metadata_validation_without_statistics(tmp_path):
+    pd.DataFrame({'A': [1.0, None]}).to_parquet(tmp_path / "nostats.parquet", write_statistics=False)
+    pd.DataFrame({'A': [1.0, 2.0]}).to_parquet(tmp_path / "clean.parquet", write_statistics=False)
+    with pytest.raises(ValueError, match="contains null values"):
+        validate_parquet_metadata(tmp_path / "nostats.parquet")
+    assert validate_parquet_metadata(tmp_path / "clean.parquet") == 2
+
+def test_unknown_validation_mode(sample_parquet_file):
+    folder, fname = sample_parquet_file
+    with pytest.raises(ValueError, match="Unknown validation mode"):
+        load_parquet_data(folder, fname, validation="fast")
+
+def test_load_parquet_table(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    table = load_parquet_table(folder, fname, columns=['TO', 'sensor1_max'], memory_map=True)
+    assert isinstance(table, pa.Table)
+    assert table.shape == (6, 2)
+    with pytest.raises(ValueError, match="contains null values"):
+        load_parquet_table(folder, fname)
+
+def test_arrow_validation_catches_nan(tmp_path):
+    # Written by pyarrow directly, NaN is a value rather than a null
+    pq.write_table(pa.table({'A': pa.array([1.0, float('nan')], from_pandas=False)}), tmp_path / "nan.parquet")
+    with pytest.raises(ValueError, match="contains null values"):
+        load_parquet_table(tmp_path, "nan.parquet")
+
+def test_pyarrow_dtype_backend(sample_parquet_file):
+    folder, fname = sample_parquet_file
+    df = load_parquet_data(folder, fname, dtype_backend="pyarrow")
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    expected = load_parquet_data(folder, fname)
+    pd.testing.assert_frame_equal(df.astype(expected.dtypes.to_dict()), expected)
+
+def test_loaded_frame_is_writable(sample_parquet_file):
+    folder, fname = sample_parquet_file
+    df = load_parquet_data(folder, fname)
+    df.loc[0, 'A'] = 999
+    assert df.loc[0, 'A'] == 999
+    zero_copy = load_parquet_data(folder, fname, zero_copy=True)
+    pd.testing.assert_frame_equal(zero_copy, load_parquet_data(folder, fname))
+    with pytest.raises(ValueError, match="read-only"):
+        zero_copy.loc[0, 'A'] = 999
+
+def test_iter_parquet_batches(sensor_parquet_file):
+    folder, fname = sensor_parquet_file
+    batches = list(iter_parquet_batches(folder, fname, columns=['time'], batch_size=4))
+    assert sum(b.num_rows for b in batches) == 6
+    assert all(b.num_rows <= 4 for b in batches)
+    with pytest.raises(ValueError, match="contains null values"):
+        list(iter_parquet_batches(folder, fname, batch_size=2))
@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+import pandas as pd
+from parquet.config import get_config
+from parquet.load_training_data import iter_rolling_features, iter_training_batches, rolling_features_to_parquet
+from parquet.synthetic import make_sensor_frame
+
+FEATURES = ['sensor1_min', 'sensor1_max', 'sensor1_mean']
+
+
+@pytest.fixture
+def training_parquet_file(tmp_path):
+    """Creates a Parquet file with several row groups and a row id feature"""
+    df = make_sensor_frame(1000, n_ids=5, n_sensors=1)
+    df['sensor1_min'] = np.arange(1000, dtype=np.float64)
+    df.to_parquet(tmp_path / "train.parquet", row_group_size=128)
+    return tmp_path, "train.parquet", df
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_sequential_batches(training_parquet_file, prefetch):
+    folder, fname, df = training_parquet_file
+    batches = list(iter_training_batches(folder, fname, batch_size=64, prefetch=prefetch))
+    assert [len(b) for b in batches] == [64] * 15 + [40]
+    assert batches[0].shape == (64, 3) and batches[0].dtype == np.float32
+    np.testing.assert_array_equal(np.concatenate(batches), df[FEATURES].to_numpy(np.float32))
+
+
+def test_default_batch_size_from_config(training_parquet_file):
+    folder, fname, _ = training_parquet_file
+    first = next(iter_training_batches(folder, fname))
+    assert len(first) == get_config().CONFIG_AUTO_ENCODER.batch_size
+
+
+def test_shuffled_epochs_cover_every_row(training_parquet_file):
+    folder, fname, _ = training_parquet_file
+    batches = list(iter_training_batches(
+        folder, fname, batch_size=50, epochs=2, shuffle=True, shuffle_buffer_size=200, seed=1,
+    ))
+    assert all(len(b) == 50 for b in batches)
+    ids = np.concatenate(batches)[:, 0]
+    first, second = ids[:1000], ids[1000:]
+    assert sorted(first) == list(range(1000)) and sorted(second) == list(range(1000))
+    assert not np.array_equal(first, np.arange(1000))
+    assert not np.array_equal(first, second)
+
+
+def test_drop_last(training_parquet_file):
+    folder, fname, _ = training_parquet_file
+    batches = list(iter_training_batches(folder, fname, batch_size=64, drop_last=True, epochs=2))
+    assert len(batches) == 30 and all(len(b) == 64 for b in batches)
+
+
+def test_nulls_raise_through_prefetch(tmp_path):
+    df = pd.DataFrame({'sensor1_mean': [1.0, None, 3.0]})
+    df.to_parquet(tmp_path / "nulls.parquet")
+    with pytest.raises(ValueError, match="contains null values"):
+        list(iter_training_batches(tmp_path, "nulls.parquet", batch_size=2, prefetch=2))
+
+
+def test_early_stop_releases_producer(training_parquet_file):
+    folder, fname, _ = training_parquet_file
+    batches = iter_training_batches(folder, fname, batch_size=8, epochs=100, prefetch=1)
+    next(batches)
+    batches.close()
+
+
+def _pandas_rolling(df, window, columns):
+    """Reference features from pandas groupby().rolling(), aligned with the rows of `df`"""
+    frame = df.assign(ts=pd.to_datetime(df['time'], unit='s'))
+    rolled = frame.groupby('TO').rolling(window, on='ts')[columns].agg(['mean', 'std', 'min', 'max'])
+    rolled.columns = [f'{name}_{stat}_{window}' for name, stat in rolled.columns]
+    # Single-row windows have a std of 0 instead of NaN
+    return frame[['TO', 'ts']].join(rolled, on=['TO', 'ts']).drop(columns=['TO', 'ts']).fillna(0)
+
+
+@pytest.mark.parametrize("layout", ["by_time", "by_to"])
+def test_rolling_features_match_pandas_across_batches(tmp_path, layout):
+    df = make_sensor_frame(3000, n_ids=7, n_sensors=1, step_seconds=600)
+    if layout == "by_to":
+        df = df.sort_values(['TO', 'time'], kind='stable', ignore_index=True)
+    df.to_parquet(tmp_path / "train.parquet", index=False)
+    report = rolling_features_to_parquet(tmp_path, "train.parquet", tmp_path / "features" / "train.parquet",
+                                         windows=("1h", "3h"), batch_size=250, row_group_size=500)
+    assert report['rows'] == len(df) and len(report['columns']) == 2 * 4 * len(FEATURES)
+
+    features = pd.read_parquet(tmp_path / "features" / "train.parquet")
+    pd.testing.assert_frame_equal(features[df.columns], df)
+    for window in ("1h", "3h"):
+        expected = _pandas_rolling(df, window, FEATURES)
+        assert (features[expected.columns].dtypes == np.float32).all()
+        np.testing.assert_allclose(features[expected.columns], expected, rtol=1e-5)
+
+    # The feature table feeds the batch loaders directly
+    batch = next(iter_training_batches(tmp_path / "features", "train.parquet", batch_size=100))
+    assert batch.shape == (100, len(FEATURES) * 9)
+
+
+def test_rolling_features_single_group_and_validation(tmp_path):
+    df = pd.DataFrame({'time': [0, 10, 20, 40, 100], 'value': [3.0, 1.0, 2.0, 5.0, 4.0]})
+    df.to_parquet(tmp_path / "series.parquet")
+    batches = iter_rolling_features(tmp_path, "series.parquet", windows=(30,), stats=('min', 'mean'),
+                                    group_column=None, batch_size=2, dtype='float64')
+    features = pd.concat([batch.to_pandas() for batch in batches], ignore_index=True)
+    assert features['value_min_30s'].tolist() == [3.0, 1.0, 1.0, 2.0, 4.0]
+    assert features['value_mean_30s'].tolist() == [3.0, 2.0, 2.0, 3.5, 4.0]
+
+    df.iloc[::-1].to_parquet(tmp_path / "reversed.parquet")
+    with pytest.raises(ValueError, match="not sorted by time"):
+        list(iter_rolling_features(tmp_path, "reversed.parquet", windows=(30,), group_column=None, batch_size=2))
+    with pytest.raises(ValueError, match="Unknown rolling statistics"):
+        list(iter_rolling_features(tmp_path, "series.parquet", stats=('median',)))
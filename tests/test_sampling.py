@@ -0,0 +1,124 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.sampling import CI_INDEX, approximate_statistics, sample_parquet_table, stratified_sample_table
+from parquet.stats_compute import stats_pipeline
+from parquet.streaming_stats import STAT_INDEX
+from parquet.synthetic import make_sensor_frame
+
+
+@pytest.fixture
+def sensor_file(tmp_path):
+    """40 row groups of 1000 rows"""
+    df = make_sensor_frame(40_000, n_ids=20)
+    file_path = tmp_path / "training_data.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), file_path, row_group_size=1000)
+    return file_path, df
+
+
+def test_uniform_sample_reads_a_subset_of_row_groups(sensor_file):
+    file_path, df = sensor_file
+    sample = sample_parquet_table(file_path, sample_size=3000, max_row_groups=5, seed=1)
+    assert sample.num_rows == 3000
+    assert sample.column_names == list(df.columns)
+    times = sample.column('time').to_numpy()
+    assert np.all(np.diff(times) >= 0)  # file order is kept
+    # Rows come from exactly the 5 decoded row groups
+    row_groups = (np.searchsorted(df['time'].to_numpy(), times, side='right') - 1) // 1000
+    assert len(np.unique(row_groups)) == 5
+
+
+def test_uniform_sample_without_row_group_limit_is_uniform(sensor_file):
+    file_path, df = sensor_file
+    sample = sample_parquet_table(file_path, sample_size=4000, max_row_groups=None, columns=['time'])
+    positions = np.searchsorted(df['time'].to_numpy(), sample.column('time').to_numpy())
+    assert sample.column_names == ['time']
+    assert 1700 < (positions < 20_000).sum() < 2300
+    assert sample_parquet_table(file_path, sample_size=10 ** 6).num_rows == len(df)
+
+
+def test_stratified_sample_covers_every_stratum(sensor_file):
+    file_path, df = sensor_file
+    sample = stratified_sample_table(file_path, per_stratum=50, by=('TO',), max_row_groups=None)
+    counts = sample.to_pandas()['TO'].value_counts()
+    assert set(counts.index) == set(df['TO'])
+    assert (counts == 50).all()
+    weights = sample.to_pandas().groupby('TO')['sample_weight'].sum()
+    pd.testing.assert_series_equal(weights, df['TO'].value_counts().sort_index().astype(float), check_names=False)
+
+
+def test_stratified_sample_by_time_bucket(sensor_file):
+    file_path, df = sensor_file
+    sample = stratified_sample_table(file_path, per_stratum=5, by=(), bucket='week', columns=['sensor1_min'],
+                                     max_row_groups=None).to_pandas()
+    n_weeks = pd.Series(pd.to_datetime(df['time'], unit='s')).dt.to_period('W').nunique()
+    assert list(sample.columns) == ['sensor1_min', 'sample_weight']
+    assert len(sample) == 5 * n_weeks
+    assert sample['sample_weight'].sum() == pytest.approx(len(df))
+    with pytest.raises(ValueError, match="at least one key"):
+        stratified_sample_table(file_path, by=())
+
+
+def test_approximate_statistics_cover_the_exact_values(sensor_file):
+    file_path, df = sensor_file
+    stats = approximate_statistics(file_path, sample_size=5000, max_row_groups=10)
+    exact = df.drop(columns=['time', 'TO']).describe()
+    assert list(stats.index) == STAT_INDEX + CI_INDEX
+    assert list(stats.columns) == list(exact.columns)
+    # count, min and max come from the footer statistics
+    pd.testing.assert_frame_equal(stats.loc[['count', 'min', 'max']], exact.loc[['count', 'min', 'max']])
+    for label in ('mean', '25%', '50%', '75%'):
+        low, high = stats.loc[f'{label}_ci_low'], stats.loc[f'{label}_ci_high']
+        assert (low <= stats.loc[label]).all() and (stats.loc[label] <= high).all()
+        # 95% intervals: allow one miss among the sensor columns
+        assert ((low <= exact.loc[label]) & (exact.loc[label] <= high)).sum() >= len(exact.columns) - 1
+
+
+
+def test_approximate_statistics_read_each_footer_once(tmp_path, monkeypatch):
+    df = make_sensor_frame(4000, n_ids=4)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # A nested column ahead of the sensors shifts their Parquet leaf indices
+    nested = pa.array([{'a': i, 'b': -i} for i in range(len(df))])
+    table = table.add_column(0, 'nested', nested)
+    for part in range(3):
+        pq.write_table(table, tmp_path / f'part-{part}.parquet', row_group_size=500)
+    calls = []
+    read_metadata = pq.read_metadata
+    monkeypatch.setattr(pq, 'read_metadata', lambda path, **kw: calls.append(path) or read_metadata(path, **kw))
+    stats = approximate_statistics(tmp_path, sample_size=1000, max_row_groups=4)
+    assert len(calls) == 3
+    exact = df.drop(columns=['time', 'TO']).describe()
+    pd.testing.assert_frame_equal(stats.loc[['min', 'max']], exact.loc[['min', 'max']])
+    assert (stats.loc['count'] == 3 * exact.loc['count']).all()
+
+
+def test_sample_is_unbiased_with_unequal_row_groups(tmp_path):
+    # 64 row groups of 1000 zeros and 64 row groups of 100 ones
+    for name, value, rows in (('large', 0.0, 1000), ('small', 1.0, 100)):
+        table = pa.table({'value': np.full(64 * rows, value)})
+        pq.write_table(table, tmp_path / f'{name}.parquet', row_group_size=rows)
+    truth = 6400 / 70400
+    means, estimates, covered = [], [], 0
+    for seed in range(100):
+        sample = sample_parquet_table(tmp_path, sample_size=2000, max_row_groups=32, seed=seed)
+        assert sample.num_rows == 2000
+        means.append(np.mean(sample.column('value').to_numpy()))
+        stats = approximate_statistics(tmp_path, sample_size=2000, max_row_groups=32, seed=seed)['value']
+        estimates.append(stats['mean'])
+        covered += stats['mean_ci_low'] <= truth <= stats['mean_ci_high']
+    # Ratio estimates over 32 of 128 row groups: unbiased up to O(1/32)
+    assert abs(np.mean(means) - truth) < 0.01
+    assert abs(np.mean(estimates) - truth) < 0.01
+    assert covered >= 88
+
+def test_stats_pipeline_sample_engine(sensor_file, tmp_path):
+    file_path, df = sensor_file
+    stats = stats_pipeline(file_path.parent, tmp_path, engine='sample', sample_size=2000)
+    assert 'mean_ci_low' in stats.index
+    written = pd.read_csv(tmp_path / 'statistics.csv', index_col=0)
+    pd.testing.assert_frame_equal(written, stats, check_exact=False)
+    with pytest.raises(ValueError, match="'sample'"):
+        stats_pipeline(file_path.parent, tmp_path, engine='exact')
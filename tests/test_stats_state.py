@@ -0,0 +1,84 @@
+import pytest
+import os
+import pandas as pd
+from parquet.stats_state import load_manifest, update_statistics_state
+from parquet.stats_compute import stats_pipeline
+from parquet.synthetic import make_sensor_frame
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Creates a folder with two daily Parquet files"""
+    folder = tmp_path / "processed"
+    folder.mkdir()
+    for day in range(2):
+        make_sensor_frame(500, n_ids=5, seed=day).to_parquet(folder / f"day{day}.parquet")
+    return folder
+
+
+def _expected(folder):
+    df = pd.concat([pd.read_parquet(f) for f in sorted(folder.glob("*.parquet"))])
+    return df.drop(columns=['time', 'TO']).describe()
+
+
+def _compare(summaries, expected):
+    for name, summary in summaries.items():
+        stats = summary.describe()
+        assert stats['count'] == expected.loc['count', name]
+        assert stats['mean'] == pytest.approx(expected.loc['mean', name])
+        assert stats['std'] == pytest.approx(expected.loc['std', name])
+        assert stats['max'] == expected.loc['max', name]
+
+
+def test_incremental_add_change_remove(dataset, tmp_path):
+    state = tmp_path / "state"
+    files = lambda: sorted(dataset.glob("*.parquet"))
+
+    summaries, report = update_statistics_state(files(), state, max_workers=1)
+    assert len(report['added']) == 2
+    _compare(summaries, _expected(dataset))
+
+    # Nothing changed: no file is read again
+    summaries, report = update_statistics_state(files(), state, max_workers=1)
+    assert len(report['unchanged']) == 2 and not report['added']
+
+    # A new day arrives
+    make_sensor_frame(300, n_ids=5, seed=9).to_parquet(dataset / "day2.parquet")
+    summaries, report = update_statistics_state(files(), state, max_workers=1)
+    assert [os.path.basename(f) for f in report['added']] == ["day2.parquet"]
+    _compare(summaries, _expected(dataset))
+
+    # A day is rewritten, another removed
+    make_sensor_frame(200, n_ids=5, seed=11).to_parquet(dataset / "day0.parquet")
+    (dataset / "day1.parquet").unlink()
+    summaries, report = update_statistics_state(files(), state, max_workers=1)
+    assert len(report['changed']) == 1 and len(report['removed']) == 1
+    _compare(summaries, _expected(dataset))
+    assert len(list((state / "partials").glob("*.json"))) == 2
+
+
+def test_touched_file_is_not_recomputed(dataset, tmp_path):
+    state = tmp_path / "state"
+    update_statistics_state(sorted(dataset.glob("*.parquet")), state, max_workers=1)
+    os.utime(dataset / "day0.parquet", ns=(0, 0))
+    _, report = update_statistics_state(sorted(dataset.glob("*.parquet")), state, max_workers=1)
+    assert len(report['unchanged']) == 2
+    assert load_manifest(state)['files'][str((dataset / "day0.parquet").resolve())]['mtime_ns'] == 0
+
+
+def test_settings_change_rebuilds(dataset, tmp_path):
+    state = tmp_path / "state"
+    update_statistics_state(sorted(dataset.glob("*.parquet")), state, max_workers=1)
+    summaries, report = update_statistics_state(
+        sorted(dataset.glob("*.parquet")), state, quantile_error=0.05, max_workers=1,
+    )
+    assert len(report['added']) == 2
+    _compare(summaries, _expected(dataset))
+
+
+def test_stats_pipeline_incremental(dataset, tmp_path):
+    stats = stats_pipeline(dataset, tmp_path, incremental=True, max_workers=1)
+    assert (tmp_path / 'statistics_state' / 'manifest.json').exists()
+    assert stats.loc['count', 'sensor1_mean'] == 1000
+    with pytest.raises(ValueError, match="Incremental statistics use"):
+        stats_pipeline(dataset, tmp_path, engine='fused', incremental=True)
@@ -0,0 +1,179 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from parquet.streaming_stats import (
+    ColumnSummary,
+    QuantileSketch,
+    STAT_INDEX,
+    compute_dataset_statistics,
+    compute_fused_statistics,
+    compute_streaming_statistics,
+    load_summaries,
+    merge_summaries,
+    save_summaries,
+    summaries_to_frame,
+)
+from parquet.stats_compute import stats_pipeline
+
+PROCESSED = Path(__file__).parents[1] / "data" / "processed"
+
+
+@pytest.fixture
+def random_parquet_file(tmp_path):
+    """Creates a Parquet file larger than the quantile sketch capacity"""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        'time': np.arange(200_000),
+        'TO': rng.integers(0, 5, 200_000),
+        'sensor1_mean': rng.normal(50, 10, 200_000),
+        'sensor2_mean': rng.uniform(0, 100, 200_000),
+    })
+    file_path = tmp_path / "random.parquet"
+    df.to_parquet(file_path, row_group_size=30_000)
+    return file_path, df
+
+
+def test_streaming_matches_describe_on_small_file():
+    expected = pd.read_parquet(PROCESSED / "training_data.parquet").describe().drop(columns=['time', 'TO'])
+    summaries = compute_streaming_statistics(PROCESSED / "training_data.parquet", batch_size=10)
+    result = summaries_to_frame(summaries)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
+
+
+def test_streaming_large_file_within_error(random_parquet_file):
+    file_path, df = random_parquet_file
+    result = summaries_to_frame(compute_streaming_statistics(file_path, batch_size=7_000, quantile_error=0.01))
+    expected = df.drop(columns=['time', 'TO']).describe()
+    pd.testing.assert_frame_equal(
+        result.loc[['count', 'mean', 'std', 'min', 'max']],
+        expected.loc[['count', 'mean', 'std', 'min', 'max']],
+        rtol=1e-9,
+    )
+    for name in expected.columns:
+        values = np.sort(df[name].to_numpy())
+        for label, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75)):
+            rank = np.searchsorted(values, result.loc[label, name]) / len(values)
+            assert abs(rank - q) <= 0.01
+
+
+def test_summaries_merge_and_roundtrip():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=50_000)
+    left, right = ColumnSummary(), ColumnSummary()
+    left.update(values[:20_000])
+    right.update(values[20_000:])
+    merged = ColumnSummary.from_dict(left.to_dict())
+    merged.merge(ColumnSummary.from_dict(right.to_dict()))
+    stats = merged.describe()
+    assert stats['count'] == 50_000
+    assert stats['mean'] == pytest.approx(values.mean())
+    assert stats['std'] == pytest.approx(values.std(ddof=1))
+    assert stats['min'] == values.min() and stats['max'] == values.max()
+
+
+def test_sketch_is_exact_below_capacity():
+    values = np.array([5.0, 1.0, 3.0, 2.0, 4.0])
+    sketch = QuantileSketch(k=16)
+    sketch.update(values)
+    np.testing.assert_allclose(sketch.quantile([0.1, 0.25, 0.5, 0.9]), np.quantile(values, [0.1, 0.25, 0.5, 0.9]))
+
+
+def test_stats_pipeline_streaming_engine(tmp_path):
+    stats = stats_pipeline(PROCESSED, tmp_path, engine='streaming')
+    written = pd.read_csv(tmp_path / 'statistics.csv', index_col=0)
+    assert list(written.index) == STAT_INDEX
+    assert list(written.columns) == list(stats.columns)
+    assert 'time' not in written.columns and 'TO' not in written.columns
+
+
+def test_fused_matches_streaming(random_parquet_file):
+    file_path, df = random_parquet_file
+    fused, report = compute_fused_statistics(file_path, quantile_error=0.01)
+    streamed = compute_streaming_statistics(file_path, quantile_error=0.01)
+    pd.testing.assert_frame_equal(summaries_to_frame(fused).loc[['count', 'mean', 'std', 'min', 'max']],
+                                  summaries_to_frame(streamed).loc[['count', 'mean', 'std', 'min', 'max']])
+    assert report['rows'] == len(df)
+    assert set(report['null_counts']) == {'time', 'TO', 'sensor1_mean', 'sensor2_mean'}
+    assert not any(report['null_counts'].values())
+
+
+def test_fused_catches_nan_missing_from_footer(tmp_path):
+    # NaN written as a float value is not a null in the footer statistics
+    table = pa.table({'time': [1, 2, 3], 'sensor1_mean': [1.0, float('nan'), 3.0], 'TO': [1, 1, 1]})
+    file_path = tmp_path / "nan.parquet"
+    pq.write_table(table, file_path)
+    with pytest.raises(ValueError, match="contains null values"):
+        compute_fused_statistics(file_path)
+
+    summaries, report = compute_fused_statistics(file_path, validate=False)
+    assert report['null_counts'] == {'sensor1_mean': 1}
+    assert summaries['sensor1_mean'].describe()['count'] == 2
+
+
+def test_fused_rejects_empty_file(tmp_path):
+    file_path = tmp_path / "empty.parquet"
+    pq.write_table(pa.table({'sensor1_mean': pa.array([], pa.float64())}), file_path)
+    with pytest.raises(ValueError, match="contains no data"):
+        compute_fused_statistics(file_path)
+
+
+def test_stats_pipeline_fused_engine(tmp_path):
+    fused = stats_pipeline(PROCESSED, tmp_path, engine='fused')
+    expected = pd.read_parquet(PROCESSED / "training_data.parquet").describe().drop(columns=['time', 'TO'])
+    pd.testing.assert_frame_equal(fused, expected, rtol=1e-9)
+
+
+def test_stats_pipeline_unknown_engine(tmp_path):
+    with pytest.raises(ValueError, match="Unknown statistics engine"):
+        stats_pipeline(PROCESSED, tmp_path, engine='spark')
+
+
+@pytest.fixture
+def daily_parquet_files(tmp_path):
+    """Creates one Parquet file per day under nested folders"""
+    rng = np.random.default_rng(7)
+    frames = []
+    for day in range(4):
+        df = pd.DataFrame({
+            'time': np.arange(1000) + day * 86400,
+            'TO': rng.integers(0, 3, 1000),
+            'sensor1_mean': rng.normal(day, 1, 1000),
+        })
+        folder = tmp_path / "processed" / f"day={day}"
+        folder.mkdir(parents=True)
+        df.to_parquet(folder / "part.parquet")
+        frames.append(df)
+    return tmp_path / "processed", pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_dataset_statistics_match_concatenation(daily_parquet_files, max_workers):
+    folder, df = daily_parquet_files
+    files = sorted(folder.rglob("*.parquet"))
+    # A sketch large enough to hold every value keeps the merged quantiles exact
+    summaries = compute_dataset_statistics(files, quantile_error=0.001, max_workers=max_workers)
+    result = summaries_to_frame(summaries)
+    expected = df.drop(columns=['time', 'TO']).describe()
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
+
+
+def test_merge_saved_partials(daily_parquet_files, tmp_path):
+    folder, df = daily_parquet_files
+    files = sorted(folder.rglob("*.parquet"))
+    save_summaries(compute_dataset_statistics(files[:2], max_workers=1), tmp_path / "a.json")
+    save_summaries(compute_dataset_statistics(files[2:], max_workers=1), tmp_path / "b.json")
+    merged = merge_summaries([load_summaries(tmp_path / "a.json"), load_summaries(tmp_path / "b.json")])
+    assert merged['sensor1_mean'].count == len(df)
+    assert merged['sensor1_mean'].mean == pytest.approx(df['sensor1_mean'].mean())
+
+
+def test_stats_pipeline_dataset_glob(daily_parquet_files, tmp_path):
+    folder, df = daily_parquet_files
+    stats = stats_pipeline(str(folder / "day=*" / "*.parquet"), tmp_path, dataset=True, max_workers=2)
+    assert stats.loc['count', 'sensor1_mean'] == len(df)
+    assert (tmp_path / 'statistics.csv').exists()
+    with pytest.raises(ValueError, match="Dataset statistics use"):
+        stats_pipeline(str(folder / "day=*" / "*.parquet"), tmp_path, engine='pandas', dataset=True)
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parquet.csv_to_parquet import csv_to_parquet
+from parquet.synthetic import make_sensor_frame
+from parquet.write_profiles import WRITE_PROFILES, WriteProfile, get_write_profile, write_table_with_profile
+
+
+@pytest.fixture
+def sensor_table():
+    """Synthetic sensor data ordered by time"""
+    return pa.Table.from_pandas(make_sensor_frame(4000, n_ids=8), preserve_index=False)
+
+
+@pytest.mark.parametrize("name", sorted(WRITE_PROFILES))
+def test_profiles_round_trip(tmp_path, sensor_table, name):
+    out = tmp_path / f"{name}.parquet"
+    write_table_with_profile(sensor_table, out, name)
+    result = pq.read_table(out)
+    profile = WRITE_PROFILES[name]
+    expected = sensor_table.sort_by([(c, "ascending") for c in profile.sort_by]) if profile.sort_by else sensor_table
+    assert result.equals(expected)
+
+    column = pq.ParquetFile(out).metadata.row_group(0).column(sensor_table.schema.get_field_index('sensor1_min'))
+    assert column.compression == profile.compression.upper()
+
+
+@pytest.mark.parametrize("byte_stream_split, rounded, expected", [
+    (False, False, False), (True, True, True), ("auto", True, False), ("auto", False, True),
+])
+def test_byte_stream_split(tmp_path, byte_stream_split, rounded, expected):
+    values = np.random.default_rng(0).uniform(5, 60, 5000)
+    table = pa.table({'TO': np.arange(5000) % 4, 'value': values.round() if rounded else values})
+    out = tmp_path / "bss.parquet"
+    write_table_with_profile(table, out, WriteProfile(byte_stream_split=byte_stream_split))
+    encodings = pq.ParquetFile(out).metadata.row_group(0).column(1).encodings
+    assert ('BYTE_STREAM_SPLIT' in encodings) == expected
+    assert pq.read_table(out).equals(table)
+
+
+def test_scan_optimized_prunes_row_groups(tmp_path, sensor_table):
+    out = tmp_path / "scan.parquet"
+    write_table_with_profile(sensor_table, out, WriteProfile(sort_by=("TO", "time"), row_group_size=500))
+    metadata = pq.ParquetFile(out).metadata
+    assert metadata.num_row_groups == 8
+    assert metadata.row_group(0).sorting_columns[0].column_index == sensor_table.schema.get_field_index('TO')
+    # Sorted by TO: each row group holds exactly one id
+    to_index = sensor_table.schema.get_field_index('TO')
+    ranges = [(rg.column(to_index).statistics.min, rg.column(to_index).statistics.max)
+              for rg in (metadata.row_group(i) for i in range(metadata.num_row_groups))]
+    assert all(low == high for low, high in ranges)
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match="Unknown write profile"):
+        get_write_profile("tiny")
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_csv_to_parquet_with_profile(tmp_path, streaming):
+    df = make_sensor_frame(600, n_ids=3)
+    csv_path = tmp_path / "data.csv"
+    df.to_csv(csv_path, index=False)
+    out = tmp_path / "data.parquet"
+    csv_to_parquet(csv_path, out, streaming=streaming, profile="small-files")
+
+    result = pd.read_parquet(out)
+    assert len(result) == len(df)
+    assert result['TO'].is_monotonic_increasing
+    expected = df.sort_values(['TO', 'time']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
+    assert pq.ParquetFile(out).metadata.row_group(0).column(0).compression == 'ZSTD'